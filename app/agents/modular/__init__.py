@@ -8,6 +8,7 @@ from .phase2_components import ComponentAgent
 from .phase3_sections import SectionAgent
 from .phase4_pages import PageAgent
 from .phase5_content import ContentAgent
+from .fix_agent import FixAgent
 
 __all__ = [
     'SetupAgent',
@@ -15,4 +16,5 @@ __all__ = [
     'SectionAgent',
     'PageAgent',
     'ContentAgent',
+    'FixAgent',
 ]
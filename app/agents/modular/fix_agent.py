@@ -0,0 +1,60 @@
+"""
+Fix Agent - Correction des erreurs détectées par la validation statique
+Reçoit les diagnostics structurés d'un groupe de fichiers (fichier:ligne [règle] message)
+"""
+from typing import List
+
+
+class FixAgent:
+    """Agent de correction automatique"""
+
+    # Pas de fichiers déclarés: l'agent ne modifie que les fichiers listés dans le rapport
+    INPUTS: List[str] = []
+    OUTPUTS: List[str] = []
+
+    @staticmethod
+    def get_prompt(site_dir: str, report_text: str, files: List[str], attempt: int) -> str:
+        """
+        Génère le prompt de correction d'un groupe de fichiers
+
+        Plusieurs sessions de correction tournent en parallèle sur des groupes de
+        fichiers disjoints: le prompt ne contient que les diagnostics du groupe.
+
+        Args:
+            site_dir: Chemin du répertoire du site
+            report_text: Diagnostics du groupe, un par ligne (fichier:ligne [règle] message)
+            files: Fichiers que cette session peut modifier
+            attempt: Numéro de tentative actuelle
+
+        Returns:
+            Le prompt de correction
+        """
+        return f"""Tu as généré un site Next.js qui présente des erreurs de validation. Tu dois CORRIGER tous les problèmes détectés.
+
+Projet: {site_dir}
+
+FICHIERS À CORRIGER (et à ne pas dépasser - d'autres sessions corrigent les autres fichiers en parallèle):
+{chr(10).join(f"- {path}" for path in files)}
+
+DIAGNOSTICS (Tentative {attempt}):
+{report_text}
+
+TYPES DE PROBLÈMES:
+- [missing-file] Fichier attendu manquant: crée-le en cohérence avec le reste du projet
+- [unresolved-import] Import introuvable: corrige le chemin ou crée le module visé
+- [missing-export] Export absent: ajoute l'export dans le module cible ou corrige l'import
+- [undeclared-package] Package non déclaré: utilise un package déclaré dans package.json
+- [invalid-json] / [config-syntax] Erreur de syntaxe: corrige le fichier
+- [unresolved-slot] Marqueur ⟨slot⟩ non remplacé: remplace-le par la valeur indiquée dans le message
+- [wrong-color] Couleur de l'entreprise absente: utilise les couleurs indiquées dans le message pour le thème
+- [TSxxxx] / [next-build] Erreur TypeScript ou de build
+
+INSTRUCTIONS DE CORRECTION:
+1. Ne modifie QUE les fichiers listés ci-dessus; lis les autres fichiers seulement si nécessaire
+2. Pour chaque problème:
+   - Ouvre le fichier à la ligne indiquée
+   - Corrige l'erreur sans réécrire le reste du fichier
+   - Vérifie que la correction n'introduit pas de nouveaux problèmes
+3. N'exécute PAS npm install ni npm run build: la validation est relancée automatiquement
+
+Corrige TOUS les diagnostics listés, puis réponds avec la liste des fichiers modifiés."""
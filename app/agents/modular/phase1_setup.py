@@ -2,33 +2,39 @@
 Phase 1: Setup Agent - Structure du projet + Configuration complète
 Crée la base solide avec toute la configuration Next.js/Tailwind/TypeScript
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from .prompt_template import PromptTemplate
 
 
 class SetupAgent:
     """Agent Phase 1: Setup complet du projet Next.js"""
 
-    @staticmethod
-    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
-        """
-        Génère le prompt de setup initial avec TOUTE la configuration
-
-        Ce prompt est ENRICHI avec :
-        - Configuration Tailwind complète avec toutes les teintes de couleurs
-        - Next.config.mjs optimisé pour performance et SEO
-        - TypeScript strict mode avec types précis
-        - Package.json avec TOUTES les dépendances nécessaires
-        - Structure de dossiers complète et optimisée
-        - Configuration ESLint et Prettier pour qualité code
-        """
-        return f"""Tu es l'agent Setup spécialisé dans la création de la structure et configuration parfaite d'un projet Next.js 14+ moderne.
+    # Fichiers lus / écrits (relatifs à site_dir) - utilisés par l'orchestrateur DAG
+    # package.json, tsconfig.json, ... sont rendus par BoilerplateRenderer et
+    # node_modules est fourni par DependencyCache: la phase n'en lit aucun
+    INPUTS: List[str] = []
+    OUTPUTS: List[str] = [
+        "tailwind.config.js",
+        "next.config.mjs",
+        "app/globals.css",
+    ]
+
+    # Champs de business_data lus par get_prompt - empreinte de la régénération incrémentale
+    # (PROMPT_VERSION à incrémenter à chaque modification du prompt)
+    BUSINESS_FIELDS: List[str] = ["name", "city", "services", "primary_color", "secondary_color"]
+    PROMPT_VERSION: int = 3
+
+    # Instructions compilées une seule fois, identiques pour tous les jobs (system prompt mis
+    # en cache); les slots {…} sont les DONNÉES DU PROJET calculées par get_slots
+    PROMPT = PromptTemplate("""Tu es l'agent Setup spécialisé dans la création de la structure et configuration parfaite d'un projet Next.js 14+ moderne.
 
 📋 CONTEXTE BUSINESS:
-- Entreprise: {business.get('name', '')}
-- Ville: {business.get('city', '')}
-- Secteur: {business.get('services', '').split(',')[0] if business.get('services') else 'services'}
-- Couleur Primary: {business.get('primary_color', '#1a5490')}
-- Couleur Accent: {business.get('secondary_color', '#ff8c42')}
+- Entreprise: {name}
+- Ville: {city}
+- Secteur: {sector}
+- Couleur Primary: {primary_color}
+- Couleur Accent: {secondary_color}
 
 📁 RÉPERTOIRE: {site_dir}
 
@@ -36,45 +42,12 @@ class SetupAgent:
 Créer la structure de base COMPLÈTE et OPTIMALE pour un site Next.js 14+ avec App Router, TypeScript strict, et Tailwind CSS customisé.
 
 ═══════════════════════════════════════════════════════════
-📦 ÉTAPE 1: CRÉER package.json COMPLET
+📦 ÉTAPE 1: package.json (DÉJÀ CRÉÉ)
 ═══════════════════════════════════════════════════════════
 
-Crée {site_dir}/package.json avec TOUTES les dépendances nécessaires:
-
-{{
-  "name": "{site_slug}",
-  "version": "1.0.0",
-  "private": true,
-  "scripts": {{
-    "dev": "next dev",
-    "build": "next build",
-    "start": "next start",
-    "lint": "next lint"
-  }},
-  "dependencies": {{
-    "next": "^14.2.18",
-    "react": "^18.3.1",
-    "react-dom": "^18.3.1",
-    "framer-motion": "^12.0.0",
-    "lucide-react": "^0.468.0",
-    "react-hook-form": "^7.54.2",
-    "zod": "^3.24.1",
-    "@hookform/resolvers": "^3.9.1",
-    "clsx": "^2.1.1",
-    "tailwind-merge": "^2.6.0"
-  }},
-  "devDependencies": {{
-    "@types/node": "^20",
-    "@types/react": "^18",
-    "@types/react-dom": "^18",
-    "typescript": "^5",
-    "tailwindcss": "^3.4.17",
-    "postcss": "^8",
-    "autoprefixer": "^10.4.20",
-    "eslint": "^8",
-    "eslint-config-next": "14.2.18"
-  }}
-}}
+Les fichiers suivants ont DÉJÀ été générés automatiquement dans {site_dir}:
+package.json, tsconfig.json, postcss.config.mjs, .eslintrc.json, .gitignore
+Ne les recrée PAS et ne les modifie PAS.
 
 ═══════════════════════════════════════════════════════════
 🎨 ÉTAPE 2: CRÉER tailwind.config.js ULTRA-DÉTAILLÉ
@@ -93,7 +66,7 @@ module.exports = {{
     extend: {{
       colors: {{
         primary: {{
-          DEFAULT: '{business.get('primary_color', '#1a5490')}',
+          DEFAULT: '{primary_color}',
           50: '#e6f0f9',
           100: '#cce1f3',
           200: '#99c3e7',
@@ -106,7 +79,7 @@ module.exports = {{
           900: '#05111c',
         }},
         accent: {{
-          DEFAULT: '{business.get('secondary_color', '#ff8c42')}',
+          DEFAULT: '{secondary_color}',
           50: '#fff4ed',
           100: '#ffe9db',
           200: '#ffd3b7',
@@ -199,38 +172,10 @@ const nextConfig = {{
 export default nextConfig;
 
 ═══════════════════════════════════════════════════════════
-📝 ÉTAPE 4: CRÉER tsconfig.json STRICT
+📝 ÉTAPE 4: tsconfig.json (DÉJÀ CRÉÉ)
 ═══════════════════════════════════════════════════════════
 
-Crée {site_dir}/tsconfig.json avec TypeScript strict mode:
-
-{{
-  "compilerOptions": {{
-    "target": "ES2022",
-    "lib": ["dom", "dom.iterable", "esnext"],
-    "allowJs": true,
-    "skipLibCheck": true,
-    "strict": true,
-    "noEmit": true,
-    "esModuleInterop": true,
-    "module": "esnext",
-    "moduleResolution": "bundler",
-    "resolveJsonModule": true,
-    "isolatedModules": true,
-    "jsx": "preserve",
-    "incremental": true,
-    "plugins": [
-      {{
-        "name": "next"
-      }}
-    ],
-    "paths": {{
-      "@/*": ["./*"]
-    }}
-  }},
-  "include": ["next-env.d.ts", "**/*.ts", "**/*.tsx", ".next/types/**/*.ts"],
-  "exclude": ["node_modules"]
-}}
+tsconfig.json (strict, alias "@/*") existe déjà - passe à l'étape suivante.
 
 ═══════════════════════════════════════════════════════════
 🏗️ ÉTAPE 5: CRÉER LA STRUCTURE DE DOSSIERS COMPLÈTE
@@ -262,67 +207,10 @@ Crée TOUS les dossiers nécessaires:
 └── types/
 
 ═══════════════════════════════════════════════════════════
-📄 ÉTAPE 6: CRÉER LES FICHIERS DE BASE
+📄 ÉTAPE 6: FICHIERS DE BASE (DÉJÀ CRÉÉS)
 ═══════════════════════════════════════════════════════════
 
-Crée {site_dir}/postcss.config.mjs:
-
-/** @type {{import('postcss-load-config').Config}} */
-const config = {{
-  plugins: {{
-    tailwindcss: {{}},
-    autoprefixer: {{}},
-  }},
-}};
-
-export default config;
-
-Crée {site_dir}/.eslintrc.json:
-
-{{
-  "extends": ["next/core-web-vitals", "next/typescript"]
-}}
-
-Crée {site_dir}/.gitignore:
-
-# dependencies
-/node_modules
-/.pnp
-.pnp.js
-
-# testing
-/coverage
-
-# next.js
-/.next/
-/out/
-
-# production
-/build
-
-# misc
-.DS_Store
-*.pem
-
-# debug
-npm-debug.log*
-yarn-debug.log*
-yarn-error.log*
-
-# local env files
-.env*.local
-.env
-
-# vercel
-.vercel
-
-# typescript
-*.tsbuildinfo
-next-env.d.ts
-
-# temp
-/tmp
-/.temp
+postcss.config.mjs, .eslintrc.json et .gitignore existent déjà - passe à l'étape suivante.
 
 ═══════════════════════════════════════════════════════════
 🎨 ÉTAPE 7: CRÉER app/globals.css AVEC STYLES DE BASE
@@ -336,8 +224,8 @@ Crée {site_dir}/app/globals.css avec Tailwind + styles custom:
 
 @layer base {{
   :root {{
-    --primary: {business.get('primary_color', '#1a5490')};
-    --accent: {business.get('secondary_color', '#ff8c42')};
+    --primary: {primary_color};
+    --accent: {secondary_color};
   }}
 
   * {{
@@ -391,15 +279,10 @@ Crée {site_dir}/app/globals.css avec Tailwind + styles custom:
 }}
 
 ═══════════════════════════════════════════════════════════
-📦 ÉTAPE 8: INSTALLATION DES DÉPENDANCES
+📦 ÉTAPE 8: DÉPENDANCES (GÉRÉES PAR L'ORCHESTRATEUR)
 ═══════════════════════════════════════════════════════════
 
-Exécute dans {site_dir}:
-```bash
-npm install
-```
-
-IMPORTANT: Attend que npm install se termine COMPLÈTEMENT avant de continuer.
+N'exécute PAS npm install: node_modules est fourni par le cache de dépendances partagé.
 
 ═══════════════════════════════════════════════════════════
 ✅ CRITÈRES DE SUCCÈS
@@ -407,15 +290,37 @@ IMPORTANT: Attend que npm install se termine COMPLÈTEMENT avant de continuer.
 
 Vérifie que :
 ✓ Tous les fichiers de configuration sont créés
-✓ package.json contient TOUTES les dépendances listées
 ✓ tailwind.config.js a les couleurs custom complètes (50-900)
 ✓ next.config.mjs a la config images pour Unsplash
 ✓ Structure de dossiers complète créée
 ✓ app/globals.css a les classes utilitaires custom
-✓ npm install s'est exécuté sans erreurs
-✓ node_modules existe et contient les packages
 
 Une fois terminé, réponds avec un résumé:
 - Nombre de fichiers créés
-- Taille de node_modules
-- Confirmation que tout est prêt pour Phase 2 (Components)"""
+- Confirmation que tout est prêt pour Phase 2 (Components)""")
+
+    @staticmethod
+    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
+        """
+        Génère le prompt de setup initial avec TOUTE la configuration
+
+        Ce prompt est ENRICHI avec :
+        - Configuration Tailwind complète avec toutes les teintes de couleurs
+        - Next.config.mjs optimisé pour performance et SEO
+        - Structure de dossiers complète et optimisée
+        - package.json, tsconfig.json, ESLint, PostCSS et .gitignore sont
+          rendus par BoilerplateRenderer (app/services/template_renderer.py)
+        """
+        return SetupAgent.PROMPT.compose(**SetupAgent.get_slots(business, site_slug, site_dir))
+
+    @staticmethod
+    def get_slots(business: Dict[str, Any], site_slug: str, site_dir: str) -> Dict[str, Any]:
+        """Valeurs des slots du prompt (DONNÉES DU PROJET) pour un job"""
+        return {
+            "name": business.get('name', ''),
+            "city": business.get('city', ''),
+            "sector": business.get('services', '').split(',')[0] if business.get('services') else 'services',
+            "primary_color": business.get('primary_color', '#1a5490'),
+            "secondary_color": business.get('secondary_color', '#ff8c42'),
+            "site_dir": site_dir
+        }
@@ -2,25 +2,35 @@
 Phase 2: Component Agent - Composants UI de base réutilisables
 Génère TOUS les composants UI fondamentaux avec design system complet
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from .prompt_template import PromptTemplate
 
 
 class ComponentAgent:
     """Agent Phase 2: Composants UI de base avec design system"""
 
-    @staticmethod
-    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
-        """
-        Génère le prompt de création des composants UI
-
-        Ce prompt est ENRICHI avec :
-        - Tous les states des composants (hover, active, disabled, loading)
-        - Accessibilité complète (ARIA labels, keyboard navigation)
-        - Responsive design parfait
-        - Animations Framer Motion intégrées
-        - TypeScript types stricts
-        """
-        return f"""Tu es l'agent Component spécialisé dans la création de composants UI modernes, accessibles et performants.
+    # Fichiers lus / écrits (relatifs à site_dir) - utilisés par l'orchestrateur DAG
+    INPUTS: List[str] = ["package.json", "tailwind.config.js", "tsconfig.json"]
+    OUTPUTS: List[str] = [
+        "components/ui/Button.tsx",
+        "components/ui/Input.tsx",
+        "components/ui/Card.tsx",
+        "components/ui/Accordion.tsx",
+        "components/ui/Tabs.tsx",
+        "components/ui/index.ts",
+        "lib/utils.ts",
+    ]
+
+    # Champs de business_data lus par get_prompt - empreinte de la régénération incrémentale
+    # (PROMPT_VERSION à incrémenter à chaque modification du prompt); custom_design_system
+    # choisit entre cet agent et le squelette (services/golden_skeleton.py)
+    BUSINESS_FIELDS: List[str] = ["custom_design_system"]
+    PROMPT_VERSION: int = 3
+
+    # Instructions compilées une seule fois, identiques pour tous les jobs (system prompt mis
+    # en cache); les slots {…} sont les DONNÉES DU PROJET calculées par get_slots
+    PROMPT = PromptTemplate("""Tu es l'agent Component spécialisé dans la création de composants UI modernes, accessibles et performants.
 
 📋 CONTEXTE:
 Tu travailles sur le projet dans {site_dir}
@@ -474,4 +484,25 @@ Vérifie que :
 Une fois terminé, réponds avec:
 - Liste des 5 composants créés
 - Confirmation que lib/utils.ts existe
-- Prêt pour Phase 3 (Sections)"""
+- Prêt pour Phase 3 (Sections)""")
+
+    @staticmethod
+    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
+        """
+        Génère le prompt de création des composants UI
+
+        Ce prompt est ENRICHI avec :
+        - Tous les states des composants (hover, active, disabled, loading)
+        - Accessibilité complète (ARIA labels, keyboard navigation)
+        - Responsive design parfait
+        - Animations Framer Motion intégrées
+        - TypeScript types stricts
+        """
+        return ComponentAgent.PROMPT.compose(**ComponentAgent.get_slots(business, site_slug, site_dir))
+
+    @staticmethod
+    def get_slots(business: Dict[str, Any], site_slug: str, site_dir: str) -> Dict[str, Any]:
+        """Valeurs des slots du prompt (DONNÉES DU PROJET) pour un job"""
+        return {
+            "site_dir": site_dir
+        }
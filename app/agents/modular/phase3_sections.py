@@ -2,45 +2,55 @@
 Phase 3: Section Agent - Sections réutilisables de la homepage
 Génère TOUTES les sections modernes avec les composants UI de Phase 2
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from .prompt_template import PromptTemplate
 
 
 class SectionAgent:
     """Agent Phase 3: Sections homepage avec design moderne"""
 
-    @staticmethod
-    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
-        """
-        Génère le prompt de création des sections homepage
-
-        Ce prompt est ENRICHI avec :
-        - Toutes les sections de la homepage (Hero, Stats, Services, Process, etc.)
-        - Utilisation des composants UI de Phase 2
-        - Animations Framer Motion avancées
-        - Responsive design parfait
-        - SEO optimisé avec balises sémantiques
-        - Micro-interactions pour engagement utilisateur
-        """
-        services_list = business.get('services', '').split(',')
-        service_principal = services_list[0].strip() if services_list else 'nos services'
-
-        return f"""Tu es l'agent Section spécialisé dans la création de sections homepage modernes, engageantes et performantes.
+    # Fichiers lus / écrits (relatifs à site_dir) - utilisés par l'orchestrateur DAG
+    # Les sections importent '@/components/ui' sans lire ses fichiers: indépendante de la Phase 2
+    INPUTS: List[str] = ["package.json", "tailwind.config.js", "tsconfig.json"]
+    OUTPUTS: List[str] = [
+        "components/sections/Hero.tsx",
+        "components/sections/Stats.tsx",
+        "components/sections/Services.tsx",
+        "components/sections/Testimonials.tsx",
+        "components/sections/FAQ.tsx",
+        "components/sections/FinalCTA.tsx",
+        "components/sections/index.ts",
+    ]
+
+    # Champs de business_data lus par get_prompt - empreinte de la régénération incrémentale
+    # (PROMPT_VERSION à incrémenter à chaque modification du prompt)
+    BUSINESS_FIELDS: List[str] = [
+        "name", "city", "services", "positioning", "year", "phone", "email", "street",
+        "postal_code", "hours",
+    ]
+    PROMPT_VERSION: int = 3
+
+    # Instructions compilées une seule fois, identiques pour tous les jobs (system prompt mis
+    # en cache); les slots {…} sont les DONNÉES DU PROJET calculées par get_slots
+    PROMPT = PromptTemplate("""Tu es l'agent Section spécialisé dans la création de sections homepage modernes, engageantes et performantes.
 
 📋 CONTEXTE:
 Tu travailles sur le projet dans {site_dir}
-Les Phases 1 (Setup) et 2 (Components) sont TERMINÉES.
-Tous les composants UI sont disponibles dans {site_dir}/components/ui/
+La Phase 1 (Setup) est TERMINÉE.
+La Phase 2 (Components) crée EN PARALLÈLE les composants UI dans {site_dir}/components/ui/
+Importe-les depuis '@/components/ui' (Button, Input, Card, Accordion, AccordionItem, Tabs) sans attendre ni lire ces fichiers.
 
 🏢 BUSINESS INFO:
-- Entreprise: {business.get('name', '')}
-- Ville: {business.get('city', '')}
-- Services: {business.get('services', '')}
-- Positionnement: {business.get('positioning', '')}
-- Année création: {business.get('year', '')}
-- Téléphone: {business.get('phone', '')}
-- Email: {business.get('email', '')}
-- Adresse: {business.get('street', '')}, {business.get('postal_code', '')} {business.get('city', '')}
-- Horaires: {business.get('hours', 'Lundi-Vendredi 8h-18h')}
+- Entreprise: {name}
+- Ville: {city}
+- Services: {services}
+- Positionnement: {positioning}
+- Année création: {year}
+- Téléphone: {phone}
+- Email: {email}
+- Adresse: {street}, {postal_code} {city}
+- Horaires: {hours}
 
 🎯 TA MISSION:
 Créer TOUTES les sections de la homepage dans {site_dir}/components/sections/ avec:
@@ -124,17 +134,17 @@ export function Hero() {{
             {{/* Trust Badge */}}
             <motion.div variants={{fadeInUp}} className="inline-flex items-center gap-2 px-4 py-2 bg-white/10 backdrop-blur-sm rounded-full mb-6 border border-white/20">
               <Star className="h-5 w-5 text-accent fill-accent" />
-              <span className="text-sm font-medium">Expert depuis {business.get('year', '2020')}</span>
+              <span className="text-sm font-medium">Expert depuis {year_or_default}</span>
             </motion.div>
 
             {{/* Headline */}}
             <motion.h1 variants={{fadeInUp}} className="text-hero font-black mb-6 leading-tight">
-              {business.get('positioning', 'Votre Expert Local')}
+              {positioning_or_default}
             </motion.h1>
 
             {{/* Subheadline */}}
             <motion.p variants={{fadeInUp}} className="text-h3 mb-8 text-white/90 leading-relaxed">
-              {service_principal} professionnel à {business.get('city', '')} et alentours.
+              {service_principal} professionnel à {city} et alentours.
               Intervention rapide, devis gratuit, satisfaction garantie.
             </motion.p>
 
@@ -154,9 +164,9 @@ export function Hero() {{
                 size="xl"
                 leftIcon={{<Phone className="h-6 w-6" />}}
                 className="bg-white/10 backdrop-blur-sm border-white/30 text-white hover:bg-white hover:text-primary"
-                onClick={{() => window.location.href = 'tel:{business.get('phone', '')}'}}
+                onClick={{() => window.location.href = 'tel:{phone}'}}
               >
-                {business.get('phone', '')}
+                {phone}
               </Button>
             </motion.div>
 
@@ -166,7 +176,7 @@ export function Hero() {{
                 <Clock className="h-8 w-8 text-accent flex-shrink-0" />
                 <div>
                   <p className="text-sm text-white/70">Disponibilité</p>
-                  <p className="font-semibold">{business.get('hours', 'Lun-Ven 8h-18h')}</p>
+                  <p className="font-semibold">{hours_short}</p>
                 </div>
               </div>
 
@@ -174,7 +184,7 @@ export function Hero() {{
                 <MapPin className="h-8 w-8 text-accent flex-shrink-0" />
                 <div>
                   <p className="text-sm text-white/70">Zone d'intervention</p>
-                  <p className="font-semibold">{business.get('city', '')} + 30km</p>
+                  <p className="font-semibold">{city} + 30km</p>
                 </div>
               </div>
             </motion.div>
@@ -194,7 +204,7 @@ export function Hero() {{
               {{/* Main Image Container */}}
               <div className="relative bg-white/10 backdrop-blur-md rounded-4xl p-8 border border-white/20">
                 <div className="bg-white rounded-3xl aspect-square flex items-center justify-center">
-                  <p className="text-6xl font-black text-gradient">{business.get('name', '').split(' ')[0]}</p>
+                  <p className="text-6xl font-black text-gradient">{name_first_word}</p>
                 </div>
               </div>
 
@@ -264,7 +274,7 @@ interface StatItem {{
 export function Stats() {{
   const stats: StatItem[] = [
     {{ value: 500, suffix: '+', label: 'Clients Satisfaits' }},
-    {{ value: {2025 - int(business.get('year', 2020))}, suffix: ' ans', label: 'D\\'Expérience' }},
+    {{ value: {years_experience}, suffix: ' ans', label: 'D\\'Expérience' }},
     {{ value: 100, suffix: '%', label: 'Garantie Qualité' }},
     {{ value: 24, suffix: 'h', label: 'Intervention Rapide' }},
   ];
@@ -356,11 +366,11 @@ import {{ Card, Button }} from '@/components/ui';
 import {{ ArrowRight, Check }} from 'lucide-react';
 
 export function Services() {{
-  const services = `{business.get('services', '')}`.split(',').map(s => s.trim());
+  const services = `{services}`.split(',').map(s => s.trim());
 
   const serviceDetails = services.map((service, index) => ({{
     title: service,
-    description: `Service professionnel de ${{service.toLowerCase()}} avec garantie satisfaction et intervention rapide sur {business.get('city', '')} et alentours.`,
+    description: `Service professionnel de ${{service.toLowerCase()}} avec garantie satisfaction et intervention rapide sur {city} et alentours.`,
     features: [
       'Devis gratuit détaillé',
       'Intervention sous 24h',
@@ -384,10 +394,10 @@ export function Services() {{
       >
         <p className="text-accent font-bold text-lg mb-4">Nos Services</p>
         <h2 className="text-h1 font-black mb-6">
-          Solutions Professionnelles à {business.get('city', '')}
+          Solutions Professionnelles à {city}
         </h2>
         <p className="text-body-large text-gray-600">
-          {business.get('positioning', '')}. Expertise reconnue et service de qualité depuis {business.get('year', '')}.
+          {positioning}. Expertise reconnue et service de qualité depuis {year}.
         </p>
       </motion.div>
 
@@ -451,9 +461,9 @@ export function Services() {{
         <Button
           variant="primary"
           size="lg"
-          onClick={{() => window.location.href = 'tel:{business.get('phone', '')}'}}
+          onClick={{() => window.location.href = 'tel:{phone}'}}
         >
-          Contactez-nous au {business.get('phone', '')}
+          Contactez-nous au {phone}
         </Button>
       </motion.div>
     </section>
@@ -482,7 +492,7 @@ export function Testimonials() {{
       name: 'Marie D.',
       location: business.get('city', ''),
       rating: 5,
-      text: `Service impeccable ! L'équipe de {business.get('name', '')} a résolu mon problème rapidement et professionnellement. Je recommande vivement.`,
+      text: `Service impeccable ! L'équipe de {name} a résolu mon problème rapidement et professionnellement. Je recommande vivement.`,
       service: business.get('services', '').split(',')[0].trim()
     }},
     {{
@@ -603,17 +613,17 @@ export function FAQ() {{
     {{
       id: 'faq-1',
       question: 'Quels sont vos tarifs ?',
-      answer: `Nos tarifs varient selon la nature de l'intervention. Nous proposons systématiquement un devis gratuit et détaillé avant toute intervention. Contactez-nous au {business.get('phone', '')} pour obtenir une estimation précise adaptée à vos besoins.`
+      answer: `Nos tarifs varient selon la nature de l'intervention. Nous proposons systématiquement un devis gratuit et détaillé avant toute intervention. Contactez-nous au {phone} pour obtenir une estimation précise adaptée à vos besoins.`
     }},
     {{
       id: 'faq-2',
       question: 'Intervenez-vous en urgence ?',
-      answer: `Oui, nous proposons un service d'intervention rapide sur {business.get('city', '')} et alentours. Selon la disponibilité, nous pouvons intervenir sous 24h pour les urgences. Appelez-nous pour connaître nos disponibilités immédiates.`
+      answer: `Oui, nous proposons un service d'intervention rapide sur {city} et alentours. Selon la disponibilité, nous pouvons intervenir sous 24h pour les urgences. Appelez-nous pour connaître nos disponibilités immédiates.`
     }},
     {{
       id: 'faq-3',
       question: 'Quelle est votre zone d\\'intervention ?',
-      answer: `Nous intervenons principalement sur {business.get('city', '')} et dans un rayon de 30 km. Pour des interventions en dehors de cette zone, contactez-nous pour étudier votre demande.`
+      answer: `Nous intervenons principalement sur {city} et dans un rayon de 30 km. Pour des interventions en dehors de cette zone, contactez-nous pour étudier votre demande.`
     }},
     {{
       id: 'faq-4',
@@ -623,7 +633,7 @@ export function FAQ() {{
     {{
       id: 'faq-5',
       question: 'Comment obtenir un devis ?',
-      answer: `Très simple ! Vous pouvez nous contacter par téléphone au {business.get('phone', '')}, par email à {business.get('email', '')}, ou remplir notre formulaire de contact en ligne. Nous vous répondons rapidement avec un devis gratuit et sans engagement.`
+      answer: `Très simple ! Vous pouvez nous contacter par téléphone au {phone}, par email à {email}, ou remplir notre formulaire de contact en ligne. Nous vous répondons rapidement avec un devis gratuit et sans engagement.`
     }},
     {{
       id: 'faq-6',
@@ -674,13 +684,13 @@ export function FAQ() {{
         <p className="text-gray-600 mb-6">Notre équipe est à votre disposition pour répondre à toutes vos questions</p>
         <div className="flex flex-wrap gap-4 justify-center">
           <a
-            href="tel:{business.get('phone', '')}"
+            href="tel:{phone}"
             className="btn-primary"
           >
             Appelez-nous
           </a>
           <a
-            href="mailto:{business.get('email', '')}"
+            href="mailto:{email}"
             className="btn-accent"
           >
             Envoyez un email
@@ -752,9 +762,9 @@ export function FinalCTA() {{
                 size="xl"
                 leftIcon={{<Phone className="h-6 w-6" />}}
                 className="bg-white/10 backdrop-blur-sm border-white/30 text-white hover:bg-white hover:text-primary"
-                onClick={{() => window.location.href = 'tel:{business.get('phone', '')}'}}
+                onClick={{() => window.location.href = 'tel:{phone}'}}
               >
-                {business.get('phone', '')}
+                {phone}
               </Button>
             </div>
           </motion.div>
@@ -770,25 +780,25 @@ export function FinalCTA() {{
             <div className="p-6 bg-white/10 backdrop-blur-sm rounded-2xl border border-white/20">
               <Phone className="h-8 w-8 text-accent mb-3 mx-auto" />
               <p className="text-sm text-white/70 mb-1">Téléphone</p>
-              <p className="font-semibold">{business.get('phone', '')}</p>
+              <p className="font-semibold">{phone}</p>
             </div>
 
             <div className="p-6 bg-white/10 backdrop-blur-sm rounded-2xl border border-white/20">
               <Mail className="h-8 w-8 text-accent mb-3 mx-auto" />
               <p className="text-sm text-white/70 mb-1">Email</p>
-              <p className="font-semibold break-all">{business.get('email', '')}</p>
+              <p className="font-semibold break-all">{email}</p>
             </div>
 
             <div className="p-6 bg-white/10 backdrop-blur-sm rounded-2xl border border-white/20">
               <Clock className="h-8 w-8 text-accent mb-3 mx-auto" />
               <p className="text-sm text-white/70 mb-1">Horaires</p>
-              <p className="font-semibold">{business.get('hours', 'Lun-Ven 8h-18h')}</p>
+              <p className="font-semibold">{hours_short}</p>
             </div>
 
             <div className="p-6 bg-white/10 backdrop-blur-sm rounded-2xl border border-white/20">
               <MapPin className="h-8 w-8 text-accent mb-3 mx-auto" />
               <p className="text-sm text-white/70 mb-1">Localisation</p>
-              <p className="font-semibold">{business.get('city', '')}</p>
+              <p className="font-semibold">{city}</p>
             </div>
           </motion.div>
 
@@ -842,4 +852,45 @@ Vérifie que :
 Une fois terminé, réponds avec:
 - Liste des 6 sections créées
 - Confirmation que toutes utilisent les composants Phase 2
-- Prêt pour Phase 4 (Pages)"""
+- Prêt pour Phase 4 (Pages)""")
+
+    @staticmethod
+    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
+        """
+        Génère le prompt de création des sections homepage
+
+        Ce prompt est ENRICHI avec :
+        - Toutes les sections de la homepage (Hero, Stats, Services, Process, etc.)
+        - Utilisation des composants UI de Phase 2
+        - Animations Framer Motion avancées
+        - Responsive design parfait
+        - SEO optimisé avec balises sémantiques
+        - Micro-interactions pour engagement utilisateur
+        """
+        return SectionAgent.PROMPT.compose(**SectionAgent.get_slots(business, site_slug, site_dir))
+
+    @staticmethod
+    def get_slots(business: Dict[str, Any], site_slug: str, site_dir: str) -> Dict[str, Any]:
+        """Valeurs des slots du prompt (DONNÉES DU PROJET) pour un job"""
+        services_list = business.get('services', '').split(',')
+        service_principal = services_list[0].strip() if services_list else 'nos services'
+
+        return {
+            "site_dir": site_dir,
+            "name": business.get('name', ''),
+            "city": business.get('city', ''),
+            "services": business.get('services', ''),
+            "positioning": business.get('positioning', ''),
+            "year": business.get('year', ''),
+            "phone": business.get('phone', ''),
+            "email": business.get('email', ''),
+            "street": business.get('street', ''),
+            "postal_code": business.get('postal_code', ''),
+            "hours": business.get('hours', 'Lundi-Vendredi 8h-18h'),
+            "year_or_default": business.get('year', '2020'),
+            "positioning_or_default": business.get('positioning', 'Votre Expert Local'),
+            "service_principal": service_principal,
+            "hours_short": business.get('hours', 'Lun-Ven 8h-18h'),
+            "name_first_word": business.get('name', '').split(' ')[0],
+            "years_experience": 2025 - int(business.get('year', 2020))
+        }
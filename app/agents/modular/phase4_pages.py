@@ -2,26 +2,41 @@
 Phase 4: Page Agent - Assemblage des pages complètes
 Génère toutes les pages avec layout, navigation, formulaire de contact
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from app.services.template_renderer import BoilerplateRenderer
+
+from .prompt_template import PromptTemplate
 
 
 class PageAgent:
     """Agent Phase 4: Pages complètes avec layout et navigation"""
 
-    @staticmethod
-    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
-        """
-        Génère le prompt de création des pages complètes
-
-        Ce prompt est ENRICHI avec :
-        - Layout complet (Header, Footer, Navigation)
-        - Page d'accueil assemblant toutes les sections
-        - Formulaire de contact multi-étapes avec validation
-        - Pages légales (mentions légales, politique de confidentialité)
-        - Navigation responsive avec menu mobile
-        - SEO metadata dans layout
-        """
-        return f"""Tu es l'agent Page spécialisé dans la création de pages complètes avec layout moderne et navigation optimale.
+    # Fichiers lus / écrits (relatifs à site_dir) - utilisés par l'orchestrateur DAG
+    INPUTS: List[str] = ["components/ui/", "components/sections/", "app/globals.css"]
+    OUTPUTS: List[str] = [
+        "components/layout/Header.tsx",
+        "components/layout/Footer.tsx",
+        "components/layout/index.ts",
+        "components/forms/ContactForm.tsx",
+        "components/forms/index.ts",
+        "app/page.tsx",
+        "app/layout.tsx",
+        "app/(pages)/mentions-legales/page.tsx",
+        "app/(pages)/politique-confidentialite/page.tsx",
+    ]
+
+    # Champs de business_data lus par get_prompt - empreinte de la régénération incrémentale
+    # (PROMPT_VERSION à incrémenter à chaque modification du prompt)
+    BUSINESS_FIELDS: List[str] = [
+        "name", "city", "services", "positioning", "year", "phone", "email", "street",
+        "postal_code", "hours", "domain_url",
+    ]
+    PROMPT_VERSION: int = 4
+
+    # Instructions compilées une seule fois, identiques pour tous les jobs (system prompt mis
+    # en cache); les slots {…} sont les DONNÉES DU PROJET calculées par get_slots
+    PROMPT = PromptTemplate("""Tu es l'agent Page spécialisé dans la création de pages complètes avec layout moderne et navigation optimale.
 
 📋 CONTEXTE:
 Tu travailles sur le projet dans {site_dir}
@@ -33,13 +48,13 @@ Les Phases 1, 2 et 3 sont TERMINÉES:
 Tous les composants et sections sont disponibles et fonctionnels.
 
 🏢 BUSINESS INFO:
-- Entreprise: {business.get('name', '')}
-- Ville: {business.get('city', '')}
-- Services: {business.get('services', '')}
-- Téléphone: {business.get('phone', '')}
-- Email: {business.get('email', '')}
-- Adresse: {business.get('street', '')}, {business.get('postal_code', '')} {business.get('city', '')}
-- URL: {business.get('domain_url', f'https://{site_slug}.com')}
+- Entreprise: {name}
+- Ville: {city}
+- Services: {services}
+- Téléphone: {phone}
+- Email: {email}
+- Adresse: {street}, {postal_code} {city}
+- URL: {site_url}
 
 🎯 TA MISSION:
 Créer le layout complet et toutes les pages dans {site_dir}/app/ et {site_dir}/components/layout/ avec:
@@ -92,17 +107,17 @@ export function Header() {{
       <div className="bg-primary text-white py-2 text-sm hidden md:block">
         <div className="max-w-7xl mx-auto px-4 flex items-center justify-between">
           <div className="flex items-center gap-6">
-            <a href="tel:{business.get('phone', '')}" className="flex items-center gap-2 hover:text-accent transition-colors">
+            <a href="tel:{phone}" className="flex items-center gap-2 hover:text-accent transition-colors">
               <Phone className="h-4 w-4" />
-              <span>{business.get('phone', '')}</span>
+              <span>{phone}</span>
             </a>
-            <a href="mailto:{business.get('email', '')}" className="flex items-center gap-2 hover:text-accent transition-colors">
+            <a href="mailto:{email}" className="flex items-center gap-2 hover:text-accent transition-colors">
               <Mail className="h-4 w-4" />
-              <span>{business.get('email', '')}</span>
+              <span>{email}</span>
             </a>
           </div>
           <div className="text-white/80">
-            {business.get('hours', 'Lun-Ven 8h-18h')}
+            {hours}
           </div>
         </div>
       </div>
@@ -123,13 +138,13 @@ export function Header() {{
             {{/* Logo */}}
             <Link href="/" className="flex items-center gap-3 group">
               <div className="w-12 h-12 bg-gradient-to-br from-primary to-accent rounded-xl flex items-center justify-center text-white font-black text-xl shadow-lg group-hover:scale-110 transition-transform">
-                {business.get('name', '').split(' ')[0][0]}
+                {name_initial}
               </div>
               <div>
                 <h1 className="font-black text-xl text-gray-900 group-hover:text-primary transition-colors">
-                  {business.get('name', '')}
+                  {name}
                 </h1>
-                <p className="text-xs text-gray-600">{business.get('city', '')}</p>
+                <p className="text-xs text-gray-600">{city}</p>
               </div>
             </Link>
 
@@ -158,7 +173,7 @@ export function Header() {{
               <Button
                 variant="accent"
                 leftIcon={{<Phone className="h-5 w-5" />}}
-                onClick={{() => window.location.href = 'tel:{business.get('phone', '')}'}}
+                onClick={{() => window.location.href = 'tel:{phone}'}}
               >
                 Appeler
               </Button>
@@ -212,9 +227,9 @@ export function Header() {{
                   variant="accent"
                   fullWidth
                   leftIcon={{<Phone className="h-5 w-5" />}}
-                  onClick={{() => window.location.href = 'tel:{business.get('phone', '')}'}}
+                  onClick={{() => window.location.href = 'tel:{phone}'}}
                 >
-                  {business.get('phone', '')}
+                  {phone}
                 </Button>
               </div>
             </nav>
@@ -241,7 +256,7 @@ import Link from 'next/link';
 export function Footer() {{
   const currentYear = new Date().getFullYear();
 
-  const services = `{business.get('services', '')}`.split(',').map(s => s.trim()).slice(0, 4);
+  const services = `{services}`.split(',').map(s => s.trim()).slice(0, 4);
 
   return (
     <footer className="bg-gray-900 text-white">
@@ -252,12 +267,12 @@ export function Footer() {{
           <div>
             <div className="flex items-center gap-3 mb-6">
               <div className="w-12 h-12 bg-gradient-to-br from-primary to-accent rounded-xl flex items-center justify-center text-white font-black text-xl">
-                {business.get('name', '').split(' ')[0][0]}
+                {name_initial}
               </div>
-              <h3 className="font-black text-xl">{business.get('name', '')}</h3>
+              <h3 className="font-black text-xl">{name}</h3>
             </div>
             <p className="text-gray-400 mb-6 leading-relaxed">
-              {business.get('positioning', 'Votre expert local')} depuis {business.get('year', '')}.
+              {positioning_or_default} depuis {year}.
             </p>
             <div className="flex gap-4">
               <a href="#" className="w-10 h-10 bg-white/10 rounded-lg flex items-center justify-center hover:bg-accent transition-colors">
@@ -325,26 +340,26 @@ export function Footer() {{
               <li className="flex items-start gap-3">
                 <MapPin className="h-5 w-5 text-accent flex-shrink-0 mt-1" />
                 <div className="text-gray-400">
-                  {business.get('street', '')}<br />
-                  {business.get('postal_code', '')} {business.get('city', '')}
+                  {street}<br />
+                  {postal_code} {city}
                 </div>
               </li>
               <li className="flex items-center gap-3">
                 <Phone className="h-5 w-5 text-accent flex-shrink-0" />
-                <a href="tel:{business.get('phone', '')}" className="text-gray-400 hover:text-accent transition-colors">
-                  {business.get('phone', '')}
+                <a href="tel:{phone}" className="text-gray-400 hover:text-accent transition-colors">
+                  {phone}
                 </a>
               </li>
               <li className="flex items-center gap-3">
                 <Mail className="h-5 w-5 text-accent flex-shrink-0" />
-                <a href="mailto:{business.get('email', '')}" className="text-gray-400 hover:text-accent transition-colors break-all">
-                  {business.get('email', '')}
+                <a href="mailto:{email}" className="text-gray-400 hover:text-accent transition-colors break-all">
+                  {email}
                 </a>
               </li>
               <li className="flex items-start gap-3">
                 <Clock className="h-5 w-5 text-accent flex-shrink-0 mt-1" />
                 <div className="text-gray-400">
-                  {business.get('hours', 'Lun-Ven 8h-18h')}
+                  {hours}
                 </div>
               </li>
             </ul>
@@ -356,7 +371,7 @@ export function Footer() {{
       <div className="border-t border-gray-800">
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-6">
           <div className="flex flex-col md:flex-row items-center justify-between gap-4 text-sm text-gray-400">
-            <p>© {{currentYear}} {business.get('name', '')}. Tous droits réservés.</p>
+            <p>© {{currentYear}} {name}. Tous droits réservés.</p>
             <p>
               Site créé avec ❤️ par <a href="https://leadgen.lu" className="text-accent hover:underline">Leadgen.lu</a>
             </p>
@@ -409,7 +424,7 @@ export function ContactForm() {{
     resolver: zodResolver(contactSchema),
   }});
 
-  const services = `{business.get('services', '')}`.split(',').map(s => s.trim());
+  const services = `{services}`.split(',').map(s => s.trim());
 
   const nextStep = async () => {{
     let isValid = false;
@@ -717,15 +732,15 @@ import './globals.css';
 const inter = Inter({{ subsets: ['latin'] }});
 
 export const metadata: Metadata = {{
-  title: '{business.get('name', '')} - {business.get('positioning', '')} à {business.get('city', '')}',
-  description: `{business.get('services', '')} professionnel à {business.get('city', '')}. {business.get('positioning', '')}. Devis gratuit, intervention rapide. Contactez-nous au {business.get('phone', '')}.`,
-  keywords: `{business.get('services', '')}, {business.get('city', '')}, devis gratuit, intervention rapide`,
-  authors: [{{ name: '{business.get('name', '')}' }}],
+  title: '{name} - {positioning} à {city}',
+  description: `{services} professionnel à {city}. {positioning}. Devis gratuit, intervention rapide. Contactez-nous au {phone}.`,
+  keywords: `{services}, {city}, devis gratuit, intervention rapide`,
+  authors: [{{ name: '{name}' }}],
   openGraph: {{
-    title: '{business.get('name', '')} - {business.get('positioning', '')}',
-    description: `{business.get('services', '')} à {business.get('city', '')}. Devis gratuit.`,
-    url: '{business.get('domain_url', '')}',
-    siteName: '{business.get('name', '')}',
+    title: '{name} - {positioning}',
+    description: `{services} à {city}. Devis gratuit.`,
+    url: '{site_url}',
+    siteName: '{name}',
     locale: 'fr_FR',
     type: 'website',
   }},
@@ -762,7 +777,7 @@ import {{ Header }} from '@/components/layout/Header';
 import {{ Footer }} from '@/components/layout/Footer';
 
 export const metadata = {{
-  title: 'Mentions Légales - {business.get('name', '')}',
+  title: 'Mentions Légales - {name}',
 }};
 
 export default function MentionsLegales() {{
@@ -774,11 +789,11 @@ export default function MentionsLegales() {{
 
         <h2>Éditeur du site</h2>
         <p>
-          <strong>{business.get('name', '')}</strong><br />
-          {business.get('street', '')}<br />
-          {business.get('postal_code', '')} {business.get('city', '')}<br />
-          Tél: {business.get('phone', '')}<br />
-          Email: {business.get('email', '')}
+          <strong>{name}</strong><br />
+          {street}<br />
+          {postal_code} {city}<br />
+          Tél: {phone}<br />
+          Email: {email}
         </p>
 
         <h2>Hébergement</h2>
@@ -791,14 +806,14 @@ export default function MentionsLegales() {{
 
         <h2>Propriété intellectuelle</h2>
         <p>
-          L'ensemble du contenu de ce site (textes, images, vidéos) est la propriété de {business.get('name', '')}.
+          L'ensemble du contenu de ce site (textes, images, vidéos) est la propriété de {name}.
           Toute reproduction, même partielle, est interdite sans autorisation préalable.
         </p>
 
         <h2>Responsabilité</h2>
         <p>
           Les informations contenues sur ce site sont aussi précises que possible mais peuvent contenir des inexactitudes.
-          {business.get('name', '')} ne pourra être tenue responsable des dommages directs ou indirects causés au matériel
+          {name} ne pourra être tenue responsable des dommages directs ou indirects causés au matériel
           de l'utilisateur lors de l'accès au site.
         </p>
       </main>
@@ -819,7 +834,7 @@ import {{ Header }} from '@/components/layout/Header';
 import {{ Footer }} from '@/components/layout/Footer';
 
 export const metadata = {{
-  title: 'Politique de Confidentialité - {business.get('name', '')}',
+  title: 'Politique de Confidentialité - {name}',
 }};
 
 export default function PolitiqueConfidentialite() {{
@@ -854,7 +869,7 @@ export default function PolitiqueConfidentialite() {{
         <h2>Vos droits</h2>
         <p>
           Conformément au RGPD, vous disposez d'un droit d'accès, de rectification, d'effacement et de portabilité
-          de vos données. Pour exercer ces droits, contactez-nous à {business.get('email', '')}.
+          de vos données. Pour exercer ces droits, contactez-nous à {email}.
         </p>
 
         <h2>Cookies</h2>
@@ -866,8 +881,8 @@ export default function PolitiqueConfidentialite() {{
         <h2>Contact</h2>
         <p>
           Pour toute question concernant cette politique, contactez-nous:<br />
-          Email: {business.get('email', '')}<br />
-          Téléphone: {business.get('phone', '')}
+          Email: {email}<br />
+          Téléphone: {phone}
         </p>
       </main>
       <Footer />
@@ -914,4 +929,39 @@ Une fois terminé, réponds avec:
 - Liste des composants layout créés (Header, Footer)
 - Liste des pages créées (homepage, légales)
 - Confirmation formulaire multi-étapes fonctionnel
-- Prêt pour Phase 5 (Content/SEO)"""
+- Prêt pour Phase 5 (Content/SEO)""")
+
+    @staticmethod
+    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
+        """
+        Génère le prompt de création des pages complètes
+
+        Ce prompt est ENRICHI avec :
+        - Layout complet (Header, Footer, Navigation)
+        - Page d'accueil assemblant toutes les sections
+        - Formulaire de contact multi-étapes avec validation
+        - Pages légales (mentions légales, politique de confidentialité)
+        - Navigation responsive avec menu mobile
+        - SEO metadata dans layout
+        """
+        return PageAgent.PROMPT.compose(**PageAgent.get_slots(business, site_slug, site_dir))
+
+    @staticmethod
+    def get_slots(business: Dict[str, Any], site_slug: str, site_dir: str) -> Dict[str, Any]:
+        """Valeurs des slots du prompt (DONNÉES DU PROJET) pour un job"""
+        return {
+            "site_dir": site_dir,
+            "name": business.get('name', ''),
+            "city": business.get('city', ''),
+            "services": business.get('services', ''),
+            "phone": business.get('phone', ''),
+            "email": business.get('email', ''),
+            "street": business.get('street', ''),
+            "postal_code": business.get('postal_code', ''),
+            "site_url": BoilerplateRenderer.site_url(business, site_slug),
+            "hours": business.get('hours', 'Lun-Ven 8h-18h'),
+            "name_initial": business.get('name', '').split(' ')[0][0],
+            "positioning_or_default": business.get('positioning', 'Votre expert local'),
+            "year": business.get('year', ''),
+            "positioning": business.get('positioning', '')
+        }
@@ -2,28 +2,38 @@
 Phase 5: Content Agent - SEO, JSON-LD schemas, et polish final
 Génère tous les éléments de contenu SEO et métadonnées structurées
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 
+from app.services.template_renderer import BoilerplateRenderer
 
-class ContentAgent:
-    """Agent Phase 5: Optimisation SEO et métadonnées"""
+from .prompt_template import PromptTemplate
 
-    @staticmethod
-    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
-        """
-        Génère le prompt de création du contenu SEO final
 
-        Ce prompt est ENRICHI avec :
-        - JSON-LD schemas (LocalBusiness, Organization, BreadcrumbList)
-        - Meta tags Open Graph et Twitter
-        - Sitemap.xml et robots.txt
-        - Structured data pour Google Rich Results
-        - Alt texts optimisés pour images
-        - Aria labels pour accessibilité
-        """
-        services_list = business.get('services', '').split(',')
+class ContentAgent:
+    """Agent Phase 5: Optimisation SEO et métadonnées"""
 
-        return f"""Tu es l'agent Content spécialisé dans l'optimisation SEO et les métadonnées structurées pour un référencement optimal.
+    # Fichiers lus / écrits (relatifs à site_dir) - utilisés par l'orchestrateur DAG
+    INPUTS: List[str] = ["app/layout.tsx"]
+    OUTPUTS: List[str] = [
+        "components/seo/StructuredData.tsx",
+        "components/seo/index.ts",
+        "public/.gitkeep",
+        "app/layout.tsx",
+        "app/api/contact/route.ts",
+        "README.md",
+    ]
+
+    # Champs de business_data lus par get_prompt - empreinte de la régénération incrémentale
+    # (PROMPT_VERSION à incrémenter à chaque modification du prompt)
+    BUSINESS_FIELDS: List[str] = [
+        "name", "city", "country", "services", "positioning", "year", "phone", "email",
+        "street", "postal_code", "hours", "domain_url",
+    ]
+    PROMPT_VERSION: int = 3
+
+    # Instructions compilées une seule fois, identiques pour tous les jobs (system prompt mis
+    # en cache); les slots {…} sont les DONNÉES DU PROJET calculées par get_slots
+    PROMPT = PromptTemplate("""Tu es l'agent Content spécialisé dans l'optimisation SEO et les métadonnées structurées pour un référencement optimal.
 
 📋 CONTEXTE:
 Tu travailles sur le projet dans {site_dir}
@@ -36,22 +46,20 @@ Les Phases 1, 2, 3 et 4 sont TERMINÉES:
 Le site est fonctionnel. Il ne manque que le SEO et les métadonnées.
 
 🏢 BUSINESS INFO:
-- Entreprise: {business.get('name', '')}
-- Ville: {business.get('city', '')}
-- Pays: {business.get('country', 'Luxembourg')}
-- Services: {business.get('services', '')}
-- Téléphone: {business.get('phone', '')}
-- Email: {business.get('email', '')}
-- Adresse: {business.get('street', '')}, {business.get('postal_code', '')} {business.get('city', '')}
-- URL: {business.get('domain_url', f'https://{site_slug}.com')}
-- Année création: {business.get('year', '')}
-- Horaires: {business.get('hours', 'Lundi-Vendredi 8h-18h')}
+- Entreprise: {name}
+- Ville: {city}
+- Pays: {country}
+- Services: {services}
+- Téléphone: {phone}
+- Email: {email}
+- Adresse: {street}, {postal_code} {city}
+- URL: {site_url}
+- Année création: {year}
+- Horaires: {hours}
 
 🎯 TA MISSION:
 Créer TOUS les fichiers SEO et métadonnées dans {site_dir}/ avec:
 - JSON-LD schemas pour Google Rich Results
-- Sitemap.xml pour indexation
-- Robots.txt optimisé
 - Composant StructuredData réutilisable
 - Meta tags sociaux (OG, Twitter)
 
@@ -68,19 +76,19 @@ export function StructuredData() {{
   const localBusinessSchema = {{
     '@context': 'https://schema.org',
     '@type': 'LocalBusiness',
-    '@id': '{business.get('domain_url', f'https://{site_slug}.com')}',
-    name: '{business.get('name', '')}',
-    description: '{business.get('positioning', 'Service professionnel')} à {business.get('city', '')}. {business.get('services', '')}.',
-    url: '{business.get('domain_url', f'https://{site_slug}.com')}',
-    telephone: '{business.get('phone', '')}',
-    email: '{business.get('email', '')}',
+    '@id': '{site_url}',
+    name: '{name}',
+    description: '{positioning_or_default} à {city}. {services}.',
+    url: '{site_url}',
+    telephone: '{phone}',
+    email: '{email}',
     priceRange: '$$',
     address: {{
       '@type': 'PostalAddress',
-      streetAddress: '{business.get('street', '')}',
-      addressLocality: '{business.get('city', '')}',
-      postalCode: '{business.get('postal_code', '')}',
-      addressCountry: '{business.get('country', 'LU')}',
+      streetAddress: '{street}',
+      addressLocality: '{city}',
+      postalCode: '{postal_code}',
+      addressCountry: '{address_country}',
     }},
     geo: {{
       '@type': 'GeoCoordinates',
@@ -100,7 +108,7 @@ export function StructuredData() {{
       'https://www.instagram.com/yourpage',
       'https://www.linkedin.com/company/yourpage',
     ],
-    image: '{business.get('domain_url', f'https://{site_slug}.com')}/logo.png',
+    image: '{site_url}/logo.png',
     aggregateRating: {{
       '@type': 'AggregateRating',
       ratingValue: '4.9',
@@ -113,17 +121,17 @@ export function StructuredData() {{
   const organizationSchema = {{
     '@context': 'https://schema.org',
     '@type': 'Organization',
-    name: '{business.get('name', '')}',
-    url: '{business.get('domain_url', f'https://{site_slug}.com')}',
-    logo: '{business.get('domain_url', f'https://{site_slug}.com')}/logo.png',
-    foundingDate: '{business.get('year', '')}',
+    name: '{name}',
+    url: '{site_url}',
+    logo: '{site_url}/logo.png',
+    foundingDate: '{year}',
     contactPoint: {{
       '@type': 'ContactPoint',
-      telephone: '{business.get('phone', '')}',
+      telephone: '{phone}',
       contactType: 'Customer Service',
-      email: '{business.get('email', '')}',
+      email: '{email}',
       availableLanguage: ['French', 'German'],
-      areaServed: '{business.get('country', 'LU')}',
+      areaServed: '{address_country}',
     }},
   }};
 
@@ -135,39 +143,25 @@ export function StructuredData() {{
         '@type': 'ListItem',
         position: 1,
         name: 'Accueil',
-        item: '{business.get('domain_url', f'https://{site_slug}.com')}',
+        item: '{site_url}',
       }},
       {{
         '@type': 'ListItem',
         position: 2,
         name: 'Services',
-        item: '{business.get('domain_url', f'https://{site_slug}.com')}/#services',
+        item: '{site_url}/#services',
       }},
       {{
         '@type': 'ListItem',
         position: 3,
         name: 'Contact',
-        item: '{business.get('domain_url', f'https://{site_slug}.com')}/#contact',
+        item: '{site_url}/#contact',
       }},
     ],
   }};
 
   const serviceSchemas = [
-{', '.join([f'''    {{
-      '@context': 'https://schema.org',
-      '@type': 'Service',
-      name: '{service.strip()}',
-      description: 'Service professionnel de {service.strip().lower()} à {business.get('city', '')} et alentours.',
-      provider: {{
-        '@type': 'LocalBusiness',
-        name: '{business.get('name', '')}',
-        telephone: '{business.get('phone', '')}',
-      }},
-      areaServed: {{
-        '@type': 'City',
-        name: '{business.get('city', '')}',
-      }},
-    }}''' for service in services_list[:3]])}
+{service_schemas}
   ];
 
   return (
@@ -197,87 +191,11 @@ export function StructuredData() {{
 ```
 
 ═══════════════════════════════════════════════════════════
-🗺️ FICHIER 2: public/sitemap.xml
+🗺️ FICHIERS 2-4: sitemap.xml, robots.txt, manifest.json (DÉJÀ CRÉÉS)
 ═══════════════════════════════════════════════════════════
 
-Crée {site_dir}/public/sitemap.xml:
-
-```xml
-<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url>
-    <loc>{business.get('domain_url', f'https://{site_slug}.com')}</loc>
-    <lastmod>{{{{new Date().toISOString().split('T')[0]}}}}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>1.0</priority>
-  </url>
-  <url>
-    <loc>{business.get('domain_url', f'https://{site_slug}.com')}/mentions-legales</loc>
-    <lastmod>{{{{new Date().toISOString().split('T')[0]}}}}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.3</priority>
-  </url>
-  <url>
-    <loc>{business.get('domain_url', f'https://{site_slug}.com')}/politique-confidentialite</loc>
-    <lastmod>{{{{new Date().toISOString().split('T')[0]}}}}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.3</priority>
-  </url>
-</urlset>
-```
-
-═══════════════════════════════════════════════════════════
-🤖 FICHIER 3: public/robots.txt
-═══════════════════════════════════════════════════════════
-
-Crée {site_dir}/public/robots.txt:
-
-```
-# {business.get('name', '')} - Robots.txt
-
-User-agent: *
-Allow: /
-
-# Sitemap
-Sitemap: {business.get('domain_url', f'https://{site_slug}.com')}/sitemap.xml
-
-# Block admin paths (if any in future)
-Disallow: /api/
-Disallow: /_next/
-```
-
-═══════════════════════════════════════════════════════════
-🎨 FICHIER 4: public/manifest.json (PWA)
-═══════════════════════════════════════════════════════════
-
-Crée {site_dir}/public/manifest.json:
-
-```json
-{{
-  "name": "{business.get('name', '')}",
-  "short_name": "{business.get('name', '').split()[0]}",
-  "description": "{business.get('positioning', '')} à {business.get('city', '')}",
-  "start_url": "/",
-  "display": "standalone",
-  "background_color": "#ffffff",
-  "theme_color": "{business.get('primary_color', '#1a5490')}",
-  "orientation": "portrait-primary",
-  "icons": [
-    {{
-      "src": "/icon-192.png",
-      "sizes": "192x192",
-      "type": "image/png",
-      "purpose": "any maskable"
-    }},
-    {{
-      "src": "/icon-512.png",
-      "sizes": "512x512",
-      "type": "image/png",
-      "purpose": "any maskable"
-    }}
-  ]
-}}
-```
+{site_dir}/public/sitemap.xml, {site_dir}/public/robots.txt et {site_dir}/public/manifest.json
+ont DÉJÀ été générés automatiquement. Ne les recrée PAS et ne les modifie PAS.
 
 ═══════════════════════════════════════════════════════════
 📄 FICHIER 5: app/layout.tsx (MISE À JOUR AVEC SEO)
@@ -294,24 +212,24 @@ import './globals.css';
 const inter = Inter({{ subsets: ['latin'] }});
 
 export const metadata: Metadata = {{
-  metadataBase: new URL('{business.get('domain_url', f'https://{site_slug}.com')}'),
+  metadataBase: new URL('{site_url}'),
   title: {{
-    default: '{business.get('name', '')} - {business.get('positioning', '')} à {business.get('city', '')}',
-    template: '%s | {business.get('name', '')}',
+    default: '{name} - {positioning} à {city}',
+    template: '%s | {name}',
   }},
-  description: `{business.get('services', '')} professionnel à {business.get('city', '')}. {business.get('positioning', '')}. Devis gratuit, intervention rapide, satisfaction garantie. Contactez-nous au {business.get('phone', '')}.`,
+  description: `{services} professionnel à {city}. {positioning}. Devis gratuit, intervention rapide, satisfaction garantie. Contactez-nous au {phone}.`,
   keywords: [
-    '{business.get('city', '')}',
-{', '.join([f"    '{service.strip()}'" for service in services_list[:5]])},
+    '{city}',
+{service_keywords},
     'devis gratuit',
     'intervention rapide',
-    '{business.get('country', 'Luxembourg')}',
+    '{country}',
     'professionnel',
     'qualité garantie'
   ],
-  authors: [{{ name: '{business.get('name', '')}', url: '{business.get('domain_url', f'https://{site_slug}.com')}' }}],
-  creator: '{business.get('name', '')}',
-  publisher: '{business.get('name', '')}',
+  authors: [{{ name: '{name}', url: '{site_url}' }}],
+  creator: '{name}',
+  publisher: '{name}',
   formatDetection: {{
     email: false,
     address: false,
@@ -320,24 +238,24 @@ export const metadata: Metadata = {{
   openGraph: {{
     type: 'website',
     locale: 'fr_FR',
-    url: '{business.get('domain_url', f'https://{site_slug}.com')}',
-    title: '{business.get('name', '')} - {business.get('positioning', '')}',
-    description: `{business.get('services', '')} à {business.get('city', '')}. Devis gratuit et intervention rapide.`,
-    siteName: '{business.get('name', '')}',
+    url: '{site_url}',
+    title: '{name} - {positioning}',
+    description: `{services} à {city}. Devis gratuit et intervention rapide.`,
+    siteName: '{name}',
     images: [
       {{
-        url: '{business.get('domain_url', f'https://{site_slug}.com')}/og-image.jpg',
+        url: '{site_url}/og-image.jpg',
         width: 1200,
         height: 630,
-        alt: '{business.get('name', '')} - {business.get('positioning', '')}',
+        alt: '{name} - {positioning}',
       }},
     ],
   }},
   twitter: {{
     card: 'summary_large_image',
-    title: '{business.get('name', '')} - {business.get('positioning', '')}',
-    description: `{business.get('services', '')} à {business.get('city', '')}`,
-    images: ['{business.get('domain_url', f'https://{site_slug}.com')}/og-image.jpg'],
+    title: '{name} - {positioning}',
+    description: `{services} à {city}`,
+    images: ['{site_url}/og-image.jpg'],
   }},
   robots: {{
     index: true,
@@ -365,7 +283,7 @@ export const metadata: Metadata = {{
     google: 'your-google-verification-code-here',
   }},
   alternates: {{
-    canonical: '{business.get('domain_url', f'https://{site_slug}.com')}',
+    canonical: '{site_url}',
   }},
 }};
 
@@ -466,9 +384,9 @@ export {{ StructuredData }} from './StructuredData';
 Crée {site_dir}/README.md:
 
 ```markdown
-# {business.get('name', '')}
+# {name}
 
-Site web professionnel pour {business.get('name', '')} - {business.get('positioning', '')} à {business.get('city', '')}.
+Site web professionnel pour {name} - {positioning} à {city}.
 
 ## 🚀 Technologies
 
@@ -513,15 +431,15 @@ npm start
 
 ## 📞 Contact
 
-**{business.get('name', '')}**
-{business.get('street', '')}
-{business.get('postal_code', '')} {business.get('city', '')}
-📞 {business.get('phone', '')}
-📧 {business.get('email', '')}
+**{name}**
+{street}
+{postal_code} {city}
+📞 {phone}
+📧 {email}
 
 ## 📄 License
 
-© {business.get('year', '')} {business.get('name', '')}. Tous droits réservés.
+© {year} {name}. Tous droits réservés.
 ```
 
 ═══════════════════════════════════════════════════════════
@@ -530,15 +448,12 @@ npm start
 
 Vérifie que :
 ✓ StructuredData component créé avec tous les schemas JSON-LD
-✓ Sitemap.xml créé dans public/
-✓ Robots.txt créé dans public/
-✓ Manifest.json créé pour PWA
 ✓ Layout mis à jour avec metadata complètes
 ✓ API route /api/contact créée
 ✓ README.md documentation créé
 ✓ Tous les schemas incluent les bonnes infos business
 ✓ Open Graph et Twitter Cards configurés
-✓ SEO metadata optimisées pour {business.get('city', '')}
+✓ SEO metadata optimisées pour {city}
 ✓ Aucune erreur TypeScript
 
 Une fois terminé, réponds avec:
@@ -547,4 +462,70 @@ Une fois terminé, réponds avec:
 - Confirmation que le site est 100% prêt pour production
 - Prêt pour build et déploiement !
 
-🎉 FÉLICITATIONS ! Les 5 phases sont maintenant complètes."""
+🎉 FÉLICITATIONS ! Les 5 phases sont maintenant complètes.""")
+
+    # Schema JSON-LD Service, rendu pour chacun des 3 premiers services
+    SERVICE_SCHEMA = PromptTemplate("""    {{
+      '@context': 'https://schema.org',
+      '@type': 'Service',
+      name: '{service}',
+      description: 'Service professionnel de {service_lower} à {city} et alentours.',
+      provider: {{
+        '@type': 'LocalBusiness',
+        name: '{name}',
+        telephone: '{phone}',
+      }},
+      areaServed: {{
+        '@type': 'City',
+        name: '{city}',
+      }},
+    }}""")
+
+    @staticmethod
+    def get_prompt(business: Dict[str, Any], site_slug: str, site_dir: str) -> str:
+        """
+        Génère le prompt de création du contenu SEO final
+
+        Ce prompt est ENRICHI avec :
+        - JSON-LD schemas (LocalBusiness, Organization, BreadcrumbList)
+        - Meta tags Open Graph et Twitter
+        - sitemap.xml, robots.txt et manifest.json sont rendus par BoilerplateRenderer
+        - Structured data pour Google Rich Results
+        - Alt texts optimisés pour images
+        - Aria labels pour accessibilité
+        """
+        return ContentAgent.PROMPT.compose(**ContentAgent.get_slots(business, site_slug, site_dir))
+
+    @staticmethod
+    def get_slots(business: Dict[str, Any], site_slug: str, site_dir: str) -> Dict[str, Any]:
+        """Valeurs des slots du prompt (DONNÉES DU PROJET) pour un job"""
+        services_list = business.get('services', '').split(',')
+
+        return {
+            "site_dir": site_dir,
+            "name": business.get('name', ''),
+            "city": business.get('city', ''),
+            "country": business.get('country', 'Luxembourg'),
+            "services": business.get('services', ''),
+            "phone": business.get('phone', ''),
+            "email": business.get('email', ''),
+            "street": business.get('street', ''),
+            "postal_code": business.get('postal_code', ''),
+            "site_url": BoilerplateRenderer.site_url(business, site_slug),
+            "year": business.get('year', ''),
+            "hours": business.get('hours', 'Lundi-Vendredi 8h-18h'),
+            "positioning_or_default": business.get('positioning', 'Service professionnel'),
+            "address_country": business.get('country', 'LU'),
+            "service_schemas": ', '.join(
+                ContentAgent.SERVICE_SCHEMA.render(
+                    service=service.strip(),
+                    service_lower=service.strip().lower(),
+                    city=business.get('city', ''),
+                    name=business.get('name', ''),
+                    phone=business.get('phone', '')
+                )
+                for service in services_list[:3]
+            ),
+            "positioning": business.get('positioning', ''),
+            "service_keywords": ', '.join(f"    '{service.strip()}'" for service in services_list[:5])
+        }
@@ -0,0 +1,121 @@
+"""
+Prompt Template - Prompts d'agent précompilés
+Le corps d'un prompt (plusieurs centaines de lignes d'instructions communes à
+tous les jobs) est découpé une seule fois en segments littéraux et en slots.
+
+Disposition compatible avec le cache de prompt: les instructions, où chaque
+slot apparaît sous la forme ⟨slot⟩, sont identiques pour tous les jobs et
+placées en premier (system prompt de la session); seules les données du job
+(DONNÉES DU PROJET) varient et viennent en dernier
+"""
+from string import Formatter
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+DATA_HEADER = """═══════════════════════════════════════════════════════════
+📋 DONNÉES DU PROJET
+═══════════════════════════════════════════════════════════
+"""
+
+DATA_NOTE = (
+    "Les champs notés ⟨champ⟩ dans ces instructions désignent les valeurs de la section "
+    "DONNÉES DU PROJET fournie après ces instructions: utilise toujours ces valeurs exactes.\n"
+    "Le répertoire de travail de la session est ⟨site_dir⟩: crée et modifie les fichiers "
+    "uniquement sous ⟨site_dir⟩."
+)
+
+DATA_FOOTER = "Réalise maintenant ta mission pour ce projet, chaque ⟨champ⟩ des instructions remplacé par sa valeur."
+
+
+class PromptTemplate:
+    """
+    Template de prompt compilé à l'import (syntaxe str.format: {slot}, {{ et }} littéraux)
+
+    Seuls les slots nommés simples sont acceptés (ni index, ni attribut, ni
+    format): les valeurs sont calculées par get_slots, le template n'est que
+    du texte.
+
+    - instructions: texte statique (slots notés ⟨slot⟩), construit une fois
+    - data_block(): valeurs des slots d'un job
+    - compose(): instructions puis données, en un seul prompt
+    - render(): substitution directe des slots (fragments rendus par job)
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: List[str] = []
+        # (index dans _parts, nom du slot)
+        self._slots: List[Tuple[int, str]] = []
+
+        # Formatter().parse coupe le texte à chaque {{ / }}: les littéraux
+        # consécutifs sont fusionnés pour ne joindre que texte + slots
+        literal_after_slot = True
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                if literal_after_slot:
+                    self._parts.append(literal)
+                else:
+                    self._parts[-1] += literal
+                literal_after_slot = False
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Slot invalide dans le template: {field!r}")
+            self._slots.append((len(self._parts), field))
+            self._parts.append("")
+            literal_after_slot = True
+
+        self.slots: FrozenSet[str] = frozenset(name for _, name in self._slots)
+        # Slots dans leur ordre de première apparition (ordre des DONNÉES DU PROJET)
+        self._ordered_slots: List[str] = list(dict.fromkeys(name for _, name in self._slots))
+
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            parts[index] = f"⟨{name}⟩"
+        self.instructions = "".join(parts).rstrip() + "\n\n" + DATA_NOTE
+        # Taille du texte commun à tous les jobs
+        self.static_size = len(self.instructions)
+
+    def data_block(self, **values: Any) -> str:
+        """
+        Section DONNÉES DU PROJET: valeur de chaque slot pour un job
+
+        Args:
+            **values: Valeur de chaque slot (convertie avec str)
+
+        Raises:
+            KeyError: Slot manquant ou inconnu
+        """
+        self._check(values)
+        lines = [DATA_HEADER]
+        for name in self._ordered_slots:
+            value = str(values[name])
+            lines.append(f"⟨{name}⟩:\n{value}" if "\n" in value else f"⟨{name}⟩: {value}")
+        lines.append("")
+        lines.append(DATA_FOOTER)
+        return "\n".join(lines)
+
+    def compose(self, **values: Any) -> str:
+        """Prompt complet en une chaîne: instructions statiques puis données du job"""
+        return f"{self.instructions}\n\n{self.data_block(**values)}"
+
+    def render(self, **values: Any) -> str:
+        """
+        Remplit directement les slots du template
+
+        Args:
+            **values: Valeur de chaque slot (convertie avec str)
+
+        Raises:
+            KeyError: Slot manquant ou inconnu
+        """
+        self._check(values)
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            parts[index] = str(values[name])
+        return "".join(parts)
+
+    def _check(self, values: Dict[str, Any]):
+        if values.keys() != self.slots:
+            missing = sorted(self.slots - values.keys())
+            unknown = sorted(values.keys() - self.slots)
+            raise KeyError(f"Slots manquants: {missing}, inconnus: {unknown}")
@@ -0,0 +1,173 @@
+"""
+Batch - Lecture et validation des requêtes de génération par lot
+Corps accepté selon le Content-Type: tableau JSON, NDJSON (une requête par
+ligne) ou CSV avec en-tête (colonnes = champs de SiteGenerationRequest).
+NDJSON et CSV sont lus au fil de la réception: un lot trop grand est refusé
+sans attendre la fin de l'upload
+"""
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from pydantic import ValidationError
+
+from app.api.schemas import SiteGenerationRequest
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+CSV_TYPES = ("text/csv", "application/csv")
+
+# Nombre maximal d'entrées invalides détaillées dans la réponse 422
+MAX_REPORTED_ERRORS = 50
+
+# (index dans le lot, ligne du corps ou None pour un tableau JSON, données brutes)
+BatchRecord = Tuple[int, Optional[int], Any]
+
+
+class BatchFormatError(Exception):
+    """Corps de lot illisible (format, encodage, taille)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def read_batch(request: Request, max_sites: int) -> List[BatchRecord]:
+    """
+    Lit les entrées brutes d'un lot selon le Content-Type de la requête
+
+    Args:
+        request: Requête HTTP (corps non encore lu)
+        max_sites: Nombre maximal d'entrées acceptées
+
+    Returns:
+        Entrées du lot, dans l'ordre du corps
+
+    Raises:
+        BatchFormatError: Format non supporté (415), illisible (400) ou lot trop grand (413)
+    """
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+
+    try:
+        if content_type in NDJSON_TYPES:
+            records = await _read_ndjson(request, max_sites)
+        elif content_type in CSV_TYPES:
+            records = await _read_csv(request, max_sites)
+        elif content_type == "application/json" or content_type.endswith("+json"):
+            records = await _read_json(request)
+        else:
+            raise BatchFormatError(
+                f"Content-Type non supporté: {content_type} (application/json, application/x-ndjson ou text/csv)",
+                status_code=415
+            )
+    except UnicodeDecodeError:
+        raise BatchFormatError("Corps non encodé en UTF-8")
+
+    if len(records) > max_sites:
+        raise BatchFormatError(f"Lot limité à {max_sites} sites", status_code=413)
+    return records
+
+
+def validate_batch(records: List[BatchRecord]) -> Tuple[List[Tuple[int, SiteGenerationRequest]], List[Dict[str, Any]]]:
+    """
+    Valide toutes les entrées d'un lot (SiteGenerationRequest)
+
+    Returns:
+        (entrées valides avec leur index, erreurs par entrée invalide)
+    """
+    sites, errors = [], []
+    for index, line, data in records:
+        try:
+            if not isinstance(data, dict):
+                raise TypeError(f"objet attendu, reçu {type(data).__name__}")
+            sites.append((index, SiteGenerationRequest.model_validate(data)))
+        except (ValidationError, TypeError) as e:
+            details = (e.errors(include_url=False, include_context=False, include_input=False)
+                       if isinstance(e, ValidationError) else [{"msg": str(e)}])
+            errors.append({"index": index, "line": line, "errors": details})
+    return sites, errors
+
+
+async def _read_json(request: Request) -> List[BatchRecord]:
+    """Tableau JSON de requêtes"""
+    try:
+        data = json.loads(await request.body())
+    except json.JSONDecodeError as e:
+        raise BatchFormatError(f"JSON invalide: {str(e)}")
+    if not isinstance(data, list):
+        raise BatchFormatError("Tableau JSON de requêtes attendu")
+    return [(index, None, item) for index, item in enumerate(data)]
+
+
+async def _read_ndjson(request: Request, max_sites: int) -> List[BatchRecord]:
+    """Une requête JSON par ligne (lignes vides ignorées)"""
+    records: List[BatchRecord] = []
+    async for number, line in _lines(request):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise BatchFormatError(f"Ligne {number}: JSON invalide ({str(e)})")
+        records.append((len(records), number, data))
+        if len(records) > max_sites:
+            break
+    return records
+
+
+async def _read_csv(request: Request, max_sites: int) -> List[BatchRecord]:
+    """
+    CSV avec en-tête; une cellule vide laisse la valeur par défaut du champ
+
+    Une ligne physique n'est un enregistrement complet que si ses guillemets
+    sont équilibrés (champ entre guillemets contenant un retour à la ligne).
+    """
+    records: List[BatchRecord] = []
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    start = 0
+
+    async for number, line in _lines(request):
+        if not pending:
+            start = number
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            continue
+        pending = []
+        if not text.strip():
+            continue
+
+        row = next(csv.reader(io.StringIO(text)))
+        if header is None:
+            header = [column.strip() for column in row]
+            continue
+        if len(row) > len(header):
+            raise BatchFormatError(f"Ligne {start}: {len(row)} colonnes pour un en-tête de {len(header)}")
+
+        data = {column: value.strip() for column, value in zip(header, row) if column and value.strip()}
+        records.append((len(records), start, data))
+        if len(records) > max_sites:
+            break
+
+    if pending:
+        raise BatchFormatError(f"Ligne {start}: guillemet non fermé")
+    return records
+
+
+async def _lines(request: Request) -> AsyncIterator[Tuple[int, str]]:
+    """Lignes du corps au fil de la réception, numérotées à partir de 1"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    number = 0
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *complete, buffer = buffer.split("\n")
+        for line in complete:
+            number += 1
+            yield number, line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield number + 1, buffer.rstrip("\r")
@@ -4,17 +4,31 @@ API Routers - Tous les endpoints FastAPI
 import os
 import json
 import logging
-import anthropic
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Header, Request
+from fastapi.responses import StreamingResponse
 
 from app.api.schemas import (
     BusinessData,
     SiteGenerationRequest,
     JobResponse,
+    BatchJob,
+    BatchResponse,
     PrefillResponse
 )
+from app.api.batch import BatchFormatError, MAX_REPORTED_ERRORS, read_batch, validate_batch
 from app.core.config import get_settings
-from app.services.job_manager import job_manager
+from app.core.ids import new_batch_id
+from app.services.job_manager import job_manager, TERMINAL_STATUSES
+from app.services.job_events import job_events
+from app.services.anthropic_client import anthropic_client
+from app.services.prefill_cache import prefill_cache
+from app.services.scheduler import job_scheduler, QueueFullError
+from app.services.session_pool import session_pool
+from app.services.phase_metrics import phase_metrics
+from app.services.workspace import workspace_manager
+from app.services.build_manifest import BuildManifest
 
 # Ancien système monolithique (commenté mais disponible si besoin de rollback)
 # from app.services.generator import GeneratorService
@@ -28,6 +42,11 @@ settings = get_settings()
 router = APIRouter()
 
 
+def _site_slug(request: SiteGenerationRequest) -> str:
+    """Slug du site généré pour une entreprise (ex: "plomberie-luxembourg")"""
+    return f"{request.name.lower().replace(' ', '-')}-{request.city.lower()}"
+
+
 @router.post("/prefill", response_model=PrefillResponse)
 async def prefill_form(data: BusinessData):
     """
@@ -39,9 +58,11 @@ async def prefill_form(data: BusinessData):
     Returns:
         Données extraites pour pré-remplir le formulaire
     """
-    try:
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    cached = prefill_cache.get(data.description, settings.prefill_model)
+    if cached is not None:
+        return PrefillResponse(success=True, data=cached)
 
+    try:
         prompt = f"""Analyse cette description d'entreprise et extrais UNIQUEMENT les informations concrètes mentionnées. Si une information n'est PAS explicitement mentionnée, utilise null.
 
 Description: {data.description}
@@ -65,8 +86,8 @@ IMPORTANT:
 - Copie les informations EXACTEMENT comme données
 - Utilise null si une info n'est pas dans la description"""
 
-        message = client.messages.create(
-            model="claude-sonnet-4-5",
+        message = await anthropic_client.create_message(
+            model=settings.prefill_model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}]
         )
@@ -86,6 +107,7 @@ IMPORTANT:
             if parsed_data[key] is None:
                 parsed_data[key] = ""
 
+        prefill_cache.set(data.description, settings.prefill_model, parsed_data)
         return PrefillResponse(success=True, data=parsed_data)
 
     except json.JSONDecodeError as e:
@@ -96,36 +118,205 @@ IMPORTANT:
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
 
+@router.get("/prefill/cache")
+async def prefill_cache_stats():
+    """
+    Statistiques du cache de prefill
+
+    Returns:
+        Compteurs hit/miss, taux de hit et occupation du cache
+    """
+    return prefill_cache.stats()
+
+
 @router.post("/generate", response_model=JobResponse)
-async def generate_site(request: SiteGenerationRequest, background_tasks: BackgroundTasks):
+async def generate_site(request: SiteGenerationRequest):
     """
-    Lance la génération d'un site avec agents spécialisés pour GitHub et Vercel
+    Place la génération d'un site dans la file d'attente du scheduler
 
     Args:
         request: Données complètes de l'entreprise
-        background_tasks: Gestionnaire de tâches asynchrones FastAPI
 
     Returns:
-        Informations du job créé
+        Informations du job créé (avec sa position dans la file)
     """
-    site_slug = f"{request.name.lower().replace(' ', '-')}-{request.city.lower()}"
+    site_slug = _site_slug(request)
 
-    # Créer le job
-    job_id = job_manager.create_job(site_slug)
+    # Un seul job à la fois par site (même site_dir, manifeste et points de reprise)
+    active_id = job_manager.find_active(site_slug)
+    if active_id is not None:
+        raise HTTPException(status_code=409, detail={
+            "message": f"Un job est déjà en cours pour {site_slug}",
+            "job_id": active_id
+        })
+
+    # Créer le job (les données sont conservées pour une éventuelle reprise)
+    business_dict = request.model_dump(exclude={"priority"})
+    job_id = job_manager.create_job(site_slug, business_dict)
+
+    # Placer la génération dans la file d'attente
+    try:
+        position = job_scheduler.submit(
+            job_id,
+            GeneratorService.run_generation_workflow,
+            job_id,
+            business_dict,
+            site_slug,
+            priority=request.priority
+        )
+    except QueueFullError as e:
+        job_manager.delete_job(job_id)
+        raise HTTPException(status_code=503, detail=str(e))
 
-    # Lancer la génération en arrière-plan
-    business_dict = request.model_dump()
-    background_tasks.add_task(
-        GeneratorService.run_generation_workflow,
-        job_id,
-        business_dict,
-        site_slug
+    return JobResponse(
+        job_id=job_id,
+        status="pending",
+        message=f"Génération en file d'attente (position {position})",
+        queue_position=position
     )
 
+
+@router.post("/generate/batch", response_model=BatchResponse)
+async def generate_batch(request: Request):
+    """
+    Place la génération de plusieurs sites dans la file d'attente, sous un même ID de lot
+
+    Corps: tableau JSON, NDJSON (application/x-ndjson) ou CSV avec en-tête
+    (text/csv) de SiteGenerationRequest. Toutes les entrées sont validées
+    avant de créer le moindre job; un slug déjà soumis dans le lot ou en
+    cours de génération n'est pas soumis une seconde fois. Les jobs passent
+    par la même file et les mêmes limites de concurrence qu'un job seul.
+
+    Returns:
+        ID du lot, jobs créés (avec leur position dans la file) et doublons ignorés
+    """
+    try:
+        records = await read_batch(request, settings.batch_max_sites)
+    except BatchFormatError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    if not records:
+        raise HTTPException(status_code=422, detail="Lot vide")
+
+    sites, errors = validate_batch(records)
+    if errors:
+        raise HTTPException(status_code=422, detail={
+            "message": f"{len(errors)} entrée(s) invalide(s) sur {len(records)}, aucun job créé",
+            "errors": errors[:MAX_REPORTED_ERRORS]
+        })
+
+    batch_id = new_batch_id()
+    submitted, duplicates, by_slug = [], [], {}
+    for index, site in sites:
+        site_slug = _site_slug(site)
+        if site_slug in by_slug:
+            duplicates.append({"index": index, "site_slug": site_slug, "job_id": by_slug[site_slug],
+                               "reason": "slug en double dans le lot"})
+            continue
+        active_id = job_manager.find_active(site_slug)
+        if active_id is not None:
+            duplicates.append({"index": index, "site_slug": site_slug, "job_id": active_id,
+                               "reason": "génération déjà en cours"})
+            continue
+
+        business_dict = site.model_dump(exclude={"priority"})
+        job_id = job_manager.create_job(site_slug, business_dict, batch_id=batch_id)
+        by_slug[site_slug] = job_id
+        submitted.append((index, site_slug, job_id, business_dict, site.priority))
+
+    try:
+        positions = job_scheduler.submit_many([
+            (job_id, GeneratorService.run_generation_workflow, (job_id, business_dict, site_slug), priority)
+            for _, site_slug, job_id, business_dict, priority in submitted
+        ])
+    except QueueFullError as e:
+        for _, _, job_id, _, _ in submitted:
+            job_manager.delete_job(job_id)
+        raise HTTPException(status_code=503, detail=str(e))
+
+    job_manager.create_batch(batch_id, [job_id for _, _, job_id, _, _ in submitted], duplicates)
+
+    return BatchResponse(
+        batch_id=batch_id,
+        status="pending",
+        message=f"{len(submitted)} génération(s) en file d'attente, {len(duplicates)} doublon(s) ignoré(s)",
+        total=len(records),
+        jobs=[
+            BatchJob(index=index, job_id=job_id, site_slug=site_slug, queue_position=positions[job_id])
+            for index, site_slug, job_id, _, _ in submitted
+        ],
+        duplicates=duplicates
+    )
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """
+    Progression agrégée d'un lot
+
+    Args:
+        batch_id: ID du lot
+
+    Returns:
+        Statut global, nombre de jobs par statut, progression moyenne et résumé de chaque job
+    """
+    batch = job_manager.get_batch(batch_id)
+
+    if not batch:
+        raise HTTPException(status_code=404, detail=f"Lot {batch_id} introuvable")
+
+    return batch
+
+
+@router.post("/regenerate/{site_slug}", response_model=JobResponse)
+async def regenerate_site(site_slug: str, request: SiteGenerationRequest):
+    """
+    Régénération incrémentale d'un site déjà généré
+
+    Seules les phases dont les champs lus par leur prompt (ou la version du
+    prompt) ont changé sont relancées, et seuls les fichiers modifiés et leurs
+    importeurs sont revalidés.
+
+    Args:
+        site_slug: Slug du site existant
+        request: Données complètes (mises à jour) de l'entreprise
+
+    Returns:
+        Informations du job créé (avec sa position dans la file)
+    """
+    site_dir = os.path.join(settings.output_dir, site_slug)
+    if os.path.dirname(os.path.normpath(site_dir)) != os.path.normpath(settings.output_dir) \
+            or not BuildManifest.exists(site_dir):
+        raise HTTPException(status_code=404, detail=f"Aucun site généré pour {site_slug}")
+
+    # Deux workflows sur le même site_dir écriraient les mêmes fichiers et le même manifeste
+    active_id = job_manager.find_active(site_slug)
+    if active_id is not None:
+        raise HTTPException(status_code=409, detail={
+            "message": f"Un job est déjà en cours pour {site_slug}",
+            "job_id": active_id
+        })
+
+    business_dict = request.model_dump(exclude={"priority"})
+    job_id = job_manager.create_job(site_slug, business_dict, workflow="regeneration")
+
+    try:
+        position = job_scheduler.submit(
+            job_id,
+            GeneratorService.run_regeneration_workflow,
+            job_id,
+            business_dict,
+            site_slug,
+            priority=request.priority
+        )
+    except QueueFullError as e:
+        job_manager.delete_job(job_id)
+        raise HTTPException(status_code=503, detail=str(e))
+
     return JobResponse(
         job_id=job_id,
         status="pending",
-        message="Génération démarrée avec agents spécialisés"
+        message=f"Régénération en file d'attente (position {position})",
+        queue_position=position
     )
 
 
@@ -148,16 +339,175 @@ async def get_job_status(job_id: str):
     return job
 
 
+@router.get("/status/{job_id}/stream")
+async def stream_job_status(job_id: str, request: Request, last_event_id: Optional[str] = Header(default=None)):
+    """
+    Flux Server-Sent Events des mises à jour d'un job
+
+    Chaque événement "status" contient le snapshot complet du job. Le flux se
+    termine quand le job atteint un statut terminal. Un client reconnecté avec
+    le header Last-Event-ID reçoit les événements manqués.
+
+    Args:
+        job_id: ID du job
+        last_event_id: Dernier ID d'événement reçu (reprise après coupure)
+
+    Returns:
+        Réponse text/event-stream
+    """
+    job = job_manager.get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} introuvable")
+
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    return StreamingResponse(
+        _job_event_stream(job_id, request, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _format_sse(event_id: int, payload: dict) -> str:
+    """Sérialise un événement au format SSE"""
+    return f"id: {event_id}\nevent: status\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def _job_event_stream(job_id: str, request: Request, last_event_id: Optional[int]):
+    """Générateur SSE: snapshot/rejeu initial puis événements en direct"""
+    queue, replay, complete = job_events.subscribe(job_id, last_event_id)
+    try:
+        if not complete:
+            # Historique insuffisant: le snapshot courant remplace le rejeu
+            job = job_manager.get_job(job_id)
+            sent_id = job_events.last_event_id(job_id)
+            yield _format_sse(sent_id, job)
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            replay = []
+        else:
+            sent_id = last_event_id
+
+        for event_id, payload in replay:
+            sent_id = event_id
+            yield _format_sse(event_id, payload)
+            if payload["status"] in TERMINAL_STATUSES:
+                return
+
+        while True:
+            try:
+                event_id, payload = await asyncio.wait_for(queue.get(), timeout=settings.sse_keepalive_interval)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            if event_id <= sent_id:
+                continue
+            sent_id = event_id
+            yield _format_sse(event_id, payload)
+            if payload["status"] in TERMINAL_STATUSES:
+                return
+    finally:
+        job_events.unsubscribe(job_id, queue)
+
+
 @router.get("/jobs")
-async def list_all_jobs():
+async def list_all_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None
+):
+    """
+    Liste les jobs de génération, page par page
+
+    Args:
+        limit: Nombre de jobs par page
+        cursor: Curseur "next_cursor" retourné par la page précédente
+        status: Filtre optionnel sur le statut
+
+    Returns:
+        Page de jobs triés par date (plus récents en premier) et curseur suivant
+    """
+    jobs, next_cursor = job_manager.list_jobs(limit=limit, cursor=cursor, status=status)
+    return {"jobs": jobs, "next_cursor": next_cursor}
+
+
+@router.post("/jobs/{job_id}/resume", response_model=JobResponse)
+async def resume_job(job_id: str, priority: int = Query(0, ge=0, le=10)):
+    """
+    Relance un job échoué à partir de sa première phase non terminée
+
+    Les phases terminées (points de reprise enregistrés dans le job) dont les
+    fichiers sont toujours présents ne sont pas réexécutées: un échec de la
+    publication GitHub ne coûte plus une génération complète.
+
+    Args:
+        job_id: ID du job échoué
+        priority: Priorité dans la file
+
+    Returns:
+        Informations du job relancé (avec sa position dans la file)
+    """
+    job = job_manager.get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} introuvable")
+    if job["status"] != "failed":
+        raise HTTPException(status_code=409, detail=f"Seul un job échoué peut être repris (statut: {job['status']})")
+    if not job.get("business_data"):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} sans données de reprise")
+
+    # Un job plus récent sur le même site écrit déjà dans son site_dir
+    active_id = job_manager.find_active(job["site_slug"])
+    if active_id is not None:
+        raise HTTPException(status_code=409, detail={
+            "message": f"Un job est déjà en cours pour {job['site_slug']}",
+            "job_id": active_id
+        })
+
+    workflow = (GeneratorService.run_regeneration_workflow if job.get("workflow") == "regeneration"
+                else GeneratorService.run_generation_workflow)
+    completed = sorted(job.get("checkpoints") or {})
+
+    job_manager.update_job(
+        job_id, "pending", 0, f"Reprise en file d'attente ({len(completed)} phase(s) déjà terminée(s))",
+        error=None,
+        resumes=(job.get("resumes") or 0) + 1
+    )
+    try:
+        position = job_scheduler.submit(
+            job_id,
+            workflow,
+            job_id,
+            job["business_data"],
+            job["site_slug"],
+            priority=priority
+        )
+    except QueueFullError as e:
+        job_manager.update_job(job_id, "failed", 0, f"Reprise impossible: {str(e)}", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return JobResponse(
+        job_id=job_id,
+        status="pending",
+        message=f"Reprise en file d'attente (position {position})",
+        queue_position=position
+    )
+
+
+@router.get("/metrics")
+async def get_phase_metrics():
     """
-    Liste tous les jobs de génération
+    Métriques agrégées par phase sur les dernières exécutions
 
     Returns:
-        Liste de tous les jobs triés par date
+        Percentiles de durée, coût et tokens par phase, et part de chaque
+        phase dans la latence et le coût totaux
     """
-    jobs = job_manager.get_all_jobs()
-    return {"jobs": jobs}
+    return phase_metrics.summary()
 
 
 @router.get("/health")
@@ -173,5 +523,8 @@ async def health_check():
         "version": settings.app_version,
         "anthropic_api_configured": bool(settings.anthropic_api_key),
         "github_token_configured": bool(settings.github_token),
-        "vercel_token_configured": bool(settings.vercel_token)
+        "vercel_token_configured": bool(settings.vercel_token),
+        "scheduler": job_scheduler.stats(),
+        "session_pool": session_pool.stats(),
+        "workspace": workspace_manager.stats()
     }
@@ -2,7 +2,7 @@
 Modèles Pydantic pour la validation des données d'API
 """
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -28,6 +28,10 @@ class SiteGenerationRequest(BaseModel):
     primary_color: str = Field(default="#1a5490", description="Couleur primaire (hex)")
     secondary_color: str = Field(default="#ff8c42", description="Couleur secondaire (hex)")
     domain_url: Optional[str] = Field(default=None, description="URL du domaine")
+    custom_design_system: bool = Field(
+        default=False, description="Design system personnalisé (composants UI générés par l'agent au lieu du squelette)"
+    )
+    priority: int = Field(default=0, ge=0, le=10, description="Priorité dans la file (plus élevé = traité en premier)")
 
 
 class JobStatus(BaseModel):
@@ -47,6 +51,25 @@ class JobResponse(BaseModel):
     job_id: str
     status: str
     message: str
+    queue_position: Optional[int] = None
+
+
+class BatchJob(BaseModel):
+    """Job créé pour une entrée d'un lot"""
+    index: int = Field(description="Position de l'entrée dans le lot (0 = première)")
+    job_id: str
+    site_slug: str
+    queue_position: Optional[int] = None
+
+
+class BatchResponse(BaseModel):
+    """Réponse lors de la création d'un lot de jobs"""
+    batch_id: str
+    status: str
+    message: str
+    total: int = Field(description="Nombre d'entrées reçues")
+    jobs: List[BatchJob]
+    duplicates: List[Dict[str, Any]] = Field(default_factory=list, description="Entrées ignorées (slug déjà soumis)")
 
 
 class PrefillResponse(BaseModel):
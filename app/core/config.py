@@ -27,12 +27,95 @@ class Settings(BaseSettings):
     # Directories
     output_dir: str = "/tmp/generated-sites"
 
+    # Client Anthropic (prefill)
+    prefill_model: str = "claude-sonnet-4-5"
+    anthropic_timeout: float = 60.0  # secondes
+    anthropic_connect_timeout: float = 10.0
+    anthropic_max_retries: int = 2
+    anthropic_max_connections: int = 20
+    anthropic_keepalive_expiry: float = 30.0
+    anthropic_max_concurrent_requests: int = 10
+
+    # Cache des résultats de prefill
+    prefill_cache_max_entries: int = 1000
+    prefill_cache_ttl: float = 7 * 24 * 3600  # secondes
+    prefill_cache_path: Optional[str] = None  # ex: "prefill_cache.json" pour persister
+
+    # Cache node_modules partagé entre sites
+    dependency_cache_dir: str = "/tmp/saas-generator-deps"
+    dependency_link_mode: str = "hardlink"  # "hardlink" (clonage: reflink, sinon hardlink) ou "symlink"
+    workspace_clone_mode: str = "auto"  # "auto" (reflink, sinon hardlink si immuable, sinon copie), "reflink", "hardlink", "copy"
+    golden_skeleton_enabled: bool = True  # composants UI clonés du squelette (agent si design system personnalisé)
+    golden_skeleton_dir: str = "/tmp/saas-generator-skeletons"
+    npm_install_timeout: int = 900  # secondes
+
+    # Pool de sessions Claude Code CLI
+    session_pool_warm_per_key: int = 1  # sessions préchauffées par signature (0 = désactivé)
+    session_pool_max_idle: int = 8  # sessions inactives max (tous sites confondus)
+    session_pool_idle_ttl: float = 120.0  # secondes avant fermeture d'une session inactive
+    session_prewarm_lead: float = 10.0  # secondes d'avance (+ démarrage CLI) sur la fin attendue de la phase amont
+    session_reuse_conversation: bool = False  # phases de génération dans une même conversation
+
     # Agent Configuration
     agent_model: str = "claude-sonnet-4-5-20250929"
-    agent_timeout: int = 600  # 10 minutes
+    agent_timeout: int = 600  # 10 minutes, délai par défaut d'une session d'agent
+    phase_timeouts: dict = {}  # délais spécifiques par phase (secondes), ex: {"github": 300}
+    agent_max_attempts: int = 3  # tentatives par session sur erreur transitoire
+    retry_backoff_base: float = 2.0  # secondes, doublé à chaque tentative (jitter complet)
+    retry_backoff_max: float = 60.0
+    non_idempotent_phases: list = ["github", "vercel"]  # effets externes: pas de nouvel essai après délai dépassé
+    # Budgets en tokens par job (python -m app.tools.prompt_budget), "total" = les 5 agents
+    prompt_token_budgets: dict = {
+        "SetupAgent": 3700,
+        "ComponentAgent": 5200,
+        "SectionAgent": 12400,
+        "PageAgent": 12600,
+        "ContentAgent": 5600,
+        "total": 39500,
+    }
+
+    # Job store
+    job_store_backend: str = "sqlite"  # "sqlite" ou "memory"
+    job_store_path: str = "saas_generator.db"
+    job_store_flush_interval: float = 1.0  # secondes
+    job_store_batch_size: int = 50
+
+    # Progression temps réel (SSE)
+    sse_keepalive_interval: float = 15.0  # secondes
+
+    # Scheduler (admission control des jobs de génération)
+    max_concurrent_jobs: int = 2
+    max_queued_jobs: int = 1000  # un lot (/generate/batch) doit y tenir entièrement
+    batch_max_sites: int = 500  # sites par requête /generate/batch
+    job_deadline: int = 3600  # secondes par job, toutes phases confondues (0 = aucun)
+    job_cancel_grace: float = 30.0  # secondes laissées à un job annulé avant de libérer son slot
+    phase_concurrency_limits: dict = {
+        "setup": 2,
+        "components": 4,
+        "sections": 4,
+        "pages": 4,
+        "content": 4,
+        "validation": 2,
+        "fix": 4,
+        "github": 2,
+        "vercel": 2
+    }
 
     # Validation
     max_validation_attempts: int = 3
+    validation_typecheck: bool = False  # tsc --noEmit (nécessite node_modules)
+    validation_build: bool = False  # next build complet
+    validation_command_timeout: int = 300  # secondes
+    fix_max_parallel_sessions: int = 3  # sessions d'auto-fix simultanées par job
+    fix_max_groups: int = 6  # groupes de fichiers max par tentative (fusion au-delà)
+
+    # Logging
+    log_level: str = "INFO"
+    log_file: str = "saas_generator.log"
+    log_json: bool = True  # fichier en JSON (une ligne par enregistrement)
+    log_max_bytes: int = 10 * 1024 * 1024  # rotation à 10 Mo
+    log_backup_count: int = 5
+    log_max_message_chars: int = 4000  # au-delà, le message est tronqué
 
     class Config:
         env_file = ".env"
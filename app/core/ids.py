@@ -0,0 +1,48 @@
+"""
+Identifiants uniques triables (style ULID)
+48 bits de timestamp (ms) + 80 bits d'entropie, encodés en base32 Crockford (26 caractères)
+"""
+import itertools
+import os
+import time
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_MASK_40 = (1 << 40) - 1
+
+# 40 bits aléatoires fixés par process + compteur 40 bits: unicité entre process,
+# ordre strict au sein d'une même milliseconde. next() sur itertools.count est
+# atomique sous le GIL, donc aucun verrou n'est nécessaire.
+_process_entropy = int.from_bytes(os.urandom(5), "big")
+_counter = itertools.count(int.from_bytes(os.urandom(4), "big"))
+_last_ms = 0
+
+
+def new_ulid() -> str:
+    """
+    Génère un identifiant monotone et triable lexicographiquement par date
+
+    Returns:
+        Chaîne de 26 caractères base32 Crockford
+    """
+    global _last_ms
+    # Protège l'ordre contre un recul de l'horloge système
+    now_ms = max(time.time_ns() // 1_000_000, _last_ms)
+    _last_ms = now_ms
+
+    value = (now_ms << 80) | (_process_entropy << 40) | (next(_counter) & _MASK_40)
+
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def new_job_id() -> str:
+    """Génère un ID de job unique, ex: job_01JA2ZK8X3M4Q5R6S7T8V9W0XY"""
+    return f"job_{new_ulid()}"
+
+
+def new_batch_id() -> str:
+    """Génère un ID de lot unique, ex: batch_01JA2ZK8X3M4Q5R6S7T8V9W0XY"""
+    return f"batch_{new_ulid()}"
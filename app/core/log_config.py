@@ -0,0 +1,161 @@
+"""
+Logging - Pipeline de logs asynchrone, structuré et borné
+Les handlers coûteux (fichier, console) tournent dans le thread d'un
+QueueListener: la boucle d'événements ne fait qu'empiler l'enregistrement.
+Chaque ligne porte l'ID du job courant (contextvar) et les messages trop
+longs sont tronqués avant d'entrer dans la file.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# ID du job en cours dans la tâche asyncio courante (hérité par les sous-tâches)
+job_id_var: ContextVar[Optional[str]] = ContextVar("job_id", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@contextmanager
+def bind_job(job_id: str):
+    """Associe les logs émis dans ce bloc (et ses sous-tâches) à un job"""
+    token = job_id_var.set(job_id)
+    try:
+        yield
+    finally:
+        job_id_var.reset(token)
+
+
+def truncate(text: str, limit: int) -> str:
+    """Tronque un texte en indiquant le nombre de caractères omis"""
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}… [+{len(text) - limit} caractères]"
+
+
+def describe_sdk_message(message: Any, limit: int = 200) -> str:
+    """
+    Résumé compact d'un message Claude Agent SDK pour les logs
+
+    Les entrées d'outils (contenu complet des fichiers écrits) sont remplacées
+    par le nom de l'outil et sa cible.
+    """
+    content = getattr(message, "content", None)
+    if not isinstance(content, list):
+        return truncate(str(content if content is not None else message), limit)
+
+    parts = []
+    for block in content:
+        name = type(block).__name__
+        if name == "TextBlock":
+            parts.append(truncate(block.text, limit))
+        elif name == "ToolUseBlock":
+            target = block.input.get("file_path") or block.input.get("command") or block.input.get("pattern") or ""
+            parts.append(f"[{block.name} {truncate(str(target), 120)}]")
+        elif name == "ToolResultBlock":
+            parts.append(f"[résultat{' erreur' if block.is_error else ''}]")
+        else:
+            parts.append(f"[{name}]")
+    return f"{type(message).__name__}: {' '.join(parts)}"
+
+
+class JobContextFilter(logging.Filter):
+    """Ajoute record.job_id (lu dans le contexte de l'émetteur, avant la mise en file)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.job_id = job_id_var.get()
+        return True
+
+
+class TruncatingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler qui borne la taille des messages mis en file (la traceback est conservée)"""
+
+    def __init__(self, log_queue: queue.Queue, max_chars: int):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            record.msg, record.args = truncate(message, self.max_chars), None
+        return super().prepare(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        job_id = getattr(record, "job_id", None)
+        if job_id:
+            entry["job_id"] = job_id
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Format texte lisible, avec l'ID du job quand il est connu"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(job_prefix)s%(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        job_id = getattr(record, "job_id", None)
+        record.job_prefix = f"[{job_id}] " if job_id else ""
+        return super().format(record)
+
+
+def setup_logging():
+    """
+    Configure le logging racine: QueueHandler côté application, QueueListener
+    (fichier JSON rotatif + console) dans un thread dédié
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        settings.log_file,
+        maxBytes=settings.log_max_bytes,
+        backupCount=settings.log_backup_count,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter() if settings.log_json else ConsoleFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ConsoleFormatter())
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = TruncatingQueueHandler(log_queue, settings.log_max_message_chars)
+    queue_handler.addFilter(JobContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(settings.log_level.upper())
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Vide la file et arrête le thread d'écriture"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,71 @@
+"""
+Processes - Arrêt d'un process et de tous ses descendants
+Le CLI Claude, npm et npx lancent leurs propres sous-process (node, outils
+Bash, workers de build): tuer le seul parent laisse tourner les enfants
+"""
+import os
+import signal
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def _children_by_parent() -> Dict[int, List[int]]:
+    """Table ppid -> pids lue dans /proc (vide hors Linux)"""
+    children: Dict[int, List[int]] = defaultdict(list)
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Le nom du process (2e champ) peut contenir des espaces: on coupe après ")"
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children[ppid].append(int(entry))
+    return children
+
+
+def process_tree(pid: int) -> List[int]:
+    """pid suivi de tous ses descendants"""
+    children = _children_by_parent()
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, ()))
+    return tree
+
+
+def kill_process_tree(pid: int, sig: int = signal.SIGKILL) -> int:
+    """
+    Envoie un signal à un process et à tous ses descendants
+
+    Les descendants sont relevés avant l'envoi: un enfant orphelin serait
+    sinon rattaché à init et introuvable.
+
+    Args:
+        pid: Process racine
+        sig: Signal envoyé (SIGKILL par défaut)
+
+    Returns:
+        Nombre de process signalés
+    """
+    killed = 0
+    for target in process_tree(pid):
+        try:
+            os.kill(target, sig)
+            killed += 1
+        except ProcessLookupError:
+            continue
+        except PermissionError as e:
+            logger.warning(f"Impossible de tuer le process {target}: {str(e)}")
+    return killed
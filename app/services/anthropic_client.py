@@ -0,0 +1,77 @@
+"""
+Anthropic Client - Client AsyncAnthropic partagé pour les appels directs à l'API
+Un seul client par process (pool de connexions keep-alive), créé dans le lifespan,
+avec timeouts et limite de requêtes simultanées
+"""
+import asyncio
+import logging
+from typing import Any, Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class AnthropicClientPool:
+    """Client AsyncAnthropic unique + sémaphore de concurrence"""
+
+    def __init__(self):
+        self._client: Optional[AsyncAnthropic] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        """Crée le client et son pool de connexions (appelé dans le lifespan)"""
+        if self._client is not None:
+            return
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.anthropic_max_connections,
+                max_keepalive_connections=settings.anthropic_max_connections,
+                keepalive_expiry=settings.anthropic_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(settings.anthropic_timeout, connect=settings.anthropic_connect_timeout)
+        )
+        self._client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=http_client,
+            max_retries=settings.anthropic_max_retries
+        )
+        self._semaphore = asyncio.Semaphore(settings.anthropic_max_concurrent_requests)
+        logger.info(f"Client Anthropic async prêt ({settings.anthropic_max_concurrent_requests} requêtes simultanées max)")
+
+    async def close(self):
+        """Ferme le client et ses connexions"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._semaphore = None
+
+    @property
+    def client(self) -> AsyncAnthropic:
+        """Client partagé (RuntimeError si le lifespan ne l'a pas démarré)"""
+        if self._client is None:
+            raise RuntimeError("Client Anthropic non initialisé (lifespan non démarré)")
+        return self._client
+
+    async def create_message(self, **kwargs: Any):
+        """
+        Appelle messages.create sans bloquer la boucle d'événements
+
+        Args:
+            **kwargs: Arguments de messages.create (model, max_tokens, messages, ...)
+
+        Returns:
+            Le Message retourné par l'API
+        """
+        client = self.client
+        async with self._semaphore:
+            return await client.messages.create(**kwargs)
+
+
+# Singleton instance
+anthropic_client = AnthropicClientPool()
@@ -0,0 +1,174 @@
+"""
+Build Manifest - Empreintes des phases d'un site pour la régénération incrémentale
+Pour chaque phase: empreinte des entrées (champs business lus par le prompt,
+version du prompt, slug) et hash des fichiers produits. Une régénération ne
+relance que les phases dont l'empreinte a changé ou dont une sortie manque
+"""
+import hashlib
+import json
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = ".generation-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def phase_fingerprint(agent_class, business: Dict[str, Any], site_slug: str) -> Dict[str, Any]:
+    """
+    Empreinte d'entrée d'une phase d'agent
+
+    Seuls les champs déclarés dans BUSINESS_FIELDS comptent: changer le
+    téléphone ne touche pas l'empreinte de Components.
+
+    Returns:
+        {"fingerprint", "prompt_version", "fields": {champ: hash de la valeur}}
+    """
+    fields = {
+        name: _digest(json.dumps(business.get(name), default=str, ensure_ascii=False).encode())
+        for name in agent_class.BUSINESS_FIELDS
+    }
+    source = json.dumps(
+        {"prompt_version": agent_class.PROMPT_VERSION, "site_slug": site_slug, "fields": fields},
+        sort_keys=True
+    )
+    return {
+        "fingerprint": _digest(source.encode()),
+        "prompt_version": agent_class.PROMPT_VERSION,
+        "fields": fields
+    }
+
+
+def hash_outputs(site_dir: str, paths: Sequence[str]) -> Dict[str, Optional[str]]:
+    """
+    Hash des fichiers produits (dossiers suffixés par "/" parcourus récursivement)
+
+    Returns:
+        Hash par chemin relatif, None pour un fichier déclaré mais absent
+    """
+    hashes: Dict[str, Optional[str]] = {}
+    for path in paths:
+        full = os.path.join(site_dir, path)
+        if path.endswith("/"):
+            for root, _, names in os.walk(full):
+                for name in names:
+                    file_path = os.path.join(root, name)
+                    hashes[os.path.relpath(file_path, site_dir)] = _hash_file(file_path)
+        else:
+            hashes[path] = _hash_file(full) if os.path.isfile(full) else None
+    return hashes
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return _digest(f.read())
+
+
+class BuildManifest:
+    """
+    Manifeste de génération d'un site ({site_dir}/.generation-manifest.json)
+
+    phases: {clé: {fingerprint, prompt_version, fields, outputs, updated_at}}
+    deployment: URLs du dernier déploiement réussi
+    """
+
+    def __init__(self, site_dir: str, phases: Optional[Dict[str, Dict[str, Any]]] = None,
+                 deployment: Optional[Dict[str, Any]] = None):
+        self.site_dir = site_dir
+        self.phases: Dict[str, Dict[str, Any]] = phases or {}
+        self.deployment: Optional[Dict[str, Any]] = deployment
+
+    @staticmethod
+    def path(site_dir: str) -> str:
+        return os.path.join(site_dir, MANIFEST_FILE)
+
+    @staticmethod
+    def exists(site_dir: str) -> bool:
+        return os.path.isfile(BuildManifest.path(site_dir))
+
+    @classmethod
+    def load(cls, site_dir: str) -> Optional["BuildManifest"]:
+        """Charge le manifeste d'un site (None si absent, illisible ou d'une autre version)"""
+        try:
+            with open(cls.path(site_dir), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Manifeste {site_dir} ignoré (version {data.get('version')})")
+            return None
+        return cls(site_dir, data.get("phases"), data.get("deployment"))
+
+    def save(self):
+        """Écriture atomique du manifeste"""
+        path = self.path(self.site_dir)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "phases": self.phases, "deployment": self.deployment},
+                      f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def record(self, key: str, outputs: Sequence[str], fingerprint: Optional[Dict[str, Any]] = None):
+        """
+        Enregistre l'état courant d'une phase
+
+        Args:
+            key: Clé de phase (boilerplate, setup, ...)
+            outputs: Chemins produits par la phase (hashés sur le disque)
+            fingerprint: Empreinte d'entrée (phase_fingerprint), None pour une phase native
+        """
+        self.phases[key] = {
+            **(fingerprint or {}),
+            "outputs": hash_outputs(self.site_dir, outputs),
+            "updated_at": datetime.now().isoformat()
+        }
+
+    def stale_reason(self, key: str, fingerprint: Dict[str, Any]) -> Optional[str]:
+        """
+        Raison de relancer une phase, None si elle est à jour
+
+        Une phase est à jour si son empreinte est inchangée et que toutes ses
+        sorties existent (le contenu peut avoir été retouché par l'auto-fix).
+        """
+        previous = self.phases.get(key)
+        if previous is None or "fingerprint" not in previous:
+            return "jamais exécutée"
+
+        if previous.get("prompt_version") != fingerprint["prompt_version"]:
+            return f"prompt v{previous.get('prompt_version')} → v{fingerprint['prompt_version']}"
+
+        if previous["fingerprint"] != fingerprint["fingerprint"]:
+            old_fields = previous.get("fields") or {}
+            changed = [name for name, value in fingerprint["fields"].items() if old_fields.get(name) != value]
+            return f"champs modifiés: {', '.join(changed)}" if changed else "empreinte modifiée"
+
+        missing = [path for path in previous.get("outputs") or {}
+                   if not os.path.exists(os.path.join(self.site_dir, path))]
+        if missing:
+            return f"sorties manquantes: {', '.join(missing[:3])}"
+        return None
+
+    def output_hashes(self) -> Dict[str, Optional[str]]:
+        """Hash de tous les fichiers produits, toutes phases confondues"""
+        hashes: Dict[str, Optional[str]] = {}
+        for phase in self.phases.values():
+            hashes.update(phase.get("outputs") or {})
+        return hashes
+
+    def output_changed(self, path: str, content: str) -> bool:
+        """Un contenu rendu en mémoire diffère-t-il de la sortie enregistrée pour ce chemin"""
+        previous = self.output_hashes().get(path)
+        return previous is None or previous != _digest(content.encode("utf-8"))
+
+    def changed_files(self, previous: "BuildManifest") -> List[str]:
+        """Fichiers produits dont le contenu diffère d'un manifeste antérieur (ou nouveaux)"""
+        before = previous.output_hashes()
+        return sorted(path for path, digest in self.output_hashes().items()
+                      if digest is not None and before.get(path) != digest)
@@ -0,0 +1,188 @@
+"""
+Dependency Cache - node_modules partagé entre les sites générés
+Cache adressé par contenu (hash du lockfile / des dépendances): le premier site
+installe, les suivants reçoivent node_modules par clonage (reflinks ou hardlinks,
+voir workspace.py) ou symlink
+"""
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import shutil
+import time
+import uuid
+import logging
+from typing import Dict, Any, Optional
+
+from app.core.config import get_settings
+from app.core.processes import kill_process_tree
+from app.services.workspace import workspace_manager, CloneResult
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+COMPLETE_MARKER = ".complete"
+
+
+class DependencyCache:
+    """
+    Store de node_modules partagé
+
+    Layout: {cache_dir}/{key}/node_modules + package.json + package-lock.json
+    - key = sha256(package-lock.json du site s'il existe, sinon dépendances de
+      package.json, + plateforme et version majeure de node)
+    - Une seule installation par clé, même avec des jobs concurrents
+    - link_mode "hardlink": arbre cloné par workspace_manager, fichiers immuables
+      (reflinks si le volume le permet, sinon hardlinks: isolation des dossiers, zéro copie)
+      link_mode "symlink": node_modules pointe directement vers le store (instantané)
+    - Le marqueur .complete garde la durée de l'installation: chaque hit rapporte le temps économisé
+    """
+
+    def __init__(self, cache_dir: str, link_mode: str = "hardlink", install_timeout: int = 900):
+        if link_mode not in ("hardlink", "symlink"):
+            raise ValueError(f"Mode de lien inconnu: {link_mode}")
+        self.cache_dir = cache_dir
+        self.link_mode = link_mode
+        self.install_timeout = install_timeout
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._node_version: Optional[str] = None
+
+    async def install(self, site_dir: str) -> Dict[str, Any]:
+        """
+        Fournit node_modules à un site depuis le cache (installe en cas de miss)
+
+        Args:
+            site_dir: Répertoire du site (doit contenir package.json)
+
+        Returns:
+            Statistiques: clé, hit/miss, mode de lien, octets partagés, durée et temps économisé en ms
+        """
+        started = time.perf_counter()
+        key = await self.cache_key(site_dir)
+        entry = os.path.join(self.cache_dir, key)
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            hit = os.path.exists(os.path.join(entry, COMPLETE_MARKER))
+            if not hit:
+                await self._populate(site_dir, entry)
+
+        # Un hit évite l'installation entière, mesurée lors du remplissage de l'entrée
+        replaces_ms = self._install_ms(entry) if hit else None
+        clone = await asyncio.to_thread(self._link_into_site, entry, site_dir, replaces_ms)
+
+        stats = {
+            "key": key,
+            "hit": hit,
+            "mode": clone.mode if clone else self.link_mode,
+            "bytes_shared": clone.bytes_shared if clone else 0,
+            "saved_ms": clone.saved_ms if clone else 0,
+            "duration_ms": int((time.perf_counter() - started) * 1000)
+        }
+        logger.info(f"Dépendances {site_dir}: {'cache hit' if hit else 'installées'} ({stats['duration_ms']} ms, {stats['mode']})")
+        return stats
+
+    async def cache_key(self, site_dir: str) -> str:
+        """
+        Clé de cache adressée par contenu pour le site
+
+        Le lockfile produit par l'installation reste dans le cache: un site sans
+        lockfile garde donc la même clé d'une génération à l'autre.
+        """
+        lockfile = os.path.join(site_dir, "package-lock.json")
+        if os.path.exists(lockfile):
+            with open(lockfile, "rb") as f:
+                source = f.read()
+        else:
+            with open(os.path.join(site_dir, "package.json"), encoding="utf-8") as f:
+                package = json.load(f)
+            source = json.dumps({
+                "dependencies": package.get("dependencies", {}),
+                "devDependencies": package.get("devDependencies", {})
+            }, sort_keys=True).encode()
+
+        digest = hashlib.sha256(source)
+        digest.update(f"{platform.system()}-{platform.machine()}-{await self._get_node_version()}".encode())
+        return digest.hexdigest()[:32]
+
+    async def _get_node_version(self) -> str:
+        if self._node_version is None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "node", "--version", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await process.communicate()
+                self._node_version = stdout.decode().strip().split(".")[0] or "unknown"
+            except FileNotFoundError:
+                self._node_version = "unknown"
+        return self._node_version
+
+    async def _populate(self, site_dir: str, entry: str):
+        """Installe les dépendances dans une entrée temporaire puis la publie atomiquement"""
+        started = time.perf_counter()
+        staging = f"{entry}.tmp-{uuid.uuid4().hex[:8]}"
+        os.makedirs(staging)
+        try:
+            for name in ("package.json", "package-lock.json"):
+                source = os.path.join(site_dir, name)
+                if os.path.exists(source):
+                    shutil.copy2(source, os.path.join(staging, name))
+
+            process = await asyncio.create_subprocess_exec(
+                "npm", "install", "--no-audit", "--no-fund",
+                cwd=staging, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+            )
+            try:
+                output, _ = await asyncio.wait_for(process.communicate(), timeout=self.install_timeout)
+            except asyncio.TimeoutError:
+                kill_process_tree(process.pid)
+                await process.wait()
+                raise Exception(f"npm install a dépassé {self.install_timeout}s")
+
+            if process.returncode != 0:
+                raise Exception(f"npm install a échoué (code {process.returncode}): {output.decode()[-2000:]}")
+
+            with open(os.path.join(staging, COMPLETE_MARKER), "w", encoding="utf-8") as f:
+                json.dump({"install_ms": int((time.perf_counter() - started) * 1000)}, f)
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            os.rename(staging, entry)
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def _install_ms(entry: str) -> Optional[int]:
+        """Durée de l'installation qui a rempli l'entrée (None si inconnue: entrée pré-remplie)"""
+        try:
+            with open(os.path.join(entry, COMPLETE_MARKER), encoding="utf-8") as f:
+                return json.load(f).get("install_ms")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _link_into_site(self, entry: str, site_dir: str, replaces_ms: Optional[int]) -> Optional[CloneResult]:
+        """Expose node_modules du cache dans le site (bilan du clonage, None en mode symlink)"""
+        source = os.path.join(entry, "node_modules")
+        target = os.path.join(site_dir, "node_modules")
+
+        if os.path.islink(target):
+            os.unlink(target)
+        elif os.path.isdir(target):
+            shutil.rmtree(target)
+
+        if self.link_mode == "symlink":
+            os.symlink(source, target, target_is_directory=True)
+            return None
+        # node_modules n'est jamais modifié par les phases: hardlinks sûrs si le reflink est impossible
+        return workspace_manager.clone_tree(
+            source, target, immutable=True, kind="dependencies", replaces_ms=replaces_ms
+        )
+
+
+# Singleton instance
+dependency_cache = DependencyCache(
+    settings.dependency_cache_dir,
+    link_mode=settings.dependency_link_mode,
+    install_timeout=settings.npm_install_timeout
+)
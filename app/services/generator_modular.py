@@ -1,23 +1,46 @@
 """
 Generator Service Modular - Orchestre le workflow avec agents modulaires (5 phases)
-Cette version remplace le prompt monolithique par 5 phases séquentielles
+Cette version remplace le prompt monolithique par 5 phases orchestrées en DAG
 """
+import asyncio
 import os
 import re
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
 from datetime import datetime
 
-from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions
+from claude_agent_sdk import ClaudeAgentOptions, ResultMessage
 
 from app.core.config import get_settings
+from app.core.log_config import describe_sdk_message, truncate
 from app.services.job_manager import job_manager
-from app.agents.modular import SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent
+from app.services.scheduler import job_scheduler
+from app.services.phase_graph import PhaseGraph
+from app.services.template_renderer import BoilerplateRenderer
+from app.services.dependency_cache import dependency_cache
+from app.services.golden_skeleton import golden_skeleton, uses_skeleton
+from app.services.session_pool import session_pool
+from app.services.phase_metrics import PhaseRun, phase_metrics
+from app.services.site_validator import site_validator, ValidationReport, ValidationIssue, format_issues
+from app.services.retry_policy import AgentSessionError, PhaseTimeoutError, is_retryable, backoff_delay
+from app.services.build_manifest import BuildManifest, phase_fingerprint, hash_outputs
+from app.agents.modular import SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent, FixAgent
 
 logger = logging.getLogger(__name__)
+# Flux des messages SDK (DEBUG): rien n'est formaté au niveau INFO
+sdk_logger = logging.getLogger(f"{__name__}.sdk")
 settings = get_settings()
 
+# Phases d'agent de la génération, dans l'ordre de déclaration du DAG
+AGENT_PHASES = (
+    ("setup", SetupAgent),
+    ("components", ComponentAgent),
+    ("sections", SectionAgent),
+    ("pages", PageAgent),
+    ("content", ContentAgent),
+)
+
 
 class GeneratorServiceModular:
     """
@@ -25,13 +48,13 @@ class GeneratorServiceModular:
 
     PHASES DE GÉNÉRATION:
     0. Phase 1: Setup (structure + config)
-    1. Phase 2: Components (composants UI de base)
+    1. Phase 2: Components (composants UI de base, clonés du squelette sauf design system personnalisé)
     2. Phase 3: Sections (sections homepage)
     3. Phase 4: Pages (layout + pages complètes)
     4. Phase 5: Content (SEO + métadonnées)
 
     PHASES DE DÉPLOIEMENT:
-    5. Phase Validation & Auto-Fix
+    5. Phase Validation native & Auto-Fix
     6. Phase GitHub Publication
     7. Phase Vercel Deployment
     """
@@ -41,18 +64,22 @@ class GeneratorServiceModular:
         """
         Exécute le workflow complet de génération en 8 phases:
 
-        GÉNÉRATION (40% du workflow):
+        GÉNÉRATION (40% du workflow, exécutée en DAG):
         1. Phase 1: Setup - 0-8%
-        2. Phase 2: Components - 8-16%
-        3. Phase 3: Sections - 16-24%
+        2. Phase 2: Components - 8-16%  } en parallèle
+        3. Phase 3: Sections - 16-24%   }
         4. Phase 4: Pages - 24-32%
         5. Phase 5: Content/SEO - 32-40%
 
         DÉPLOIEMENT (60% du workflow):
-        6. Validation & Auto-Fix - 40-58%
+        6. Validation native & Auto-Fix - 40-58%
         7. GitHub Publication - 58-75%
         8. Vercel Deployment - 75-100%
 
+        Chaque phase terminée est enregistrée comme point de reprise dans le job:
+        relancé après un échec (/api/jobs/{job_id}/resume), le workflow saute les
+        phases déjà terminées dont les sorties sont toujours présentes.
+
         Args:
             job_id: ID du job de génération
             business_data: Données de l'entreprise
@@ -61,32 +88,42 @@ class GeneratorServiceModular:
         site_dir = f"{settings.output_dir}/{site_slug}"
 
         try:
-            # ========== GÉNÉRATION MODULAIRE ==========
-
-            # Phase 1: Setup
-            await GeneratorServiceModular._phase1_setup(job_id, business_data, site_slug, site_dir)
-
-            # Phase 2: Components
-            await GeneratorServiceModular._phase2_components(job_id, business_data, site_dir)
-
-            # Phase 3: Sections
-            await GeneratorServiceModular._phase3_sections(job_id, business_data, site_dir)
-
-            # Phase 4: Pages
-            await GeneratorServiceModular._phase4_pages(job_id, business_data, site_slug, site_dir)
+            os.makedirs(site_dir, exist_ok=True)
+            checkpoints = GeneratorServiceModular._completed_checkpoints(job_id, site_dir)
+            if checkpoints:
+                logger.info(f"Job {job_id}: reprise, phases déjà terminées: {sorted(checkpoints)}")
 
-            # Phase 5: Content/SEO
-            await GeneratorServiceModular._phase5_content(job_id, business_data, site_slug, site_dir)
+            # ========== GÉNÉRATION MODULAIRE ==========
+            # Phases 1-5 en DAG: Components et Sections s'exécutent en parallèle après Setup
+            graph = GeneratorServiceModular._build_generation_graph(
+                job_id, business_data, site_slug, site_dir, skip=set(checkpoints)
+            )
+            if graph.nodes:
+                # Préchauffer les sessions CLI des premières phases pendant le rendu boilerplate / l'installation
+                GeneratorServiceModular._prewarm_agents(graph, site_dir, business_data)
+                checkpoints = GeneratorServiceModular._invalidate_downstream(checkpoints)
+            await graph.run()
 
             # ========== VALIDATION ==========
-            await GeneratorServiceModular._phase6_validation_loop(job_id, site_dir)
+            if "validation" not in checkpoints:
+                await GeneratorServiceModular._phase6_validation_loop(
+                    job_id, site_dir, GeneratorServiceModular._slot_values(business_data, site_slug, site_dir)
+                )
+                job_manager.record_checkpoint(job_id, "validation", {})
+
+            # Empreintes et hash des sorties pour les régénérations incrémentales
+            manifest = await asyncio.to_thread(
+                GeneratorServiceModular._capture_manifest, business_data, site_slug, site_dir
+            )
+            await asyncio.to_thread(manifest.save)
 
             # ========== DÉPLOIEMENT ==========
-            # Phase 7: GitHub
-            github_url = await GeneratorServiceModular._phase7_github_publication(job_id, business_data, site_slug, site_dir)
+            github_url, vercel_url = await GeneratorServiceModular._deploy(
+                job_id, business_data, site_slug, site_dir, checkpoints
+            )
 
-            # Phase 8: Vercel
-            vercel_url = await GeneratorServiceModular._phase8_vercel_deployment(job_id, business_data, site_slug, site_dir, github_url)
+            manifest.deployment = {"github_url": github_url, "site_url": vercel_url}
+            await asyncio.to_thread(manifest.save)
 
             # ========== Final Success ==========
             job_manager.update_job(
@@ -103,13 +140,446 @@ class GeneratorServiceModular:
             )
 
     @staticmethod
-    async def _execute_phase(job_id: str, phase_name: str, agent_class, business_data: Dict[str, Any],
+    async def run_regeneration_workflow(job_id: str, business_data: Dict[str, Any], site_slug: str):
+        """
+        Régénère un site existant en ne relançant que les phases impactées
+
+        1. Compare l'empreinte de chaque phase (champs business lus par son
+           prompt + version du prompt) à celle du manifeste de génération
+        2. Relance le boilerplate (natif) et les seules phases d'agent modifiées
+        3. Valide uniquement les fichiers dont le contenu a changé et leurs importeurs
+        4. Redéploie si des fichiers ont changé
+
+        Args:
+            job_id: ID du job de régénération
+            business_data: Nouvelles données de l'entreprise
+            site_slug: Slug du site existant
+        """
+        site_dir = f"{settings.output_dir}/{site_slug}"
+
+        try:
+            checkpoints = GeneratorServiceModular._completed_checkpoints(job_id, site_dir)
+            previous = BuildManifest.load(site_dir)
+            if previous is None:
+                raise Exception(f"Aucun manifeste de génération pour {site_slug}: une génération complète est nécessaire")
+
+            stale = {}
+            for phase_key, agent_class in AGENT_PHASES:
+                reason = previous.stale_reason(phase_key, phase_fingerprint(agent_class, business_data, site_slug))
+                if reason:
+                    stale[phase_key] = reason
+            for phase_key, reason in stale.items():
+                logger.info(f"Job {job_id}: phase {phase_key} à relancer ({reason})")
+
+            job_manager.update_job(
+                job_id, "processing", 0,
+                f"♻️ Régénération: {len(stale)}/{len(AGENT_PHASES)} phase(s) à relancer",
+                regeneration={"phases": stale}
+            )
+
+            # node_modules n'est relié à nouveau que si package.json change
+            package_json = BoilerplateRenderer.render(business_data, site_slug)["package.json"]
+            install = (previous.output_changed("package.json", package_json)
+                       or not os.path.isdir(os.path.join(site_dir, "node_modules")))
+
+            graph = GeneratorServiceModular._build_generation_graph(
+                job_id, business_data, site_slug, site_dir, only=set(stale), install=install, skip=set(checkpoints)
+            )
+            if set(graph.nodes) & set(stale):
+                GeneratorServiceModular._prewarm_agents(graph, site_dir, business_data)
+            if graph.nodes:
+                checkpoints = GeneratorServiceModular._invalidate_downstream(checkpoints)
+            await graph.run()
+
+            manifest = await asyncio.to_thread(
+                GeneratorServiceModular._capture_manifest, business_data, site_slug, site_dir, previous.deployment
+            )
+            changed = manifest.changed_files(previous)
+
+            if not changed and previous.deployment:
+                await asyncio.to_thread(manifest.save)
+                job_manager.update_job(
+                    job_id, "completed", 100, "Aucun fichier modifié: site déjà à jour",
+                    regeneration={"phases": stale, "changed_files": []},
+                    **previous.deployment
+                )
+                return
+
+            # Fichiers modifiés et leurs importeurs (un export renommé casse l'appelant)
+            affected = changed + await asyncio.to_thread(site_validator.dependents, site_dir, changed)
+            job_manager.update_job(
+                job_id, "processing", 40,
+                f"♻️ {len(changed)} fichier(s) modifié(s), {len(affected)} à valider",
+                regeneration={"phases": stale, "changed_files": changed}
+            )
+            if "validation" not in checkpoints:
+                await GeneratorServiceModular._phase6_validation_loop(
+                    job_id, site_dir, GeneratorServiceModular._slot_values(business_data, site_slug, site_dir),
+                    files=affected
+                )
+                job_manager.record_checkpoint(job_id, "validation", {})
+
+            # L'auto-fix a pu retoucher des sorties: hash à jour avant déploiement
+            manifest = await asyncio.to_thread(
+                GeneratorServiceModular._capture_manifest, business_data, site_slug, site_dir, previous.deployment
+            )
+            await asyncio.to_thread(manifest.save)
+
+            github_url, vercel_url = await GeneratorServiceModular._deploy(
+                job_id, business_data, site_slug, site_dir, checkpoints
+            )
+
+            manifest.deployment = {"github_url": github_url, "site_url": vercel_url}
+            await asyncio.to_thread(manifest.save)
+
+            job_manager.update_job(
+                job_id, "completed", 100, "Régénération terminée avec succès!",
+                github_url=github_url,
+                site_url=vercel_url
+            )
+
+        except Exception as e:
+            logger.error(f"Erreur régénération job {job_id}: {str(e)}", exc_info=True)
+            job_manager.update_job(
+                job_id, "failed", 0, f"Échec: {str(e)}",
+                error=str(e)
+            )
+
+    @staticmethod
+    def _completed_checkpoints(job_id: str, site_dir: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Points de reprise utilisables d'un job relancé
+
+        Une phase terminée n'est sautée que si tous ses fichiers produits
+        existent encore (le contenu a pu être retouché par l'auto-fix).
+        """
+        job = job_manager.get_job(job_id) or {}
+        return {
+            phase: checkpoint
+            for phase, checkpoint in (job.get("checkpoints") or {}).items()
+            if checkpoint.get("status") == "completed"
+            and all(os.path.exists(os.path.join(site_dir, path)) for path in checkpoint.get("outputs") or {})
+        }
+
+    @staticmethod
+    def _invalidate_downstream(checkpoints: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Une phase de génération relancée impose de revalider et republier le site"""
+        return {phase: checkpoint for phase, checkpoint in checkpoints.items()
+                if phase not in ("validation", "github", "vercel")}
+
+    @staticmethod
+    async def _checkpoint(job_id: str, site_dir: str, phase: str, outputs: List[str]):
+        """Point de reprise d'une phase du graphe: hash des fichiers produits (dossiers non parcourus)"""
+        hashes = await asyncio.to_thread(hash_outputs, site_dir, [path for path in outputs if not path.endswith("/")])
+        hashes.update({path: None for path in outputs if path.endswith("/")})
+        job_manager.record_checkpoint(job_id, phase, hashes)
+
+    @staticmethod
+    async def _deploy(job_id: str, business_data: Dict[str, Any], site_slug: str, site_dir: str,
+                      checkpoints: Dict[str, Dict[str, Any]]) -> Tuple[str, str]:
+        """
+        Phases 7-8 avec points de reprise: un dépôt GitHub déjà publié n'est pas recréé
+
+        Returns:
+            (URL GitHub, URL du site)
+        """
+        if "github" in checkpoints:
+            github_url = checkpoints["github"]["github_url"]
+        else:
+            github_url = await GeneratorServiceModular._phase7_github_publication(job_id, business_data, site_slug, site_dir)
+            job_manager.record_checkpoint(job_id, "github", {}, github_url=github_url)
+
+        if "vercel" in checkpoints:
+            vercel_url = checkpoints["vercel"]["site_url"]
+        else:
+            vercel_url = await GeneratorServiceModular._phase8_vercel_deployment(job_id, business_data, site_slug, site_dir, github_url)
+            job_manager.record_checkpoint(job_id, "vercel", {}, site_url=vercel_url)
+
+        return github_url, vercel_url
+
+    @staticmethod
+    def _capture_manifest(business_data: Dict[str, Any], site_slug: str, site_dir: str,
+                          deployment: Optional[Dict[str, Any]] = None) -> BuildManifest:
+        """
+        Empreinte et hash des sorties de chaque phase, d'après l'état du site sur le disque
+
+        N'est enregistré qu'après une validation réussie: les hash reflètent alors
+        l'état final du site, retouches de l'auto-fix comprises.
+        """
+        manifest = BuildManifest(site_dir, deployment=deployment)
+        manifest.record("boilerplate", BoilerplateRenderer.OUTPUTS)
+        for phase_key, agent_class in AGENT_PHASES:
+            manifest.record(phase_key, agent_class.OUTPUTS, phase_fingerprint(agent_class, business_data, site_slug))
+        return manifest
+
+    @staticmethod
+    def _build_generation_graph(job_id: str, business_data: Dict[str, Any], site_slug: str, site_dir: str,
+                                only: Optional[Set[str]] = None, install: bool = True,
+                                skip: Optional[Set[str]] = None) -> PhaseGraph:
+        """
+        Construit le graphe des 5 phases de génération
+
+        Les fichiers boilerplate sont rendus nativement en premier (sans LLM),
+        puis node_modules est fourni par le cache de dépendances en parallèle des agents.
+        Les composants UI sont clonés du squelette (golden_skeleton), sauf design
+        system personnalisé (business_data["custom_design_system"]): agent Component.
+        Les dépendances sont déduites des INPUTS/OUTPUTS déclarés par chaque agent.
+
+        Args:
+            only: Phases d'agent à exécuter (régénération incrémentale); None = toutes
+            install: Fournir node_modules (inutile si package.json est inchangé)
+            skip: Phases déjà terminées (reprise d'un job)
+
+        Chaque phase enregistre un point de reprise dans le job une fois terminée.
+        """
+        graph = PhaseGraph()
+        skip = skip or set()
+
+        def add(key: str, run: Callable[[], Any], inputs: List[str], outputs: List[str]):
+            if key in skip:
+                return
+
+            async def run_and_checkpoint():
+                # Les sessions des phases du niveau suivant démarrent pendant celle-ci
+                GeneratorServiceModular._prewarm_agents(graph, site_dir, business_data, after=key)
+                await run()
+                await GeneratorServiceModular._checkpoint(job_id, site_dir, key, outputs)
+
+            graph.add(key, run_and_checkpoint, inputs=inputs, outputs=outputs)
+
+        async def render_boilerplate():
+            with PhaseRun(job_id, "boilerplate"):
+                BoilerplateRenderer.write(business_data, site_slug, site_dir)
+
+        async def install_dependencies():
+            with PhaseRun(job_id, "dependencies"):
+                stats = await dependency_cache.install(site_dir)
+            source = "cache" if stats["hit"] else "installation"
+            GeneratorServiceModular._report_progress(
+                job_id, 0, f"📦 Dépendances prêtes ({source}, {stats['duration_ms']} ms)"
+            )
+
+        async def clone_skeleton():
+            with PhaseRun(job_id, "components"):
+                stats = await golden_skeleton.clone(site_dir)
+            GeneratorServiceModular._report_progress(
+                job_id, 0, f"🧩 Composants UI: squelette {stats['version']} ({stats['duration_ms']} ms, {stats['mode']})"
+            )
+
+        add("boilerplate", render_boilerplate, [], BoilerplateRenderer.OUTPUTS)
+        if install:
+            add("dependencies", install_dependencies, ["package.json"], ["node_modules/"])
+
+        phases = [
+            ("setup", SetupAgent, lambda: GeneratorServiceModular._phase1_setup(job_id, business_data, site_slug, site_dir)),
+            ("components", ComponentAgent, lambda: GeneratorServiceModular._phase2_components(job_id, business_data, site_dir)),
+            ("sections", SectionAgent, lambda: GeneratorServiceModular._phase3_sections(job_id, business_data, site_dir)),
+            ("pages", PageAgent, lambda: GeneratorServiceModular._phase4_pages(job_id, business_data, site_slug, site_dir)),
+            ("content", ContentAgent, lambda: GeneratorServiceModular._phase5_content(job_id, business_data, site_slug, site_dir)),
+        ]
+        for phase_key, agent_class, run in phases:
+            if only is not None and phase_key not in only:
+                continue
+            if agent_class is ComponentAgent and uses_skeleton(business_data):
+                # Composants identiques pour tous les sites: clonés du squelette, sans agent ni entrée
+                add(phase_key, clone_skeleton, [], agent_class.OUTPUTS)
+            else:
+                add(phase_key, run, agent_class.INPUTS, agent_class.OUTPUTS)
+
+        logger.info(f"Job {job_id}: plan d'exécution {graph.levels()}")
+        return graph
+
+    @staticmethod
+    def _report_progress(job_id: str, progress: int, message: str):
+        """Met à jour le job sans faire reculer la progression (phases parallèles)"""
+        job = job_manager.get_job(job_id)
+        current = (job or {}).get("progress") or 0
+        job_manager.update_job(job_id, "processing", max(current, progress), message)
+
+    @staticmethod
+    def _generation_options(site_dir: str) -> ClaudeAgentOptions:
+        """Options communes des phases de génération et de l'auto-fix (même signature de session)"""
+        return ClaudeAgentOptions(
+            model=settings.agent_model,
+            allowed_tools=["Write", "Read", "Edit", "Bash"],
+            permission_mode="acceptEdits",
+            cwd=site_dir,
+            system_prompt={"type": "preset", "preset": "claude_code"}
+        )
+
+    @staticmethod
+    def _agent_options(site_dir: str, agent_class) -> ClaudeAgentOptions:
+        """
+        Options d'une phase d'agent, disposées pour le cache de prompt
+
+        Les instructions statiques de l'agent sont ajoutées au system prompt;
+        les DONNÉES DU PROJET sont envoyées en message. La session tourne dans
+        site_dir (isolation des jobs: outils d'écriture et Bash sans confirmation),
+        seule la section environnement du system prompt (répertoire de travail)
+        diffère donc d'un job à l'autre. Le taux de cache restant est mesuré par
+        phase (cache_hit_rate de phase_metrics, saas_prompt_tokens).
+
+        En conversation partagée (session_reuse_conversation), le system prompt
+        est celui de la conversation: options communes, prompt complet.
+        """
+        if settings.session_reuse_conversation:
+            return GeneratorServiceModular._generation_options(site_dir)
+
+        return ClaudeAgentOptions(
+            model=settings.agent_model,
+            allowed_tools=["Write", "Read", "Edit", "Bash"],
+            permission_mode="acceptEdits",
+            cwd=site_dir,
+            system_prompt={"type": "preset", "preset": "claude_code", "append": agent_class.PROMPT.instructions}
+        )
+
+    @staticmethod
+    def _agent_prompt(agent_class, business_data: Dict[str, Any], site_slug: str, site_dir: str) -> str:
+        """Message envoyé à l'agent: DONNÉES DU PROJET seules, ou prompt complet en conversation partagée"""
+        if settings.session_reuse_conversation:
+            return agent_class.get_prompt(business_data, site_slug, site_dir)
+        return agent_class.PROMPT.data_block(**agent_class.get_slots(business_data, site_slug, site_dir))
+
+    @staticmethod
+    def _slot_values(business_data: Dict[str, Any], site_slug: str, site_dir: str) -> Dict[str, Any]:
+        """Valeurs des slots de tous les agents pour le job (attendues dans les fichiers générés)"""
+        values: Dict[str, Any] = {}
+        for _, agent_class in AGENT_PHASES:
+            values.update(agent_class.get_slots(business_data, site_slug, site_dir))
+        return values
+
+    @staticmethod
+    def _prewarm_agents(graph: PhaseGraph, site_dir: str, business_data: Dict[str, Any], after: Optional[str] = None):
+        """
+        Préchauffe les sessions des phases d'agent sur le point de démarrer
+
+        Args:
+            graph: Graphe du job
+            site_dir: Répertoire du site
+            business_data: Données de l'entreprise (composants du squelette: pas de session)
+            after: Phase qui démarre (préchauffe ses dépendantes du niveau suivant);
+                   None = phases d'agent sans dépendance d'agent (premières à démarrer)
+
+        Les dépendantes d'une phase sont préchauffées peu avant sa fin attendue
+        (durée médiane récente); sans historique, tout de suite, et leur session
+        reste disponible jusqu'au délai maximal de la phase amont.
+        """
+        delay, ttl = 0.0, None
+        if after is not None:
+            expected = phase_metrics.expected_duration(after)
+            if expected is not None:
+                lead = settings.session_prewarm_lead + session_pool.average_startup_ms() / 1000
+                delay = max(0.0, expected - lead)
+            else:
+                ttl = session_pool.idle_ttl + settings.phase_timeouts.get(after, settings.agent_timeout)
+
+        agents = dict(AGENT_PHASES)
+        if uses_skeleton(business_data):
+            del agents["components"]
+        depth = {key: index for index, level in enumerate(graph.levels()) for key in level}
+        for key, node in graph.nodes.items():
+            if key not in agents:
+                continue
+            agent_deps = [dep for dep in node.depends_on if dep in agents]
+            if after is None:
+                ready = not agent_deps
+            else:
+                ready = after in agent_deps and depth[key] == depth[after] + 1
+            if ready:
+                session_pool.prewarm(GeneratorServiceModular._agent_options(site_dir, agents[key]), delay=delay, ttl=ttl)
+
+    @staticmethod
+    async def _run_agent_session(job_id: str, phase_key: str, log_label: str, prompt: str, options: ClaudeAgentOptions,
+                                 on_content: Optional[Callable[[str], None]] = None,
+                                 reuse_conversation: bool = False):
+        """
+        Exécute une session Claude Agent SDK avec délai maximal et nouvelles tentatives
+
+        Une erreur transitoire (process CLI mort, rate limit, surcharge, délai de
+        phase dépassé) est retentée après un backoff exponentiel avec jitter, hors
+        du slot de concurrence; les autres erreurs remontent immédiatement. Les
+        phases à effets externes (settings.non_idempotent_phases) ne sont retentées
+        que si le CLI n'a pas pu démarrer.
+
+        Args:
+            job_id: ID du job
+            phase_key: Clé de phase pour les limites du scheduler (setup, components, ...)
+            log_label: Libellé utilisé dans les logs
+            prompt: Prompt envoyé à l'agent
+            options: Options Claude Agent SDK
+            on_content: Callback optionnel appelé avec le contenu de chaque message
+            reuse_conversation: Continuer la conversation de la session précédente (même signature)
+        """
+        max_attempts = max(1, settings.agent_max_attempts)
+        idempotent = phase_key not in settings.non_idempotent_phases
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await GeneratorServiceModular._run_agent_attempt(
+                    job_id, phase_key, log_label, prompt, options, on_content, reuse_conversation
+                )
+                return
+            except Exception as e:
+                if attempt == max_attempts or not is_retryable(e, idempotent):
+                    raise
+                delay = backoff_delay(attempt, settings.retry_backoff_base, settings.retry_backoff_max)
+                logger.warning(
+                    f"{log_label}: tentative {attempt}/{max_attempts} échouée ({type(e).__name__}: "
+                    f"{truncate(str(e), 300)}), nouvel essai dans {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _run_agent_attempt(job_id: str, phase_key: str, log_label: str, prompt: str, options: ClaudeAgentOptions,
+                                 on_content: Optional[Callable[[str], None]], reuse_conversation: bool):
+        """
+        Une tentative de session dans le slot de concurrence de la phase
+
+        La session vient du pool (process CLI préchauffé si disponible) et la
+        lecture s'arrête au ResultMessage pour que le process reste réutilisable.
+        Au-delà du délai de la phase, la session est annulée et le process CLI
+        tué avec tous ses descendants. Durée, tours, appels d'outils, tokens et
+        coût sont enregistrés sur le job.
+        """
+        timeout = settings.phase_timeouts.get(phase_key, settings.agent_timeout)
+
+        async with job_scheduler.phase_slot(phase_key):
+            with PhaseRun(job_id, phase_key) as run:
+                error_result = None
+                try:
+                    async with asyncio.timeout(timeout):
+                        async with session_pool.session(options, reuse_conversation=reuse_conversation) as client:
+                            await client.query(prompt)
+
+                            async for message in client.receive_response():
+                                run.observe(message)
+                                if isinstance(message, ResultMessage) and message.is_error:
+                                    error_result = message
+                                if hasattr(message, 'content'):
+                                    if sdk_logger.isEnabledFor(logging.DEBUG):
+                                        sdk_logger.debug(f"{log_label}: {describe_sdk_message(message)}")
+                                    if on_content:
+                                        on_content(str(message.content))
+                except TimeoutError:
+                    raise PhaseTimeoutError(f"{log_label}: délai de {timeout}s dépassé") from None
+
+                if error_result is not None:
+                    raise AgentSessionError.from_result(log_label, error_result)
+
+                metrics = run.metrics
+                logger.info(
+                    f"{log_label}: {metrics['turns']} tours, {metrics['tool_calls']} appels d'outils, "
+                    f"{metrics['input_tokens'] + metrics['output_tokens']} tokens, {metrics['cost_usd']}$"
+                )
+
+    @staticmethod
+    async def _execute_phase(job_id: str, phase_key: str, phase_name: str, agent_class, business_data: Dict[str, Any],
                             site_slug: str, site_dir: str, start_progress: int, end_progress: int):
         """
         Méthode générique pour exécuter une phase
 
         Args:
             job_id: ID du job
+            phase_key: Clé de phase (ex: "setup") pour les limites de concurrence
             phase_name: Nom de la phase (ex: "Phase 1: Setup")
             agent_class: Classe de l'agent (SetupAgent, ComponentAgent, etc.)
             business_data: Données business
@@ -118,45 +588,31 @@ class GeneratorServiceModular:
             start_progress: Progression de départ (%)
             end_progress: Progression de fin (%)
         """
-        job_manager.update_job(
-            job_id, "processing", start_progress,
-            f"🔨 {phase_name} en cours..."
-        )
+        GeneratorServiceModular._report_progress(job_id, start_progress, f"🔨 {phase_name} en cours...")
 
         # Créer le dossier si Phase 1
         if "Setup" in phase_name:
             os.makedirs(site_dir, exist_ok=True)
 
-        # Générer le prompt via l'agent spécialisé
-        prompt = agent_class.get_prompt(business_data, site_slug, site_dir)
+        # Générer le prompt via l'agent spécialisé (instructions statiques dans le system prompt)
+        prompt = GeneratorServiceModular._agent_prompt(agent_class, business_data, site_slug, site_dir)
 
         # Configuration Claude Agent SDK
-        options = ClaudeAgentOptions(
-            model=settings.agent_model,
-            allowed_tools=["Write", "Read", "Edit", "Bash"],
-            permission_mode="acceptEdits",
-            cwd=site_dir,
-            system_prompt={"type": "preset", "preset": "claude_code"}
-        )
+        options = GeneratorServiceModular._agent_options(site_dir, agent_class)
 
         # Exécution
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-
-            async for message in client.receive_messages():
-                if hasattr(message, 'content'):
-                    logger.info(f"{phase_name}: {message}")
-
-        job_manager.update_job(
-            job_id, "processing", end_progress,
-            f"✅ {phase_name} terminée"
+        await GeneratorServiceModular._run_agent_session(
+            job_id, phase_key, phase_name, prompt, options,
+            reuse_conversation=settings.session_reuse_conversation
         )
 
+        GeneratorServiceModular._report_progress(job_id, end_progress, f"✅ {phase_name} terminée")
+
     @staticmethod
     async def _phase1_setup(job_id: str, business_data: Dict[str, Any], site_slug: str, site_dir: str):
         """Phase 1: Setup - Structure + Configuration (0-8%)"""
         await GeneratorServiceModular._execute_phase(
-            job_id, "Phase 1/5: Setup", SetupAgent,
+            job_id, "setup", "Phase 1/5: Setup", SetupAgent,
             business_data, site_slug, site_dir, 0, 8
         )
 
@@ -164,7 +620,7 @@ class GeneratorServiceModular:
     async def _phase2_components(job_id: str, business_data: Dict[str, Any], site_dir: str):
         """Phase 2: Components UI de base (8-16%)"""
         await GeneratorServiceModular._execute_phase(
-            job_id, "Phase 2/5: Components UI", ComponentAgent,
+            job_id, "components", "Phase 2/5: Components UI", ComponentAgent,
             business_data, "", site_dir, 8, 16
         )
 
@@ -172,7 +628,7 @@ class GeneratorServiceModular:
     async def _phase3_sections(job_id: str, business_data: Dict[str, Any], site_dir: str):
         """Phase 3: Sections homepage (16-24%)"""
         await GeneratorServiceModular._execute_phase(
-            job_id, "Phase 3/5: Sections", SectionAgent,
+            job_id, "sections", "Phase 3/5: Sections", SectionAgent,
             business_data, "", site_dir, 16, 24
         )
 
@@ -180,7 +636,7 @@ class GeneratorServiceModular:
     async def _phase4_pages(job_id: str, business_data: Dict[str, Any], site_slug: str, site_dir: str):
         """Phase 4: Pages + Layout (24-32%)"""
         await GeneratorServiceModular._execute_phase(
-            job_id, "Phase 4/5: Pages & Layout", PageAgent,
+            job_id, "pages", "Phase 4/5: Pages & Layout", PageAgent,
             business_data, site_slug, site_dir, 24, 32
         )
 
@@ -188,102 +644,89 @@ class GeneratorServiceModular:
     async def _phase5_content(job_id: str, business_data: Dict[str, Any], site_slug: str, site_dir: str):
         """Phase 5: Content/SEO + Métadonnées (32-40%)"""
         await GeneratorServiceModular._execute_phase(
-            job_id, "Phase 5/5: SEO & Content", ContentAgent,
+            job_id, "content", "Phase 5/5: SEO & Content", ContentAgent,
             business_data, site_slug, site_dir, 32, 40
         )
 
     @staticmethod
-    async def _phase6_validation_loop(job_id: str, site_dir: str):
-        """Phase 6: Boucle de validation et correction automatique (40-58%)"""
+    async def _phase6_validation_loop(job_id: str, site_dir: str, expected: Dict[str, Any],
+                                      files: Optional[List[str]] = None):
+        """
+        Phase 6: Validation statique native et correction automatique (40-58%)
+
+        La validation est locale (quelques secondes, verdict déterministe);
+        l'agent de correction n'est lancé que s'il reste des erreurs.
+
+        Args:
+            expected: Valeurs des slots du job (champs ⟨slot⟩ non remplacés, couleurs du thème)
+            files: Fichiers à valider (régénération incrémentale); None = tout le site
+        """
         max_attempts = settings.max_validation_attempts
-        validation_passed = False
 
         for attempt in range(1, max_attempts + 1):
-            job_manager.update_job(
-                job_id, "processing", 40 + (attempt - 1) * 6,
-                f"🔍 Phase 6: Validation qualité (tentative {attempt}/{max_attempts})..."
+            GeneratorServiceModular._report_progress(
+                job_id, 40 + (attempt - 1) * 6,
+                f"🔍 Phase 6: Validation (tentative {attempt}/{max_attempts})..."
             )
 
-            # Validation
-            validation_report, has_critical_errors = await GeneratorServiceModular._run_validation(
-                job_id, site_dir, attempt, max_attempts
-            )
-
-            if not has_critical_errors:
-                validation_passed = True
-                job_manager.update_job(
-                    job_id, "processing", 56,
-                    f"✅ Validation réussie - Site production-ready"
-                )
-                break
-
-            # Auto-Fix si erreurs critiques et tentatives restantes
-            if has_critical_errors and attempt < max_attempts:
-                await GeneratorServiceModular._run_auto_fix(
-                    job_id, site_dir, validation_report, attempt
-                )
-            elif has_critical_errors and attempt >= max_attempts:
-                raise Exception(f"Validation échouée après {max_attempts} tentatives. Rapport:\n{validation_report}")
+            async with job_scheduler.phase_slot("validation"):
+                with PhaseRun(job_id, "validation"):
+                    report = await site_validator.validate(site_dir, files=files, expected=expected)
 
-        if not validation_passed:
-            job_manager.update_job(job_id, "processing", 58, "⚠️ Validation complétée avec warnings")
+            if report.passed:
+                message = f"✅ Validation réussie ({report.files_checked} fichiers, {report.duration_ms} ms)"
+                if report.warnings:
+                    message = f"⚠️ Validation réussie avec {len(report.warnings)} warning(s)"
+                job_manager.update_job(job_id, "processing", 56, message, validation=report.to_dict())
+                return
 
-    @staticmethod
-    async def _run_validation(job_id: str, site_dir: str, attempt: int, max_attempts: int) -> tuple[str, bool]:
-        """Exécute la validation du site"""
-        prompt = SiteValidatorAgent.get_validation_prompt(site_dir, attempt, max_attempts)
-
-        options = ClaudeAgentOptions(
-            model=settings.agent_model,
-            allowed_tools=["Read", "Grep", "Glob", "Bash"],
-            permission_mode="acceptEdits",
-            cwd=site_dir,
-            system_prompt={"type": "preset", "preset": "claude_code"}
-        )
-
-        validation_report = ""
-        has_critical_errors = False
-
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-
-            async for message in client.receive_messages():
-                if hasattr(message, 'content'):
-                    content_str = str(message.content)
-                    logger.info(f"Validator (Attempt {attempt}): {message}")
-                    validation_report += content_str
+            job_manager.update_job(
+                job_id, "processing", 40 + (attempt - 1) * 6,
+                f"❌ {len(report.errors)} erreur(s) de validation (tentative {attempt}/{max_attempts})",
+                validation=report.to_dict()
+            )
 
-                    if 'SAFE TO DEPLOY' in content_str or 'PASSED' in content_str:
-                        has_critical_errors = False
-                    elif 'CRITICAL' in content_str or 'FAILED' in content_str:
-                        has_critical_errors = True
+            if attempt < max_attempts:
+                await GeneratorServiceModular._run_auto_fix(job_id, site_dir, report, attempt)
 
-        return validation_report, has_critical_errors
+        raise Exception(f"Validation échouée après {max_attempts} tentatives. Rapport:\n{report.format_text()}")
 
     @staticmethod
-    async def _run_auto_fix(job_id: str, site_dir: str, validation_report: str, attempt: int):
-        """Exécute la correction automatique des erreurs"""
+    async def _run_auto_fix(job_id: str, site_dir: str, report: ValidationReport, attempt: int):
+        """
+        Corrige les erreurs du rapport: une session par groupe de fichiers, en parallèle
+
+        Chaque session ne reçoit que les diagnostics de son groupe (groupes disjoints,
+        pool borné par fix_max_parallel_sessions). L'échec d'un groupe n'arrête pas
+        les autres: la validation suivante fera le point.
+        """
+        groups = report.fix_groups(settings.fix_max_groups)
         job_manager.update_job(
             job_id, "processing", 42 + attempt * 6,
-            f"🔧 Auto-correction des erreurs (tentative {attempt})..."
+            f"🔧 Auto-correction de {len(report.errors)} erreur(s) dans {len(groups)} groupe(s) (tentative {attempt})..."
         )
 
-        prompt = SiteValidatorAgent.get_fix_prompt(site_dir, validation_report, attempt)
+        options = GeneratorServiceModular._generation_options(site_dir)
+        semaphore = asyncio.Semaphore(settings.fix_max_parallel_sessions)
+
+        async def fix_group(index: int, issues: List[ValidationIssue]):
+            files = sorted({issue.file for issue in issues} | {
+                issue.related if os.path.splitext(issue.related)[1] else f"{issue.related}.*"
+                for issue in issues if issue.related
+            })
+            prompt = FixAgent.get_prompt(site_dir, format_issues(issues), files, attempt)
+            async with semaphore:
+                await GeneratorServiceModular._run_agent_session(
+                    job_id, "fix", f"Auto-Fix {attempt}.{index} ({', '.join(files[:3])})", prompt, options
+                )
 
-        options = ClaudeAgentOptions(
-            model=settings.agent_model,
-            allowed_tools=["Write", "Read", "Edit", "Bash"],
-            permission_mode="acceptEdits",
-            cwd=site_dir,
-            system_prompt={"type": "preset", "preset": "claude_code"}
+        results = await asyncio.gather(
+            *(fix_group(index, issues) for index, issues in enumerate(groups, start=1)),
+            return_exceptions=True
         )
-
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-
-            async for message in client.receive_messages():
-                if hasattr(message, 'content'):
-                    logger.info(f"Auto-Fix (Attempt {attempt}): {message}")
+        for index, result in enumerate(results, start=1):
+            if isinstance(result, Exception):
+                logger.warning(f"Auto-fix groupe {index} en échec: {str(result)}")
 
     @staticmethod
     async def _phase7_github_publication(job_id: str, business_data: Dict[str, Any], site_slug: str, site_dir: str) -> str:
@@ -317,27 +760,24 @@ class GeneratorServiceModular:
         )
 
         github_url = None
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-
-            async for message in client.receive_messages():
-                if hasattr(message, 'content'):
-                    content_str = str(message.content)
-                    logger.info(f"GitHub Publisher: {message}")
-
-                    if 'github.com' in content_str and not github_url:
-                        match = re.search(r'https://github\.com/[\w-]+/[\w-]+', content_str)
-                        if match:
-                            github_url = match.group(0)
-                            job_manager.update_job(job_id, "processing", 75, "✅ Repository GitHub créé", github_url=github_url)
-
-                    try:
-                        response_json = json.loads(content_str)
-                        if response_json.get("success") and response_json.get("github_url"):
-                            github_url = response_json["github_url"]
-                            job_manager.update_job(job_id, "processing", 75, "✅ Repository GitHub créé", github_url=github_url)
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+
+        def on_content(content_str: str):
+            nonlocal github_url
+            if 'github.com' in content_str and not github_url:
+                match = re.search(r'https://github\.com/[\w-]+/[\w-]+', content_str)
+                if match:
+                    github_url = match.group(0)
+                    job_manager.update_job(job_id, "processing", 75, "✅ Repository GitHub créé", github_url=github_url)
+
+            try:
+                response_json = json.loads(content_str)
+                if response_json.get("success") and response_json.get("github_url"):
+                    github_url = response_json["github_url"]
+                    job_manager.update_job(job_id, "processing", 75, "✅ Repository GitHub créé", github_url=github_url)
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        await GeneratorServiceModular._run_agent_session(job_id, "github", "GitHub Publisher", prompt, options, on_content)
 
         if not github_url:
             raise Exception("GitHub repository creation failed - no URL returned")
@@ -380,27 +820,24 @@ class GeneratorServiceModular:
         )
 
         vercel_url = None
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-
-            async for message in client.receive_messages():
-                if hasattr(message, 'content'):
-                    content_str = str(message.content)
-                    logger.info(f"Vercel Deployer: {message}")
-
-                    if 'vercel.app' in content_str and not vercel_url:
-                        match = re.search(r'https://[\w-]+\.vercel\.app', content_str)
-                        if match:
-                            vercel_url = match.group(0)
-                            job_manager.update_job(job_id, "processing", 95, "✅ Site déployé sur Vercel", site_url=vercel_url)
-
-                    try:
-                        response_json = json.loads(content_str)
-                        if response_json.get("success") and response_json.get("vercel_url"):
-                            vercel_url = response_json["vercel_url"]
-                            job_manager.update_job(job_id, "processing", 95, "✅ Site déployé sur Vercel", site_url=vercel_url)
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+
+        def on_content(content_str: str):
+            nonlocal vercel_url
+            if 'vercel.app' in content_str and not vercel_url:
+                match = re.search(r'https://[\w-]+\.vercel\.app', content_str)
+                if match:
+                    vercel_url = match.group(0)
+                    job_manager.update_job(job_id, "processing", 95, "✅ Site déployé sur Vercel", site_url=vercel_url)
+
+            try:
+                response_json = json.loads(content_str)
+                if response_json.get("success") and response_json.get("vercel_url"):
+                    vercel_url = response_json["vercel_url"]
+                    job_manager.update_job(job_id, "processing", 95, "✅ Site déployé sur Vercel", site_url=vercel_url)
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        await GeneratorServiceModular._run_agent_session(job_id, "vercel", "Vercel Deployer", prompt, options, on_content)
 
         if not vercel_url:
             logger.warning("Vercel deployment may have failed - no URL found")
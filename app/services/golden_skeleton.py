@@ -0,0 +1,181 @@
+"""
+Golden Skeleton - Composants UI de base pré-construits, clonés dans chaque site
+Le prompt de ComponentAgent contient déjà le source complet des composants UI
+(Button, Input, Card, Accordion, Tabs, index, lib/utils), identique pour toutes
+les entreprises: il est extrait une fois, validé, versionné dans un store puis
+cloné (copy-on-write si le système de fichiers le permet) dans chaque site.
+L'agent ne tourne plus que pour un design system personnalisé
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+from app.services.template_renderer import BoilerplateRenderer
+from app.services.site_validator import site_validator, format_issues
+from app.services.workspace import workspace_manager
+from app.agents.modular import ComponentAgent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+COMPLETE_MARKER = ".complete"
+SKELETON_MANIFEST = "skeleton.json"
+
+# Bloc de fichier du prompt: "Crée {site_dir}/chemin:" suivi du source complet
+_FILE_BLOCK_RE = re.compile(r"^Crée (?P<root>\S+?)/(?P<path>\S+?):\n\n```\w*\n(?P<source>.*?)\n```$", re.S | re.M)
+_SITE_DIR_MARKER = "@SITE_DIR@"
+
+# Contexte de validation (résolution de '@/...' et packages déclarés), non cloné dans les sites
+_VALIDATION_CONTEXT = ("package.json", "tsconfig.json")
+
+
+def uses_skeleton(business: Dict[str, Any]) -> bool:
+    """Les composants UI du site viennent-ils du squelette (sinon: phase d'agent)"""
+    return settings.golden_skeleton_enabled and not business.get("custom_design_system")
+
+
+def extract_files() -> Dict[str, str]:
+    """
+    Source de chaque composant UI, tel que le prompt de ComponentAgent le décrit
+
+    Returns:
+        Contenu par chemin relatif à site_dir (exactement ComponentAgent.OUTPUTS)
+
+    Raises:
+        Exception: Un fichier déclaré dans OUTPUTS n'a pas de bloc source dans le prompt
+    """
+    prompt = ComponentAgent.PROMPT.render(site_dir=_SITE_DIR_MARKER)
+    files = {
+        match.group("path"): match.group("source") + "\n"
+        for match in _FILE_BLOCK_RE.finditer(prompt)
+        if match.group("root") == _SITE_DIR_MARKER
+    }
+    missing = [path for path in ComponentAgent.OUTPUTS if path not in files]
+    if missing:
+        raise Exception(f"Squelette: source absent du prompt ComponentAgent pour {', '.join(missing)}")
+    return {path: files[path] for path in ComponentAgent.OUTPUTS}
+
+
+def skeleton_version(files: Dict[str, str]) -> str:
+    """Version du squelette: version du prompt + hash du contenu des fichiers"""
+    digest = hashlib.sha256()
+    for path, content in sorted(files.items()):
+        digest.update(path.encode())
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+    return f"v{ComponentAgent.PROMPT_VERSION}-{digest.hexdigest()[:12]}"
+
+
+class GoldenSkeleton:
+    """
+    Store versionné des composants UI de base
+
+    Layout: {store_dir}/{version}/ (fichiers du squelette + contexte de validation)
+    - version = v{PROMPT_VERSION}-{hash du contenu}: modifier les composants du
+      prompt crée une nouvelle entrée, les anciennes restent intactes
+    - Entrée construite et validée une seule fois (publication atomique, marqueur .complete)
+    - clone(): workspace_manager, fichiers modifiables par les phases suivantes et
+      l'auto-fix: reflink (copy-on-write) quand le volume le permet, sinon copie, jamais hardlink
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self._lock = asyncio.Lock()
+        self._entry: Optional[str] = None
+        self._manifest: Dict[str, Any] = {}
+
+    async def clone(self, site_dir: str) -> Dict[str, Any]:
+        """
+        Copie les composants UI du squelette dans un site
+
+        Args:
+            site_dir: Répertoire du site
+
+        Returns:
+            Statistiques: version, fichiers, mode (reflink/copy), octets partagés, durée en ms
+        """
+        started = time.perf_counter()
+        entry = await self.ensure()
+        clone = await asyncio.to_thread(
+            workspace_manager.clone_files, entry, site_dir, self._manifest["files"], kind="skeleton"
+        )
+
+        stats = {
+            "version": self._manifest["version"],
+            "files": clone.files,
+            "mode": clone.mode,
+            "bytes_shared": clone.bytes_shared,
+            "duration_ms": int((time.perf_counter() - started) * 1000)
+        }
+        logger.info(f"Squelette {stats['version']} cloné dans {site_dir} ({stats['duration_ms']} ms, {stats['mode']})")
+        return stats
+
+    async def ensure(self) -> str:
+        """
+        Entrée du store de la version courante (construite et validée si absente)
+
+        Raises:
+            Exception: Le squelette extrait du prompt ne passe pas la validation
+        """
+        if self._entry is not None:
+            return self._entry
+
+        async with self._lock:
+            if self._entry is None:
+                files = extract_files()
+                entry = os.path.join(self.store_dir, skeleton_version(files))
+                if not os.path.exists(os.path.join(entry, COMPLETE_MARKER)):
+                    await self._build(entry, files)
+                with open(os.path.join(entry, SKELETON_MANIFEST), encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+                self._entry = entry
+        return self._entry
+
+    async def _build(self, entry: str, files: Dict[str, str]):
+        """Écrit le squelette dans une entrée temporaire, le valide puis le publie atomiquement"""
+        staging = f"{entry}.tmp-{uuid.uuid4().hex[:8]}"
+        try:
+            context = BoilerplateRenderer.render({}, "golden-skeleton")
+            for relative_path, content in {**files, **{name: context[name] for name in _VALIDATION_CONTEXT}}.items():
+                path = os.path.join(staging, relative_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            # Seuls imports, exports et packages comptent: le reste du site n'existe pas ici
+            report = await site_validator.validate(staging)
+            errors = [issue for issue in report.errors if issue.check != "files"]
+            if errors:
+                raise Exception(f"Squelette invalide:\n{format_issues(errors)}")
+
+            version = os.path.basename(entry)
+            with open(os.path.join(staging, SKELETON_MANIFEST), "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": version,
+                    "prompt_version": ComponentAgent.PROMPT_VERSION,
+                    "files": list(files),
+                    "built_at": datetime.now().isoformat(),
+                    "validation": {"files_checked": report.files_checked, "duration_ms": report.duration_ms}
+                }, f, indent=2)
+
+            open(os.path.join(staging, COMPLETE_MARKER), "w").close()
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            os.rename(staging, entry)
+            logger.info(f"Squelette {version}: {len(files)} fichiers construits et validés dans {entry}")
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+
+
+# Singleton instance
+golden_skeleton = GoldenSkeleton(settings.golden_skeleton_dir)
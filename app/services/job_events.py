@@ -0,0 +1,123 @@
+"""
+Job Events - Diffusion en temps réel des mises à jour de jobs (Server-Sent Events)
+Alimenté directement par JobManager.update_job, avec fan-out vers N abonnés
+et historique court pour la reprise via Last-Event-ID
+"""
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[int, Dict[str, Any]]
+
+
+class JobEventBus:
+    """
+    Bus d'événements par job
+
+    - Chaque événement reçoit un ID globalement croissant, y compris entre
+      deux redémarrages (utilisé comme SSE id)
+    - Les N derniers événements sont gardés pour rejouer après une reconnexion
+    - Un abonné lent ne bloque jamais update_job: ses événements les plus
+      anciens sont écartés (chaque événement est un snapshot complet du job)
+    """
+
+    def __init__(self, history_size: int = 50, subscriber_queue_size: int = 100):
+        self.history_size = history_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self._history: Dict[str, Deque[Event]] = {}
+        self._last_id: Dict[str, int] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._closed: Set[str] = set()
+        # Base en microsecondes: les IDs restent croissants après un redémarrage
+        self._sequence = itertools.count(time.time_ns() // 1000)
+
+    def publish(self, job_id: str, payload: Dict[str, Any], final: bool = False):
+        """
+        Publie un snapshot de job vers tous ses abonnés
+
+        Args:
+            job_id: ID du job
+            payload: Snapshot du job (copié par l'appelant)
+            final: True si le job a atteint un statut terminal
+        """
+        event_id = next(self._sequence)
+        self._last_id[job_id] = event_id
+
+        history = self._history.get(job_id)
+        if history is None:
+            history = self._history[job_id] = deque(maxlen=self.history_size)
+        history.append((event_id, payload))
+
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((event_id, payload))
+
+        if final:
+            self._closed.add(job_id)
+            if not self._subscribers.get(job_id):
+                self._discard(job_id)
+        else:
+            self._closed.discard(job_id)
+
+    def subscribe(self, job_id: str, last_event_id: Optional[int] = None) -> Tuple[asyncio.Queue, List[Event], bool]:
+        """
+        Abonne un client aux événements d'un job
+
+        Args:
+            job_id: ID du job
+            last_event_id: Dernier ID reçu par le client (header Last-Event-ID)
+
+        Returns:
+            (file d'événements, événements à rejouer, True si la reprise est complète)
+            Si la reprise est incomplète (historique dépassé), l'appelant doit
+            envoyer un snapshot de l'état courant.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+
+        if last_event_id is None:
+            return queue, [], False
+
+        history = self._history.get(job_id)
+        if not history:
+            return queue, [], False
+
+        replay = [event for event in history if event[0] > last_event_id]
+        return queue, replay, last_event_id >= history[0][0] - 1
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        """Désabonne un client et libère l'historique des jobs terminés"""
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+                if job_id in self._closed:
+                    self._discard(job_id)
+
+    def last_event_id(self, job_id: str) -> int:
+        """Dernier ID d'événement émis pour un job (0 si aucun)"""
+        return self._last_id.get(job_id, 0)
+
+    def subscribed_jobs(self) -> List[str]:
+        """IDs des jobs ayant au moins un abonné"""
+        return list(self._subscribers)
+
+    def subscriber_count(self) -> int:
+        """Nombre total d'abonnés connectés"""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _discard(self, job_id: str):
+        self._history.pop(job_id, None)
+        self._last_id.pop(job_id, None)
+        self._closed.discard(job_id)
+
+
+# Singleton instance
+job_events = JobEventBus()
@@ -1,48 +1,151 @@
 """
 Job Manager - Gestion centralisée des jobs de génération
 """
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from collections import Counter
 from datetime import datetime
+import asyncio
 import logging
 
+from app.core.config import get_settings
+from app.core.ids import new_job_id
+from app.services.job_events import job_events
+from app.services.job_store import JobStore, create_job_store
+from app.services.prometheus import JOBS_FINISHED
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Statuts pour lesquels le job n'évoluera plus
+TERMINAL_STATUSES = ("completed", "failed")
 
 
 class JobManager:
-    """Gestionnaire de jobs avec stockage en mémoire"""
+    """
+    Gestionnaire de jobs adossé à un JobStore
 
-    def __init__(self):
-        self.jobs: Dict[str, Dict[str, Any]] = {}
+    Seuls les jobs actifs (pending/processing) sont gardés en mémoire;
+    les jobs terminés vivent uniquement dans le store. La position d'un job en
+    attente est demandée au scheduler à la lecture (queue_positions).
+    """
 
-    def create_job(self, site_slug: str) -> str:
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._active: Dict[str, Dict[str, Any]] = {}
+        # Position 1-indexée d'un job dans la file (branché par le scheduler)
+        self.queue_positions: Callable[[str], Optional[int]] = lambda job_id: None
+
+    def create_job(self, site_slug: str, business_data: Optional[Dict[str, Any]] = None,
+                   workflow: str = "generation", batch_id: Optional[str] = None) -> str:
         """
         Crée un nouveau job de génération
 
         Args:
             site_slug: Slug du site (ex: "plomberie-luxembourg")
+            business_data: Données de l'entreprise (conservées pour une reprise)
+            workflow: Workflow exécuté (generation, regeneration)
+            batch_id: Lot auquel appartient le job (/generate/batch)
 
         Returns:
             L'ID du job créé
         """
-        job_id = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        job_id = new_job_id()
 
-        self.jobs[job_id] = {
+        job = {
             "id": job_id,
             "status": "pending",
             "progress": 0,
             "message": "Initialisation...",
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
-            "site_slug": site_slug
+            "site_slug": site_slug,
+            "workflow": workflow,
+            "batch_id": batch_id,
+            "business_data": business_data,
+            "queue_position": None,
+            "phases": {},
+            "checkpoints": {}
         }
+        self._active[job_id] = job
+        self.store.put(job, durable=True)
 
         logger.info(f"Job créé: {job_id} pour {site_slug}")
         return job_id
 
+    def create_batch(self, batch_id: str, job_ids: List[str], duplicates: List[Dict[str, Any]]):
+        """
+        Enregistre un lot de jobs soumis ensemble
+
+        Args:
+            batch_id: ID du lot (new_batch_id)
+            job_ids: Jobs créés pour le lot, dans l'ordre de la requête
+            duplicates: Entrées ignorées (slug en double ou déjà en cours)
+        """
+        self.store.put_batch({
+            "id": batch_id,
+            "created_at": datetime.now().isoformat(),
+            "job_ids": job_ids,
+            "duplicates": duplicates
+        })
+        logger.info(f"Lot créé: {batch_id} ({len(job_ids)} jobs, {len(duplicates)} doublon(s))")
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Progression agrégée d'un lot
+
+        Returns:
+            Le lot avec le nombre de jobs par statut, la progression moyenne et
+            le résumé de chaque job, ou None si introuvable
+        """
+        batch = self.store.get_batch(batch_id)
+        if batch is None:
+            return None
+
+        jobs = [job for job in map(self.get_job, batch["job_ids"]) if job is not None]
+        counts = Counter(job["status"] for job in jobs)
+        done = sum(counts[status] for status in TERMINAL_STATUSES)
+
+        if done == len(jobs):
+            status = "completed"
+        elif counts["pending"] == len(jobs):
+            status = "pending"
+        else:
+            status = "processing"
+
+        return {
+            **batch,
+            "status": status,
+            "total": len(jobs),
+            "counts": dict(counts),
+            "progress": round(sum(job["progress"] for job in jobs) / len(jobs)) if jobs else 100,
+            "jobs": [
+                {
+                    "job_id": job["id"],
+                    "site_slug": job["site_slug"],
+                    "status": job["status"],
+                    "progress": job["progress"],
+                    "queue_position": job.get("queue_position"),
+                    "site_url": job.get("site_url"),
+                    "error": job.get("error")
+                }
+                for job in jobs
+            ]
+        }
+
+    def find_active(self, site_slug: str) -> Optional[str]:
+        """ID du job actif (pending/processing) pour un slug, None s'il n'y en a pas"""
+        for job_id, job in self._active.items():
+            if job["site_slug"] == site_slug:
+                return job_id
+        return None
+
     def update_job(self, job_id: str, status: str, progress: int, message: str, **kwargs):
         """
         Met à jour un job existant
 
+        Les écritures intermédiaires sont regroupées par le store; le passage
+        à un statut terminal est écrit immédiatement.
+
         Args:
             job_id: ID du job
             status: Nouveau statut (pending, processing, completed, failed)
@@ -50,11 +153,16 @@ class JobManager:
             message: Message de statut
             **kwargs: Champs additionnels (github_url, site_url, error, etc.)
         """
-        if job_id not in self.jobs:
+        job = self.get_job(job_id)
+        if job is None:
             logger.warning(f"Tentative de mise à jour d'un job inexistant: {job_id}")
             return
 
-        self.jobs[job_id].update({
+        terminal = status in TERMINAL_STATUSES
+        if terminal and job["status"] not in TERMINAL_STATUSES:
+            JOBS_FINISHED.inc(status)
+
+        job.update({
             "status": status,
             "progress": progress,
             "message": message,
@@ -62,8 +170,71 @@ class JobManager:
             **kwargs
         })
 
+        if terminal:
+            self._active.pop(job_id, None)
+        else:
+            self._active[job_id] = job
+        self.store.put(job, durable=terminal)
+        job_events.publish(job_id, dict(job), final=terminal)
+
         logger.info(f"Job {job_id} mis à jour: {status} ({progress}%) - {message}")
 
+    def set_queue_position(self, job_id: str, position: Optional[int]):
+        """
+        Met à jour la position d'un job dans la file d'attente du scheduler
+
+        Args:
+            job_id: ID du job
+            position: Position 1-indexée, None si le job n'est plus en attente
+        """
+        job = self._active.get(job_id)
+        if job is not None and job.get("queue_position") != position:
+            job["queue_position"] = position
+            job_events.publish(job_id, dict(job))
+
+    def record_phase(self, job_id: str, phase: str, metrics: Dict[str, Any]):
+        """
+        Enregistre les mesures d'une phase dans le job (champ "phases")
+
+        Publiées avec la prochaine mise à jour de progression du job.
+
+        Args:
+            job_id: ID du job
+            phase: Clé de phase (setup, components, ...)
+            metrics: Durées, tours, appels d'outils, tokens et coût
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return
+
+        job.setdefault("phases", {})[phase] = metrics
+        self.store.put(job)
+
+    def record_checkpoint(self, job_id: str, phase: str, outputs: Dict[str, Optional[str]], **data: Any):
+        """
+        Enregistre durablement la fin d'une phase (point de reprise)
+
+        Écrit immédiatement, comme un statut terminal: un redémarrage ou un
+        échec ultérieur ne doit pas perdre une phase terminée.
+
+        Args:
+            job_id: ID du job
+            phase: Clé de phase (setup, validation, github, ...)
+            outputs: Hash des fichiers produits par chemin relatif (None pour un dossier)
+            **data: Résultats à réutiliser lors d'une reprise (github_url, ...)
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return
+
+        job.setdefault("checkpoints", {})[phase] = {
+            "status": "completed",
+            "completed_at": datetime.now().isoformat(),
+            "outputs": outputs,
+            **data
+        }
+        self.store.put(job, durable=True)
+
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Récupère les informations d'un job
@@ -74,20 +245,33 @@ class JobManager:
         Returns:
             Dictionnaire avec les infos du job ou None si introuvable
         """
-        return self.jobs.get(job_id)
+        job = self._active.get(job_id)
+        if job is not None:
+            return self._with_position(job)
+        return self.store.get(job_id)
 
-    def get_all_jobs(self) -> list:
+    def list_jobs(self, limit: int = 50, cursor: Optional[str] = None,
+                  status: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Récupère tous les jobs
+        Liste les jobs page par page (plus récents en premier)
+
+        Args:
+            limit: Nombre de jobs par page
+            cursor: Curseur retourné par la page précédente
+            status: Filtre optionnel sur le statut
 
         Returns:
-            Liste de tous les jobs triés par date de création (plus récents en premier)
+            (jobs de la page, curseur de la page suivante ou None)
         """
-        return sorted(
-            self.jobs.values(),
-            key=lambda x: x["created_at"],
-            reverse=True
-        )
+        jobs, next_cursor = self.store.list(limit, cursor=cursor, status=status)
+        # Les jobs actifs en mémoire sont plus à jour que leur dernière écriture
+        return [self.get_job(job["id"]) if job["id"] in self._active else job for job in jobs], next_cursor
+
+    def _with_position(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Actualise la position d'un job en attente dans la file"""
+        if job["status"] == "pending":
+            job["queue_position"] = self.queue_positions(job["id"])
+        return job
 
     def delete_job(self, job_id: str) -> bool:
         """
@@ -99,12 +283,59 @@ class JobManager:
         Returns:
             True si supprimé, False si inexistant
         """
-        if job_id in self.jobs:
-            del self.jobs[job_id]
+        self._active.pop(job_id, None)
+        if self.store.delete(job_id):
             logger.info(f"Job supprimé: {job_id}")
             return True
         return False
 
+    def mark_interrupted_jobs(self) -> int:
+        """
+        Marque comme échoués les jobs restés actifs lors d'un arrêt précédent
+
+        Returns:
+            Nombre de jobs marqués
+        """
+        interrupted = [job for job in self.store.find_by_status(["pending", "processing"])
+                       if job["id"] not in self._active]
+        for job in interrupted:
+            job.update({
+                "status": "failed",
+                "message": "Interrompu par un redémarrage du serveur",
+                "error": "server restart",
+                "queue_position": None,
+                "updated_at": datetime.now().isoformat()
+            })
+            self.store.put(job)
+        self.store.flush()
+
+        if interrupted:
+            logger.warning(f"{len(interrupted)} job(s) interrompu(s) marqué(s) comme échoué(s)")
+        return len(interrupted)
+
+    async def flush_periodically(self, interval: float):
+        """
+        Écrit régulièrement les mises à jour regroupées (tâche de fond du lifespan)
+
+        Args:
+            interval: Délai entre deux écritures (secondes)
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.store.flush)
+            except Exception as e:
+                logger.error(f"Erreur flush du job store: {str(e)}", exc_info=True)
+
+    def close(self):
+        """Écrit les modifications en attente et ferme le store"""
+        self.store.close()
+
 
 # Singleton instance
-job_manager = JobManager()
+job_manager = JobManager(create_job_store(
+    settings.job_store_backend,
+    settings.job_store_path,
+    flush_interval=settings.job_store_flush_interval,
+    batch_size=settings.job_store_batch_size
+))
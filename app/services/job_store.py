@@ -0,0 +1,357 @@
+"""
+Job Store - Stockage persistant des jobs de génération
+Backends: mémoire (dev) et SQLite en mode WAL (production)
+"""
+import bisect
+import json
+import sqlite3
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore(ABC):
+    """Interface commune des backends de stockage de jobs"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne le job ou None s'il est introuvable"""
+
+    @abstractmethod
+    def put(self, job: Dict[str, Any], durable: bool = False):
+        """
+        Insère ou remplace un job
+
+        Args:
+            job: Enregistrement complet du job (doit contenir "id")
+            durable: Écriture lancée immédiatement (sinon elle peut être regroupée avec les suivantes)
+        """
+
+    @abstractmethod
+    def delete(self, job_id: str) -> bool:
+        """Supprime un job, retourne False s'il n'existait pas"""
+
+    @abstractmethod
+    def list(self, limit: int, cursor: Optional[str] = None,
+             status: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Liste les jobs du plus récent au plus ancien, page par page
+
+        Args:
+            limit: Taille de la page
+            cursor: Curseur opaque retourné par l'appel précédent
+            status: Filtre optionnel sur le statut
+
+        Returns:
+            (jobs de la page, curseur de la page suivante ou None)
+        """
+
+    @abstractmethod
+    def find_by_status(self, statuses: List[str]) -> List[Dict[str, Any]]:
+        """Retourne tous les jobs ayant l'un des statuts donnés"""
+
+    @abstractmethod
+    def put_batch(self, batch: Dict[str, Any]):
+        """Insère ou remplace un lot de jobs (écriture immédiate)"""
+
+    @abstractmethod
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne le lot ou None s'il est introuvable"""
+
+    def flush(self):
+        """Écrit les modifications en attente (no-op par défaut)"""
+
+    def close(self):
+        """Libère les ressources du backend"""
+        self.flush()
+
+
+class MemoryJobStore(JobStore):
+    """Backend en mémoire, non persistant (dev / tests)"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # IDs triés (ordre de création, les IDs étant triables par date)
+        self._ids: List[str] = []
+        self._batches: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def put(self, job: Dict[str, Any], durable: bool = False):
+        job_id = job["id"]
+        if job_id not in self._jobs:
+            if not self._ids or job_id > self._ids[-1]:
+                self._ids.append(job_id)
+            else:
+                bisect.insort(self._ids, job_id)
+        self._jobs[job_id] = job
+
+    def delete(self, job_id: str) -> bool:
+        if self._jobs.pop(job_id, None) is None:
+            return False
+        self._ids.pop(bisect.bisect_left(self._ids, job_id))
+        return True
+
+    def list(self, limit: int, cursor: Optional[str] = None,
+             status: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        page: List[Dict[str, Any]] = []
+        end = bisect.bisect_left(self._ids, cursor) if cursor else len(self._ids)
+
+        for index in range(end - 1, -1, -1):
+            job = self._jobs[self._ids[index]]
+            if status and job["status"] != status:
+                continue
+            if len(page) == limit:
+                return page, page[-1]["id"]
+            page.append(job)
+
+        return page, None
+
+    def find_by_status(self, statuses: List[str]) -> List[Dict[str, Any]]:
+        return [job for job in self._jobs.values() if job["status"] in statuses]
+
+    def put_batch(self, batch: Dict[str, Any]):
+        self._batches[batch["id"]] = batch
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        return self._batches.get(batch_id)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Backend SQLite en mode WAL
+
+    - IDs triables par date: listing sur la clé primaire, index (status, id)
+    - Écritures hors de la boucle asyncio: put() et put_batch() ne font que
+      déposer l'enregistrement en attente; un thread écrivain unique (sa propre
+      connexion) fusionne les mises à jour d'un même job et les écrit par lots,
+      immédiatement pour une écriture durable, sinon au plus tard après
+      flush_interval ou batch_size jobs. Les jobs créés ensemble (/generate/batch)
+      partent ainsi dans une seule transaction. Les suppressions passent aussi
+      par le thread écrivain
+    - Lectures sans écriture: les enregistrements pas encore écrits recouvrent
+      les lignes lues (get, list, find_by_status)
+    - Pagination par curseur (dernier id de la page) sans OFFSET
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, batch_size: int = 50):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        # _lock: enregistrements en attente (tenu brièvement, jamais pendant une écriture)
+        # _write_lock: transactions de la connexion d'écriture (thread écrivain, flush)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_batches: Dict[str, Dict[str, Any]] = {}
+        self._pending_deletes: Set[str] = set()
+        # Enregistrements en cours d'écriture, encore lisibles
+        self._writing: Dict[str, Dict[str, Any]] = {}
+        self._writing_batches: Dict[str, Dict[str, Any]] = {}
+        self._deleting: Set[str] = set()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_id ON jobs (status, id);
+            CREATE TABLE IF NOT EXISTS batches (
+                id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+        """)
+        self._write_conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._write_conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._wake = threading.Event()
+        self._closing = False
+        self._writer = threading.Thread(target=self._write_loop, name="job-store-writer", daemon=True)
+        self._writer.start()
+        logger.info(f"Job store SQLite ouvert: {path}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if job_id in self._pending_deletes:
+                return None
+            job = self._pending.get(job_id) or self._writing.get(job_id)
+            if job is not None:
+                return job
+            if job_id in self._deleting:
+                return None
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, job: Dict[str, Any], durable: bool = False):
+        with self._lock:
+            self._pending_deletes.discard(job["id"])
+            self._pending[job["id"]] = job
+            if durable or len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            existed = self.get(job_id) is not None
+            self._pending.pop(job_id, None)
+            if existed:
+                # Écrite après les insertions de la même transaction: un job en cours d'écriture ne réapparaît pas
+                self._pending_deletes.add(job_id)
+                self._wake.set()
+        return existed
+
+    def list(self, limit: int, cursor: Optional[str] = None,
+             status: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if cursor:
+            clauses.append("id < ?")
+            params.append(cursor)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT data FROM jobs {where} ORDER BY id DESC LIMIT ?"
+
+        with self._lock:
+            overlay, deleted = self._unwritten()
+            # Chaque enregistrement non écrit peut invalider une ligne lue: autant de lignes en plus
+            params.append(limit + 1 + len(overlay) + len(deleted))
+            rows = self._conn.execute(query, params).fetchall()
+
+        jobs = {job["id"]: job for job in (json.loads(row[0]) for row in rows)}
+        jobs.update(overlay)
+        matching = sorted(
+            (job for job_id, job in jobs.items()
+             if job_id not in deleted
+             and (not status or job["status"] == status)
+             and (not cursor or job_id < cursor)),
+            key=lambda job: job["id"], reverse=True
+        )
+
+        page = matching[:limit]
+        next_cursor = page[-1]["id"] if len(matching) > limit else None
+        return page, next_cursor
+
+    def find_by_status(self, statuses: List[str]) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            overlay, deleted = self._unwritten()
+            rows = self._conn.execute(
+                f"SELECT data FROM jobs WHERE status IN ({placeholders})", statuses
+            ).fetchall()
+        jobs = {job["id"]: job for job in (json.loads(row[0]) for row in rows)}
+        jobs.update(overlay)
+        return [job for job_id, job in jobs.items() if job_id not in deleted and job["status"] in statuses]
+
+    def put_batch(self, batch: Dict[str, Any]):
+        with self._lock:
+            self._pending_batches[batch["id"]] = batch
+            self._wake.set()
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            batch = self._pending_batches.get(batch_id) or self._writing_batches.get(batch_id)
+            if batch is not None:
+                return batch
+            row = self._conn.execute("SELECT data FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def flush(self):
+        """Écrit les enregistrements en attente depuis le thread appelant (attend l'écriture en cours)"""
+        with self._write_lock:
+            with self._lock:
+                self._writing, self._pending = self._pending, {}
+                self._writing_batches, self._pending_batches = self._pending_batches, {}
+                self._deleting, self._pending_deletes = self._pending_deletes, set()
+            if not self._writing and not self._writing_batches and not self._deleting:
+                return
+
+            jobs = [
+                (job["id"], job["status"], job["created_at"], job["updated_at"], json.dumps(job, default=str))
+                for job in self._writing.values()
+            ]
+            batches = [
+                (batch["id"], batch["created_at"], json.dumps(batch, default=str))
+                for batch in self._writing_batches.values()
+            ]
+            try:
+                self._write_conn.execute("BEGIN")
+                try:
+                    self._write_conn.executemany(
+                        "INSERT OR REPLACE INTO jobs (id, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+                        jobs
+                    )
+                    self._write_conn.executemany(
+                        "INSERT OR REPLACE INTO batches (id, created_at, data) VALUES (?, ?, ?)", batches
+                    )
+                    self._write_conn.executemany(
+                        "DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in self._deleting]
+                    )
+                    self._write_conn.execute("COMMIT")
+                except Exception:
+                    self._write_conn.execute("ROLLBACK")
+                    raise
+            except Exception:
+                # Remis en attente (sans écraser une version plus récente) pour la prochaine écriture
+                with self._lock:
+                    self._pending = {**self._writing, **self._pending}
+                    self._pending_batches = {**self._writing_batches, **self._pending_batches}
+                    self._pending_deletes |= self._deleting - set(self._pending)
+                raise
+            finally:
+                with self._lock:
+                    self._writing, self._writing_batches, self._deleting = {}, {}, set()
+
+    def _unwritten(self) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+        """Jobs pas encore écrits (en attente l'emporte sur en cours) et IDs à supprimer (appelant: _lock tenu)"""
+        overlay = {job_id: job for job_id, job in self._writing.items() if job_id not in self._pending_deletes}
+        overlay.update(self._pending)
+        deleted = (self._deleting - set(self._pending)) | self._pending_deletes
+        return overlay, deleted
+
+    def _write_loop(self):
+        """Thread écrivain: écrit dès qu'une écriture durable ou un lot plein le réveille, sinon périodiquement"""
+        while not self._closing:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Erreur d'écriture du job store: {str(e)}", exc_info=True)
+
+    def close(self):
+        self._closing = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        self._write_conn.close()
+        self._conn.close()
+
+
+def create_job_store(backend: str, path: str, flush_interval: float, batch_size: int) -> JobStore:
+    """
+    Instancie le backend de stockage configuré
+
+    Args:
+        backend: "sqlite" ou "memory"
+        path: Chemin du fichier SQLite
+        flush_interval: Délai max (s) avant écriture des mises à jour regroupées
+        batch_size: Nombre de jobs modifiés déclenchant une écriture
+    """
+    if backend == "memory":
+        return MemoryJobStore()
+    if backend == "sqlite":
+        return SQLiteJobStore(path, flush_interval=flush_interval, batch_size=batch_size)
+    raise ValueError(f"Backend de job store inconnu: {backend}")
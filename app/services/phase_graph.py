@@ -0,0 +1,137 @@
+"""
+Phase Graph - Exécution DAG des phases de génération
+Chaque phase déclare les fichiers qu'elle lit et écrit; les dépendances en sont
+déduites et les phases indépendantes s'exécutent en parallèle
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+
+def _paths_overlap(a: str, b: str) -> bool:
+    """
+    Deux chemins relatifs se recouvrent s'ils sont égaux ou si l'un est un
+    dossier (suffixe "/") contenant l'autre
+    """
+    if a == b:
+        return True
+    if a.endswith("/") and b.startswith(a):
+        return True
+    if b.endswith("/") and a.startswith(b):
+        return True
+    return False
+
+
+def _any_overlap(left: Sequence[str], right: Sequence[str]) -> bool:
+    return any(_paths_overlap(a, b) for a in left for b in right)
+
+
+@dataclass
+class PhaseNode:
+    """Une phase du graphe"""
+    key: str
+    run: Callable[[], Awaitable[Any]]
+    inputs: Sequence[str] = ()
+    outputs: Sequence[str] = ()
+    depends_on: Set[str] = field(default_factory=set)
+
+
+class PhaseGraph:
+    """
+    Graphe de phases ordonné par déclaration
+
+    Une phase dépend d'une phase déclarée avant elle si:
+    - elle lit ce que l'autre écrit (read-after-write)
+    - elle écrit ce que l'autre écrit (write-after-write)
+    - elle écrit ce que l'autre lit (write-after-read)
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, PhaseNode] = {}
+
+    def add(self, key: str, run: Callable[[], Awaitable[Any]],
+            inputs: Sequence[str] = (), outputs: Sequence[str] = (),
+            after: Sequence[str] = ()) -> PhaseNode:
+        """
+        Ajoute une phase au graphe
+
+        Args:
+            key: Identifiant unique de la phase
+            run: Coroutine function sans argument exécutant la phase
+            inputs: Chemins lus (relatifs à site_dir, dossiers suffixés par "/")
+            outputs: Chemins écrits
+            after: Dépendances explicites supplémentaires
+
+        Returns:
+            Le noeud créé
+        """
+        if key in self.nodes:
+            raise ValueError(f"Phase déjà déclarée: {key}")
+
+        depends_on = set(after)
+        for other in self.nodes.values():
+            if (_any_overlap(inputs, other.outputs)
+                    or _any_overlap(outputs, other.outputs)
+                    or _any_overlap(outputs, other.inputs)):
+                depends_on.add(other.key)
+
+        unknown = depends_on - set(self.nodes)
+        if unknown:
+            raise ValueError(f"Dépendances inconnues pour {key}: {sorted(unknown)}")
+
+        node = PhaseNode(key, run, list(inputs), list(outputs), depends_on)
+        self.nodes[key] = node
+        return node
+
+    def levels(self) -> List[List[str]]:
+        """Regroupe les phases par niveau (phases d'un même niveau parallélisables)"""
+        depth: Dict[str, int] = {}
+        for key, node in self.nodes.items():
+            depth[key] = max((depth[dep] + 1 for dep in node.depends_on), default=0)
+
+        levels: List[List[str]] = []
+        for key, level in depth.items():
+            while len(levels) <= level:
+                levels.append([])
+            levels[level].append(key)
+        return levels
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Exécute le graphe: chaque phase démarre dès que ses dépendances sont terminées
+
+        Returns:
+            Résultat de chaque phase, par clé
+
+        Raises:
+            La première exception levée par une phase (les phases en cours sont annulées)
+        """
+        results: Dict[str, Any] = {}
+        remaining = dict(self.nodes)
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while remaining or running:
+                for key, node in list(remaining.items()):
+                    if node.depends_on <= results.keys():
+                        del remaining[key]
+                        running[asyncio.create_task(node.run(), name=f"phase-{key}")] = key
+
+                if not running:
+                    raise RuntimeError(f"Cycle de dépendances entre phases: {sorted(remaining)}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = running.pop(task)
+                    results[key] = task.result()
+                    logger.debug(f"Phase {key} terminée")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
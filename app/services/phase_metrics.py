@@ -0,0 +1,183 @@
+"""
+Phase Metrics - Durée, tours, appels d'outils, tokens et coût par phase
+Chaque phase d'un job est mesurée (PhaseRun) et enregistrée dans le job ainsi
+que dans un agrégat glissant exposé par /api/metrics (percentiles par phase)
+"""
+import time
+import logging
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from claude_agent_sdk import ResultMessage, ToolUseBlock
+
+from app.services.job_manager import job_manager
+from app.services.prometheus import PHASE_DURATION, PHASE_FAILURES, PROMPT_TOKENS
+
+logger = logging.getLogger(__name__)
+
+TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+# Champs cumulés quand une phase s'exécute plusieurs fois dans un job (validation, auto-fix)
+SUMMED_FIELDS = ("duration_ms", "api_duration_ms", "sessions", "turns", "tool_calls", "cost_usd") + TOKEN_FIELDS
+
+
+def cache_hit_rate(metrics: Dict[str, Any]) -> float:
+    """Part des tokens d'entrée servis par le cache de prompt (lus / lus + écrits + non cachés)"""
+    read = metrics.get("cache_read_input_tokens") or 0
+    total = read + (metrics.get("cache_creation_input_tokens") or 0) + (metrics.get("input_tokens") or 0)
+    return round(read / total, 4) if total else 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile par rang le plus proche"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class PhaseRun:
+    """
+    Mesure d'une exécution de phase (context manager)
+
+    Usage:
+        with PhaseRun(job_id, "setup") as run:
+            async for message in client.receive_response():
+                run.observe(message)
+    """
+
+    def __init__(self, job_id: str, phase: str):
+        self.job_id = job_id
+        self.phase = phase
+        self.metrics: Dict[str, Any] = {
+            "status": "running",
+            "started_at": None,
+            "ended_at": None,
+            "duration_ms": 0,
+            "api_duration_ms": 0,
+            "sessions": 0,
+            "turns": 0,
+            "tool_calls": 0,
+            "cost_usd": 0.0,
+            **{field: 0 for field in TOKEN_FIELDS},
+            "cache_hit_rate": 0.0
+        }
+        self._started = 0.0
+
+    def __enter__(self) -> "PhaseRun":
+        self.metrics["started_at"] = datetime.now().isoformat()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics["ended_at"] = datetime.now().isoformat()
+        self.metrics["duration_ms"] = int((time.perf_counter() - self._started) * 1000)
+        self.metrics["status"] = "failed" if exc_type is not None else "completed"
+        self.metrics["cache_hit_rate"] = cache_hit_rate(self.metrics)
+        PHASE_DURATION.observe(self.metrics["duration_ms"] / 1000, self.phase)
+        for kind, field in (("uncached", "input_tokens"), ("cache_read", "cache_read_input_tokens"),
+                            ("cache_write", "cache_creation_input_tokens")):
+            if self.metrics[field]:
+                PROMPT_TOKENS.inc(self.phase, kind, amount=self.metrics[field])
+        if exc_type is not None:
+            PHASE_FAILURES.inc(self.phase)
+        phase_metrics.record(self.job_id, self.phase, self.metrics)
+        return False
+
+    def observe(self, message: Any):
+        """Comptabilise un message de session Claude (tool_use, ResultMessage)"""
+        for block in getattr(message, "content", None) or []:
+            if isinstance(block, ToolUseBlock):
+                self.metrics["tool_calls"] += 1
+
+        if isinstance(message, ResultMessage):
+            self.metrics["sessions"] += 1
+            self.metrics["turns"] += message.num_turns
+            self.metrics["api_duration_ms"] += message.duration_api_ms
+            self.metrics["cost_usd"] = round(self.metrics["cost_usd"] + (message.total_cost_usd or 0.0), 6)
+            for field in TOKEN_FIELDS:
+                self.metrics[field] += (message.usage or {}).get(field) or 0
+
+
+class PhaseMetrics:
+    """Agrégat glissant des exécutions de phase (derniers `window` passages par phase)"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._runs: Dict[str, Deque[Dict[str, Any]]] = defaultdict(lambda: deque(maxlen=self.window))
+
+    def record(self, job_id: str, phase: str, metrics: Dict[str, Any]):
+        """
+        Enregistre une exécution de phase dans l'agrégat et dans le job
+
+        Args:
+            job_id: ID du job
+            phase: Clé de phase (setup, components, validation, ...)
+            metrics: Mesures de l'exécution
+        """
+        self._runs[phase].append(dict(metrics))
+
+        job = job_manager.get_job(job_id)
+        previous = ((job or {}).get("phases") or {}).get(phase)
+        job_manager.record_phase(job_id, phase, self.merge(previous, metrics) if previous else dict(metrics))
+
+    @staticmethod
+    def merge(previous: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Cumule une nouvelle exécution d'une phase déjà mesurée pour le même job"""
+        merged = dict(metrics)
+        merged["started_at"] = previous.get("started_at") or metrics["started_at"]
+        for field in SUMMED_FIELDS:
+            merged[field] = (previous.get(field) or 0) + (metrics.get(field) or 0)
+        merged["cost_usd"] = round(merged["cost_usd"], 6)
+        merged["cache_hit_rate"] = cache_hit_rate(merged)
+        return merged
+
+    def expected_duration(self, phase: str, min_runs: int = 5) -> Optional[float]:
+        """Durée médiane (secondes) des exécutions réussies d'une phase, None sans historique suffisant"""
+        durations = [run["duration_ms"] for run in self._runs.get(phase, ()) if run["status"] == "completed"]
+        if len(durations) < min_runs:
+            return None
+        return percentile(durations, 50) / 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles par phase et part de chaque phase dans la latence et le coût totaux"""
+        phases = {}
+        for phase, runs in self._runs.items():
+            durations = [run["duration_ms"] for run in runs]
+            costs = [run["cost_usd"] for run in runs]
+            tokens = [run["input_tokens"] + run["output_tokens"] for run in runs]
+            phases[phase] = {
+                "runs": len(runs),
+                "failures": sum(1 for run in runs if run["status"] == "failed"),
+                "duration_ms": self._distribution(durations),
+                "cost_usd": {**self._distribution(costs, digits=4), "total": round(sum(costs), 4)},
+                "tokens": self._distribution(tokens),
+                "turns_p50": percentile([run["turns"] for run in runs], 50),
+                "tool_calls_p50": percentile([run["tool_calls"] for run in runs], 50),
+                # Sur l'ensemble des tokens d'entrée de la fenêtre (pas une moyenne de ratios)
+                "cache_hit_rate": cache_hit_rate({field: sum(run[field] for run in runs) for field in TOKEN_FIELDS}),
+            }
+
+        total_duration = sum(p["duration_ms"]["mean"] for p in phases.values())
+        total_cost = sum(p["cost_usd"]["mean"] for p in phases.values())
+        for summary in phases.values():
+            summary["share"] = {
+                "duration": round(summary["duration_ms"]["mean"] / total_duration, 4) if total_duration else 0.0,
+                "cost": round(summary["cost_usd"]["mean"] / total_cost, 4) if total_cost else 0.0,
+            }
+
+        return {"window": self.window, "phases": phases}
+
+    @staticmethod
+    def _distribution(values: List[float], digits: int = 1) -> Dict[str, float]:
+        return {
+            "mean": round(sum(values) / len(values), digits),
+            "p50": round(percentile(values, 50), digits),
+            "p90": round(percentile(values, 90), digits),
+            "p99": round(percentile(values, 99), digits),
+            "max": round(max(values), digits),
+        }
+
+
+# Singleton instance
+phase_metrics = PhaseMetrics()
@@ -0,0 +1,136 @@
+"""
+Prefill Cache - Cache des résultats de /api/prefill
+Clé = description normalisée (espaces, casse, unicode), TTL + éviction LRU,
+persistance optionnelle sur disque entre deux redémarrages
+"""
+import hashlib
+import json
+import os
+import time
+import unicodedata
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class PrefillCache:
+    """Cache LRU avec expiration pour les extractions de prefill"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, persist_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+
+        # clé -> (expiration epoch, données)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(description: str) -> str:
+        """Normalise une description: unicode NFKC, espaces compactés, casse ignorée"""
+        return " ".join(unicodedata.normalize("NFKC", description).split()).casefold()
+
+    @staticmethod
+    def make_key(description: str, model: str) -> str:
+        """Clé de cache (le modèle en fait partie: changer de modèle invalide le cache)"""
+        return hashlib.sha256(f"{model}\n{PrefillCache.normalize(description)}".encode()).hexdigest()
+
+    def get(self, description: str, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne les données en cache pour une description
+
+        Args:
+            description: Description brute envoyée par le client
+            model: Modèle utilisé pour l'extraction
+
+        Returns:
+            Copie des données extraites ou None (miss ou entrée expirée)
+        """
+        key = self.make_key(description, model)
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] < time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def set(self, description: str, model: str, data: Dict[str, Any]):
+        """Enregistre le résultat d'une extraction"""
+        key = self.make_key(description, model)
+        self._entries[key] = (time.time() + self.ttl_seconds, dict(data))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs de hit/miss et occupation"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "persistent": bool(self.persist_path)
+        }
+
+    def load(self):
+        """Recharge les entrées non expirées depuis le disque (si la persistance est activée)"""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Cache prefill illisible ({self.persist_path}): {str(e)}")
+            return
+
+        now = time.time()
+        for key, (expires_at, data) in stored.items():
+            if expires_at > now:
+                self._entries[key] = (expires_at, data)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        logger.info(f"Cache prefill: {len(self._entries)} entrées rechargées")
+
+    def save(self):
+        """Écrit les entrées non expirées sur disque (écriture atomique)"""
+        if not self.persist_path:
+            return
+
+        now = time.time()
+        stored = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False)
+        os.replace(tmp_path, self.persist_path)
+
+
+# Singleton instance
+prefill_cache = PrefillCache(
+    max_entries=settings.prefill_cache_max_entries,
+    ttl_seconds=settings.prefill_cache_ttl,
+    persist_path=settings.prefill_cache_path
+)
@@ -0,0 +1,166 @@
+"""
+Prometheus - Métriques au format d'exposition texte Prometheus/OpenMetrics
+Implémentation minimale sans dépendance: compteurs et histogrammes mis à jour
+en O(1) sur le chemin critique, jauges lues à la demande au moment du scrape
+"""
+import bisect
+from typing import Callable, Dict, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets (secondes) couvrant les étapes natives (ms) comme les sessions d'agent (minutes)
+PHASE_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base commune: nom, aide, type et noms de labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Compteur monotone par combinaison de labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def header(self) -> List[str]:
+        # Format texte 0.0.4: les lignes HELP/TYPE portent le nom exposé (suffixe _total)
+        return [f"# HELP {self.name}_total {self.documentation}", f"# TYPE {self.name}_total {self.kind}"]
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}_total{_labels(self.labelnames, key)} {_format(value)}"
+                for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Histogramme à buckets cumulés par combinaison de labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = PHASE_DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [compteurs par bucket (non cumulés, +Inf en dernier), somme]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                bucket_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, bucket_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class CallbackGauge(Metric):
+    """Jauge dont la valeur est lue au moment du scrape (aucun coût hors scrape)"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format(self.callback())}"]
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exposées par /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = PHASE_DURATION_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> CallbackGauge:
+        return self.register(CallbackGauge(name, documentation, callback))
+
+    def render(self) -> str:
+        """Exposition texte de toutes les métriques"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton instance
+metrics_registry = MetricsRegistry()
+
+PHASE_DURATION = metrics_registry.histogram(
+    "saas_phase_duration_seconds", "Durée d'exécution des phases de génération", ["phase"]
+)
+PHASE_FAILURES = metrics_registry.counter(
+    "saas_phase_failures", "Phases terminées en erreur", ["phase"]
+)
+PROMPT_TOKENS = metrics_registry.counter(
+    "saas_prompt_tokens", "Tokens d'entrée des sessions par phase (kind: uncached, cache_read, cache_write)",
+    ["phase", "kind"]
+)
+JOBS_FINISHED = metrics_registry.counter(
+    "saas_jobs_finished", "Jobs arrivés à un statut terminal", ["status"]
+)
+WORKSPACE_BYTES = metrics_registry.counter(
+    "saas_workspace_bytes", "Octets clonés dans les sites (kind: dependencies, skeleton; sharing: shared, copied)",
+    ["kind", "sharing"]
+)
+WORKSPACE_TIME_SAVED = metrics_registry.counter(
+    "saas_workspace_time_saved_seconds", "Temps économisé par les clonages (opération remplacée moins clonage)",
+    ["kind"]
+)
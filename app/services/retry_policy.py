@@ -0,0 +1,129 @@
+"""
+Retry Policy - Classification des erreurs transitoires et backoff exponentiel
+Seules les erreurs susceptibles de disparaître d'elles-mêmes (process CLI mort,
+rate limit / surcharge de l'API, phase bloquée) justifient une nouvelle tentative,
+et seulement si la phase peut être rejouée sans effet de bord (pas après un
+dépôt GitHub créé ou un déploiement lancé)
+"""
+import json
+import random
+import re
+from typing import Optional, Tuple
+
+from claude_agent_sdk import CLIConnectionError, CLIJSONDecodeError, CLINotFoundError, ProcessError, ResultMessage
+
+from app.core.log_config import truncate
+
+# Erreur d'API rapportée par le CLI en tête du résultat: "API Error: 529 {json}" / "API Error: Request timed out."
+API_ERROR_RE = re.compile(r"^API Error: (?:(?P<status>\d{3})\b\s*(?P<body>.*)|(?P<reason>[^\n]*))", re.S)
+
+# Codes HTTP et types d'erreur de l'API qui justifient une nouvelle tentative
+TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504, 529}
+TRANSIENT_ERROR_TYPES = {"rate_limit_error", "overloaded_error", "api_error", "timeout_error"}
+TRANSIENT_REASONS = ("request timed out", "connection error")
+
+
+class PhaseTimeoutError(Exception):
+    """Phase interrompue par son délai maximal (process CLI tué)"""
+
+
+class AgentSessionError(Exception):
+    """
+    Session Claude terminée en erreur (ResultMessage is_error)
+
+    Attributes:
+        subtype: Sous-type du ResultMessage (success, error_max_turns, error_during_execution)
+        status: Code HTTP de l'erreur d'API rapportée par le CLI (None si aucune)
+        error_type: Type de l'erreur d'API (rate_limit_error, overloaded_error, ...)
+        transient: L'erreur d'API est transitoire (rate limit, surcharge, erreur serveur)
+    """
+
+    def __init__(self, message: str, subtype: Optional[str] = None, status: Optional[int] = None,
+                 error_type: Optional[str] = None, transient: bool = False):
+        super().__init__(message)
+        self.subtype = subtype
+        self.status = status
+        self.error_type = error_type
+        self.transient = transient
+
+    @classmethod
+    def from_result(cls, log_label: str, result: ResultMessage) -> "AgentSessionError":
+        """Erreur classée d'après le sous-type et l'erreur d'API en tête du résultat"""
+        status, error_type, transient = classify_result(result.subtype, result.result or "")
+        details = truncate(f"{result.subtype}: {result.result or ''}", 500)
+        return cls(f"{log_label}: session en erreur ({details})", result.subtype, status, error_type, transient)
+
+
+def classify_result(subtype: str, result: str) -> Tuple[Optional[int], Optional[str], bool]:
+    """
+    Classe le résultat d'une session en erreur
+
+    Seule une erreur d'API rapportée par le CLI (préfixe "API Error:") peut être
+    transitoire; le reste du texte est la réponse libre de l'agent et n'est pas
+    analysé (un "ligne 500" ou "timed out" cité par l'agent n'est pas une erreur d'API).
+
+    Returns:
+        (code HTTP, type d'erreur d'API, transitoire)
+    """
+    if subtype == "error_max_turns":
+        return None, None, False
+
+    match = API_ERROR_RE.match(result.strip())
+    if not match:
+        return None, None, False
+
+    if match.group("status") is None:
+        reason = match.group("reason").strip().lower()
+        return None, None, reason.startswith(TRANSIENT_REASONS)
+
+    status = int(match.group("status"))
+    error_type = None
+    try:
+        body = json.loads(match.group("body"))
+        error_type = body.get("error", {}).get("type") if isinstance(body, dict) else None
+    except ValueError:
+        pass
+    return status, error_type, status in TRANSIENT_STATUSES or error_type in TRANSIENT_ERROR_TYPES
+
+
+def is_retryable(error: BaseException, idempotent: bool = True) -> bool:
+    """
+    Une nouvelle tentative a-t-elle une chance de réussir, sans risque de doublon
+
+    - Retentées: process CLI mort ou injoignable, JSON tronqué, phase bloquée,
+      rate limit / surcharge / erreur serveur de l'API (AgentSessionError.transient)
+    - Définitives: CLI absent, erreurs applicatives (prompt, validation, ...)
+    - Phase non idempotente (dépôt GitHub, déploiement Vercel): seul l'échec de
+      connexion au CLI est retenté; après un délai dépassé ou une session
+      interrompue, le dépôt ou le push a pu avoir lieu
+
+    Args:
+        error: Erreur de la tentative
+        idempotent: La phase peut être rejouée sans effet de bord
+    """
+    if isinstance(error, CLINotFoundError):
+        return False
+    if isinstance(error, CLIConnectionError):
+        return True
+    if not idempotent:
+        return False
+    if isinstance(error, (PhaseTimeoutError, ProcessError, CLIJSONDecodeError)):
+        return True
+    if isinstance(error, AgentSessionError):
+        return error.transient
+    return False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Délai avant la tentative suivante: backoff exponentiel avec jitter complet
+
+    Args:
+        attempt: Numéro de la tentative qui vient d'échouer (1 = première)
+        base: Délai de référence (secondes)
+        cap: Délai maximal (secondes)
+
+    Returns:
+        Délai aléatoire dans [0, min(cap, base * 2^(attempt-1))]
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
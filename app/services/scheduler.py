@@ -0,0 +1,251 @@
+"""
+Job Scheduler - File d'attente bornée pour les jobs de génération
+Remplace BackgroundTasks: limite globale de jobs simultanés, limites par phase,
+file prioritaire FIFO et suivi de la position de chaque job dans la file
+"""
+import asyncio
+import bisect
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.log_config import bind_job
+from app.services.job_events import job_events
+from app.services.job_manager import job_manager, TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class QueueFullError(Exception):
+    """Levée quand la file d'attente a atteint sa capacité maximale"""
+
+
+class JobScheduler:
+    """
+    Ordonnanceur de jobs avec contrôle d'admission
+
+    - N workers consomment une file prioritaire (priorité haute d'abord, puis FIFO)
+    - Chaque phase (setup, components, ..., vercel) a son propre sémaphore
+    - Les positions dans la file sont calculées à la lecture (JobManager.get_job)
+      et publiées en direct aux seuls jobs suivis en SSE
+    """
+
+    def __init__(self, max_concurrent_jobs: int, max_queued_jobs: int, phase_limits: Dict[str, int]):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_queued_jobs = max_queued_jobs
+        self.phase_limits = dict(phase_limits)
+
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._waiting: List[Tuple[int, int, str]] = []
+        # Entrée de chaque job en attente: position par recherche dichotomique dans _waiting
+        self._entries: Dict[str, Tuple[int, int, str]] = {}
+        self._sequence = itertools.count()
+        self._phase_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+
+    async def start(self):
+        """Démarre les workers (appelé dans le lifespan de l'application)"""
+        if self._workers:
+            return
+        for index in range(self.max_concurrent_jobs):
+            self._workers.append(asyncio.create_task(self._worker(index), name=f"job-worker-{index}"))
+        logger.info(f"Scheduler démarré: {self.max_concurrent_jobs} workers, file max {self.max_queued_jobs}")
+
+    async def stop(self):
+        """Arrête les workers et marque les jobs encore en file comme échoués"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        for _, _, job_id in self._waiting:
+            job_manager.update_job(job_id, "failed", 0, "Arrêt du serveur avant démarrage du job",
+                                   error="scheduler stopped", queue_position=None)
+        self._waiting.clear()
+        self._entries.clear()
+        self._queue = asyncio.PriorityQueue()
+        logger.info("Scheduler arrêté")
+
+    def submit(self, job_id: str, func: Callable[..., Any], *args: Any, priority: int = 0) -> int:
+        """
+        Place un job dans la file d'attente
+
+        Args:
+            job_id: ID du job (déjà créé dans le JobManager)
+            func: Coroutine function à exécuter (ex: run_generation_workflow)
+            *args: Arguments de func
+            priority: Priorité du job (plus élevé = traité en premier)
+
+        Returns:
+            Position du job dans la file (1 = prochain à démarrer)
+
+        Raises:
+            QueueFullError: Si la file d'attente est pleine
+        """
+        if len(self._waiting) >= self.max_queued_jobs:
+            raise QueueFullError(f"File d'attente pleine ({self.max_queued_jobs} jobs en attente)")
+
+        self._enqueue(job_id, func, args, priority)
+        self._publish_positions()
+
+        position = self.get_position(job_id)
+        logger.info(f"Job {job_id} en file d'attente (priorité {priority}, position {position})")
+        return position
+
+    def submit_many(self, jobs: List[Tuple[str, Callable[..., Any], tuple, int]]) -> Dict[str, int]:
+        """
+        Place plusieurs jobs dans la file d'attente, tout ou rien
+
+        Les jobs passent par la même file et les mêmes workers qu'un job
+        soumis seul; la capacité est vérifiée pour le lot entier.
+
+        Args:
+            jobs: (job_id, func, args, priority) pour chaque job
+
+        Returns:
+            Position de chaque job dans la file
+
+        Raises:
+            QueueFullError: Si la file ne peut pas accueillir tout le lot
+        """
+        free = self.max_queued_jobs - len(self._waiting)
+        if len(jobs) > free:
+            raise QueueFullError(
+                f"File d'attente insuffisante pour {len(jobs)} jobs ({free} places libres "
+                f"sur {self.max_queued_jobs})"
+            )
+
+        for job_id, func, args, priority in jobs:
+            self._enqueue(job_id, func, args, priority)
+        self._publish_positions()
+
+        logger.info(f"{len(jobs)} jobs en file d'attente ({len(self._waiting)} au total)")
+        return {job_id: self.get_position(job_id) for job_id, _, _, _ in jobs}
+
+    def get_position(self, job_id: str) -> Optional[int]:
+        """Position 1-indexée d'un job dans la file, None s'il n'y est pas"""
+        entry = self._entries.get(job_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self._waiting, entry) + 1
+
+    @asynccontextmanager
+    async def phase_slot(self, phase: str):
+        """
+        Réserve un slot de concurrence pour une phase
+
+        Args:
+            phase: Clé de phase (setup, components, sections, pages, content, validation, github, vercel)
+        """
+        limit = self.phase_limits.get(phase)
+        if not limit:
+            yield
+            return
+
+        semaphore = self._phase_semaphores.get(phase)
+        if semaphore is None:
+            semaphore = self._phase_semaphores[phase] = asyncio.Semaphore(limit)
+
+        async with semaphore:
+            yield
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques instantanées du scheduler"""
+        return {
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "running_jobs": len(self._running),
+            "queued_jobs": len(self._waiting),
+            "max_queued_jobs": self.max_queued_jobs,
+            "phase_limits": self.phase_limits,
+        }
+
+    async def _worker(self, index: int):
+        """Boucle d'un worker: dépile et exécute les jobs un par un"""
+        while True:
+            entry, func, args = await self._queue.get()
+            job_id = entry[2]
+
+            position = bisect.bisect_left(self._waiting, entry)
+            if position < len(self._waiting) and self._waiting[position] == entry:
+                del self._waiting[position]
+            self._entries.pop(job_id, None)
+            job_manager.set_queue_position(job_id, None)
+            self._publish_positions()
+
+            with bind_job(job_id):
+                logger.info(f"Worker {index} démarre le job {job_id}")
+                task = asyncio.create_task(self._run_job(index, job_id, func, args), name=f"job-{job_id}")
+            self._running[job_id] = task
+            try:
+                await self._await_deadline(job_id, task)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(job_id, None)
+                self._queue.task_done()
+
+    @staticmethod
+    async def _run_job(index: int, job_id: str, func: Callable[..., Any], args: tuple):
+        try:
+            await func(*args)
+        except Exception as e:
+            logger.error(f"Worker {index}: erreur non gérée pour le job {job_id}: {str(e)}", exc_info=True)
+
+    async def _await_deadline(self, job_id: str, task: asyncio.Task):
+        """
+        Attend la fin d'un job dans la limite de settings.job_deadline
+
+        Au-delà, le job est annulé (ses sessions Claude sont tuées) et marqué
+        échoué. Un job qui ignore l'annulation est abandonné après
+        job_cancel_grace secondes: le worker reprend la file au lieu de rester bloqué.
+        """
+        deadline = settings.job_deadline or None
+        done, _ = await asyncio.wait({task}, timeout=deadline)
+        if done:
+            return
+
+        logger.error(f"Job {job_id}: délai global de {deadline}s dépassé, annulation")
+        task.cancel()
+        done, _ = await asyncio.wait({task}, timeout=settings.job_cancel_grace)
+        if not done:
+            logger.error(f"Job {job_id}: annulation sans effet après {settings.job_cancel_grace}s, slot libéré")
+
+        job = job_manager.get_job(job_id)
+        if job is not None and job["status"] not in TERMINAL_STATUSES:
+            job_manager.update_job(
+                job_id, "failed", job.get("progress") or 0, f"Échec: délai global de {deadline}s dépassé",
+                error="job deadline exceeded"
+            )
+
+    def _enqueue(self, job_id: str, func: Callable[..., Any], args: tuple, priority: int):
+        entry = (-priority, next(self._sequence), job_id)
+        bisect.insort(self._waiting, entry)
+        self._entries[job_id] = entry
+        self._queue.put_nowait((entry, func, args))
+
+    def _publish_positions(self):
+        """
+        Publie la position des jobs en attente suivis en SSE
+
+        Seuls les abonnés reçoivent un événement (et seulement si leur position
+        a changé): un lot de N jobs ne coûte plus N événements par entrée ou
+        sortie de file. Les autres lectures calculent la position à la demande.
+        """
+        for job_id in job_events.subscribed_jobs():
+            position = self.get_position(job_id)
+            if position is not None:
+                job_manager.set_queue_position(job_id, position)
+
+
+# Singleton instance
+job_scheduler = JobScheduler(
+    max_concurrent_jobs=settings.max_concurrent_jobs,
+    max_queued_jobs=settings.max_queued_jobs,
+    phase_limits=settings.phase_concurrency_limits
+)
+job_manager.queue_positions = job_scheduler.get_position
@@ -0,0 +1,367 @@
+"""
+Session Pool - Processus Claude Code CLI préchauffés et réutilisés entre phases
+Chaque ClaudeSDKClient lance un process CLI: le pool en garde des instances
+connectées par signature (cwd + options) pour éviter les démarrages à froid
+"""
+import asyncio
+import hashlib
+import json
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions
+
+from app.core.config import get_settings
+from app.core.processes import kill_process_tree
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Délai de déconnexion propre avant de tuer le process CLI (secondes)
+DISCONNECT_TIMEOUT = 10.0
+
+
+class PooledSession:
+    """
+    Session CLI possédée par sa propre tâche asyncio
+
+    connect() et disconnect() d'un ClaudeSDKClient doivent s'exécuter dans la
+    même tâche: la tâche propriétaire connecte, attend la fermeture, puis
+    déconnecte. Les phases n'utilisent que query()/receive_response().
+    """
+
+    def __init__(self, key: str, options: ClaudeAgentOptions, client_factory: Callable[[ClaudeAgentOptions], Any]):
+        self.key = key
+        self.client = client_factory(options)
+        self.startup_ms: float = 0.0
+        self.idle_since: float = 0.0
+        self.ttl: Optional[float] = None  # durée d'inactivité tolérée (None: idle_ttl du pool)
+        self.error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> "PooledSession":
+        """Démarre le process CLI et attend qu'il soit connecté"""
+        self._task = asyncio.create_task(self._own(), name=f"claude-session-{self.key[:8]}")
+        await self._ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID du process CLI (ClaudeSDKClient ne l'expose que via son transport interne)"""
+        process = getattr(getattr(self.client, "_transport", None), "_process", None)
+        return getattr(process, "pid", None)
+
+    def close(self):
+        """Demande la déconnexion (effectuée par la tâche propriétaire)"""
+        self._closing.set()
+
+    def kill(self):
+        """
+        Tue le process CLI et tous ses descendants (outils Bash, npm...), puis ferme
+
+        Pour une session interrompue en cours de réponse (délai dépassé, annulation):
+        une déconnexion normale ne termine que le process CLI lui-même.
+        """
+        pid = self.pid
+        if pid is not None:
+            killed = kill_process_tree(pid)
+            logger.warning(f"Session Claude {self.key[:8]} interrompue: {killed} process tué(s)")
+        self.close()
+
+    async def wait_closed(self):
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _own(self):
+        started = time.perf_counter()
+        try:
+            await self.client.connect()
+        except BaseException as e:
+            self.error = e
+            self._ready.set()
+            return
+        self.startup_ms = (time.perf_counter() - started) * 1000
+        self._ready.set()
+
+        await self._closing.wait()
+        pid = self.pid
+        try:
+            async with asyncio.timeout(DISCONNECT_TIMEOUT):
+                await self.client.disconnect()
+        except TimeoutError:
+            logger.warning(f"Déconnexion session Claude bloquée après {DISCONNECT_TIMEOUT}s: process tué")
+            if pid is not None:
+                kill_process_tree(pid)
+        except Exception as e:
+            logger.warning(f"Déconnexion session Claude: {str(e)}")
+
+
+class WarmUp:
+    """Préchauffage en cours pour une signature (éventuellement différé)"""
+
+    def __init__(self, delay: float, ttl: Optional[float]):
+        self.delay = delay
+        self.ttl = ttl
+        self.task: Optional[asyncio.Task] = None
+        self.starting = False  # délai écoulé, process CLI en cours de lancement
+        # Démarrage immédiat demandé par une phase qui prend la session avant la fin du délai
+        self.start_now = asyncio.Event()
+
+
+class ClaudeSessionPool:
+    """
+    Pool de sessions Claude Code par signature d'options
+
+    - prewarm() démarre en arrière-plan les sessions dont l'appelant sait
+      qu'elles seront prises (phases du niveau suivant du graphe), au besoin
+      après un délai (fin attendue de la phase amont): aucune session n'est
+      relancée d'office après usage, les signatures par site (fix, github,
+      vercel) n'étant jamais réutilisées
+    - session() prend une session inactive, sinon attend un préchauffage en
+      cours pour la même signature (démarré sur-le-champ s'il était différé),
+      sinon démarre à froid
+    - reuse_conversation=True rend la session au pool après usage: la phase
+      suivante continue la même conversation (contexte partagé)
+    - Les sessions inactives depuis idle_ttl secondes sont fermées
+    """
+
+    def __init__(self, warm_per_key: int = 1, max_idle_sessions: int = 8, idle_ttl: float = 120.0,
+                 client_factory: Callable[[ClaudeAgentOptions], Any] = ClaudeSDKClient):
+        self.warm_per_key = warm_per_key
+        self.max_idle_sessions = max_idle_sessions
+        self.idle_ttl = idle_ttl
+        self.client_factory = client_factory
+
+        self._idle: Dict[str, List[PooledSession]] = {}
+        self._warming: Dict[str, List[WarmUp]] = {}
+        self._background: set = set()
+        self._reaper: Optional[asyncio.Task] = None
+
+        self.cold_starts = 0
+        self.warm_hits = 0
+        self.live_sessions = 0
+        self._startup_total_ms = 0.0
+        self._startup_count = 0
+        self.startup_ms_saved = 0.0
+
+    @staticmethod
+    def signature(options: ClaudeAgentOptions) -> str:
+        """Signature stable des options déterminant le process CLI (cwd, modèle, outils, env...)"""
+        relevant = {
+            "cwd": str(options.cwd),
+            "model": options.model,
+            "allowed_tools": sorted(options.allowed_tools or []),
+            "permission_mode": options.permission_mode,
+            "system_prompt": options.system_prompt,
+            "env": sorted((options.env or {}).items()),
+        }
+        return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def start(self):
+        """Démarre la tâche de nettoyage des sessions inactives (lifespan)"""
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_periodically())
+
+    async def close(self):
+        """Ferme toutes les sessions du pool"""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        # Préchauffages encore différés annulés, ceux en cours de démarrage rejoignent les sessions à fermer
+        for warmups in self._warming.values():
+            for warmup in warmups:
+                if not warmup.starting:
+                    warmup.task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        sessions = [session for idle in self._idle.values() for session in idle]
+        self._idle.clear()
+        for session in sessions:
+            self._discard(session)
+        await asyncio.gather(*(session.wait_closed() for session in sessions), return_exceptions=True)
+
+    def prewarm(self, options: ClaudeAgentOptions, delay: float = 0.0, ttl: Optional[float] = None):
+        """
+        Lance en arrière-plan une session pour ces options si aucune n'est prête
+
+        Args:
+            options: Options de la phase qui prendra la session
+            delay: Attente avant le démarrage du CLI (secondes), écourtée si la phase la demande plus tôt
+            ttl: Inactivité tolérée une fois prête (défaut: idle_ttl)
+        """
+        if self.warm_per_key <= 0:
+            return
+        key = self.signature(options)
+        available = len(self._idle.get(key, [])) + len(self._warming.get(key, []))
+        idle_total = sum(len(idle) for idle in self._idle.values())
+        if available >= self.warm_per_key or idle_total >= self.max_idle_sessions:
+            return
+
+        warmup = WarmUp(delay, ttl)
+        self._warming.setdefault(key, []).append(warmup)
+        warmup.task = asyncio.create_task(self._warm(key, options, warmup))
+        self._background.add(warmup.task)
+        warmup.task.add_done_callback(self._background.discard)
+
+    @asynccontextmanager
+    async def session(self, options: ClaudeAgentOptions, reuse_conversation: bool = False):
+        """
+        Fournit un client connecté pour une phase
+
+        Args:
+            options: Options Claude Agent SDK de la phase
+            reuse_conversation: Rendre la session au pool après usage (conversation continuée)
+
+        Yields:
+            Client ClaudeSDKClient connecté
+        """
+        key = self.signature(options)
+        waited_ms = 0.0
+        session = self._take_idle(key)
+        if session is None:
+            started = time.perf_counter()
+            session = await self._take_warming(key)
+            waited_ms = (time.perf_counter() - started) * 1000
+
+        if session is not None:
+            self.warm_hits += 1
+            self.startup_ms_saved += max(0.0, self.average_startup_ms() - waited_ms)
+        else:
+            session = PooledSession(key, options, self.client_factory)
+            try:
+                await session.start()
+            except BaseException:
+                # Démarrage annulé (délai de phase): le process en cours de lancement est tué
+                session.kill()
+                raise
+            self._record_startup(session)
+            self.cold_starts += 1
+
+        healthy = False
+        try:
+            yield session.client
+            healthy = True
+        finally:
+            if healthy and reuse_conversation:
+                session.idle_since = time.monotonic()
+                self._idle.setdefault(key, []).append(session)
+            else:
+                # Session interrompue en pleine réponse: le CLI et ses outils sont tués
+                self._discard(session, kill=not healthy)
+
+    def average_startup_ms(self) -> float:
+        """Durée moyenne observée d'un démarrage à froid du CLI"""
+        return self._startup_total_ms / self._startup_count if self._startup_count else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques du pool (démarrages évités, temps gagné)"""
+        return {
+            "live_sessions": self.live_sessions,
+            "idle_sessions": sum(len(idle) for idle in self._idle.values()),
+            "warming_sessions": sum(len(warmups) for warmups in self._warming.values()),
+            "cold_starts": self.cold_starts,
+            "warm_hits": self.warm_hits,
+            "avg_startup_ms": round(self.average_startup_ms(), 1),
+            "startup_ms_saved": round(self.startup_ms_saved, 1),
+        }
+
+    def _take_idle(self, key: str) -> Optional[PooledSession]:
+        idle = self._idle.get(key)
+        while idle:
+            session = idle.pop()
+            if not self._expired(session, time.monotonic()):
+                return session
+            self._discard(session)
+        return None
+
+    async def _take_warming(self, key: str) -> Optional[PooledSession]:
+        """Réserve un préchauffage en cours et attend sa session (None s'il échoue)"""
+        warmups = self._warming.get(key)
+        if not warmups:
+            return None
+        warmup = warmups.pop(0)
+        if not warmups:
+            del self._warming[key]
+
+        warmup.start_now.set()
+        try:
+            return await asyncio.shield(warmup.task)
+        except asyncio.CancelledError:
+            # Phase annulée pendant le démarrage: la session réservée n'a plus de preneur
+            warmup.task.add_done_callback(
+                lambda task: self._discard(task.result(), kill=True)
+                if not task.cancelled() and task.result() is not None else None
+            )
+            raise
+
+    async def _warm(self, key: str, options: ClaudeAgentOptions, warmup: WarmUp) -> Optional[PooledSession]:
+        """Démarre la session préchauffée; mise en attente dans le pool si aucune phase ne l'a réservée"""
+        try:
+            if warmup.delay > 0:
+                try:
+                    await asyncio.wait_for(warmup.start_now.wait(), warmup.delay)
+                except TimeoutError:
+                    pass
+            warmup.starting = True
+            session = await PooledSession(key, options, self.client_factory).start()
+        except Exception as e:
+            logger.warning(f"Préchauffage session Claude échoué: {str(e)}")
+            return None
+        finally:
+            warmups = self._warming.get(key, [])
+            reserved = warmup not in warmups
+            if not reserved:
+                warmups.remove(warmup)
+                if not warmups:
+                    del self._warming[key]
+
+        self._record_startup(session)
+        if not reserved:
+            session.idle_since = time.monotonic()
+            session.ttl = warmup.ttl
+            self._idle.setdefault(key, []).append(session)
+        return session
+
+    def _expired(self, session: PooledSession, now: float) -> bool:
+        return now - session.idle_since >= (session.ttl if session.ttl is not None else self.idle_ttl)
+
+    def _record_startup(self, session: PooledSession):
+        self.live_sessions += 1
+        self._startup_total_ms += session.startup_ms
+        self._startup_count += 1
+
+    def _discard(self, session: PooledSession, kill: bool = False):
+        self.live_sessions -= 1
+        if kill:
+            session.kill()
+        else:
+            session.close()
+
+    async def _reap_periodically(self):
+        while True:
+            await asyncio.sleep(max(self.idle_ttl / 2, 1.0))
+            now = time.monotonic()
+            for key in list(self._idle):
+                keep = []
+                for session in self._idle[key]:
+                    if self._expired(session, now):
+                        self._discard(session)
+                    else:
+                        keep.append(session)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+
+
+# Singleton instance
+session_pool = ClaudeSessionPool(
+    warm_per_key=settings.session_pool_warm_per_key,
+    max_idle_sessions=settings.session_pool_max_idle,
+    idle_ttl=settings.session_pool_idle_ttl
+)
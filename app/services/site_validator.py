@@ -0,0 +1,554 @@
+"""
+Site Validator - Validation statique native d'un site généré
+Remplace la boucle de validation par agent: vérifie en quelques secondes les
+fichiers attendus, la résolution des imports, les JSON et la syntaxe des
+fichiers de configuration (tsc / next build en option)
+"""
+import asyncio
+import json
+import os
+import re
+import shutil
+import time
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Set
+
+from app.core.config import get_settings
+from app.core.processes import kill_process_tree
+from app.core.log_config import truncate
+from app.services.template_renderer import BoilerplateRenderer
+from app.agents.modular import SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+RESOLVE_EXTENSIONS = SOURCE_EXTENSIONS + (".json", ".css")
+IGNORED_DIRS = {"node_modules", ".next", ".git", "out", ".vercel"}
+NODE_BUILTINS = {
+    "fs", "path", "crypto", "url", "os", "http", "https", "stream", "util",
+    "events", "buffer", "child_process", "zlib", "querystring", "assert"
+}
+
+# import X from '...', import { a, b } from '...', import '...', export * from '...', export { a } from '...'
+IMPORT_RE = re.compile(r"""^[ \t]*(import|export)\s+(?:type\s+)?(?:([\w*{}\s,$]+?)\s+from\s+)?['"]([^'"\n]+)['"]""", re.M)
+DYNAMIC_IMPORT_RE = re.compile(r"""\b(?:import|require)\(\s*['"]([^'"\n]+)['"]\s*\)""")
+
+EXPORT_DECL_RE = re.compile(
+    r"^[ \t]*export\s+(default\s+)?(?:declare\s+)?(?:async\s+)?"
+    r"(?:function\*?|class|const|let|var|interface|type|enum)\s+([A-Za-z_$][\w$]*)", re.M
+)
+EXPORT_DEFAULT_RE = re.compile(r"^[ \t]*export\s+default\b", re.M)
+EXPORT_LIST_RE = re.compile(r"^[ \t]*export\s+(?:type\s+)?\{([^}]*)\}", re.M)
+EXPORT_STAR_RE = re.compile(r"""^[ \t]*export\s+\*\s+(?:as\s+([\w$]+)\s+)?from\s+['"]([^'"\n]+)['"]""", re.M)
+
+# Champ des instructions d'agent (⟨slot⟩) que l'agent aurait dû remplacer par sa valeur
+SLOT_RE = re.compile(r"⟨([A-Za-z_]\w*)⟩")
+SLOT_EXTENSIONS = SOURCE_EXTENSIONS + (".json", ".css", ".md", ".txt", ".xml")
+# Fichiers du thème: doivent contenir les couleurs de l'entreprise
+THEME_FILES = ("tailwind.config.js", "app/globals.css")
+THEME_COLORS = ("primary_color", "secondary_color")
+
+COMMENT_RE = re.compile(r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)|//[^\n]*|/\*.*?\*/""", re.S)
+TSC_ERROR_RE = re.compile(r"^(.+?)\((\d+),\d+\): error (TS\d+): (.*)$", re.M)
+
+
+@dataclass
+class ValidationIssue:
+    """Problème détecté (fichier relatif à site_dir)"""
+
+    check: str
+    file: str
+    message: str
+    line: Optional[int] = None
+    severity: str = "error"
+    rule: str = ""  # règle précise (missing-file, unresolved-import, TS2305, ...)
+    related: Optional[str] = None  # autre fichier concerné par la correction (cible d'un import)
+
+    def location(self) -> str:
+        return f"{self.file}:{self.line}" if self.line else self.file
+
+
+@dataclass
+class ValidationReport:
+    """Rapport structuré d'une validation"""
+
+    issues: List[ValidationIssue] = field(default_factory=list)
+    checks: Dict[str, int] = field(default_factory=dict)  # check -> durée en ms
+    files_checked: int = 0
+    duration_ms: int = 0
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "passed": self.passed,
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+            "files_checked": self.files_checked,
+            "duration_ms": self.duration_ms,
+            "checks": self.checks,
+            "issues": [asdict(issue) for issue in self.issues],
+        }
+
+    def fix_groups(self, max_groups: int) -> List[List[ValidationIssue]]:
+        """
+        Regroupe les erreurs par fichier pour des corrections en parallèle
+
+        Deux erreurs dont les fichiers (ou fichiers liés) se recoupent vont dans
+        le même groupe: deux sessions ne modifient jamais le même fichier. Au-delà
+        de max_groups, les plus petits groupes sont fusionnés (équilibrage par volume).
+        """
+        parent: Dict[str, str] = {}
+
+        def find(key: str) -> str:
+            while parent.setdefault(key, key) != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        def file_key(path: str) -> str:
+            return os.path.splitext(os.path.normpath(path))[0]
+
+        for issue in self.errors:
+            if issue.related:
+                parent[find(file_key(issue.file))] = find(file_key(issue.related))
+
+        components: Dict[str, List[ValidationIssue]] = {}
+        for issue in self.errors:
+            components.setdefault(find(file_key(issue.file)), []).append(issue)
+
+        groups = sorted(components.values(), key=len, reverse=True)
+        if len(groups) <= max_groups:
+            return groups
+
+        bins: List[List[ValidationIssue]] = [[] for _ in range(max_groups)]
+        for group in groups:
+            min(bins, key=len).extend(group)
+        return bins
+
+    def format_text(self, max_issues: int = 50) -> str:
+        """Liste lisible des problèmes (une ligne par problème)"""
+        return format_issues(self.issues, max_issues)
+
+
+def format_issues(issues: List[ValidationIssue], max_issues: int = 50) -> str:
+    """Une ligne par problème: SÉVÉRITÉ fichier:ligne [règle] message"""
+    lines = [
+        f"- {issue.severity.upper()} {issue.location()} [{issue.rule or issue.check}] {issue.message}"
+        for issue in issues[:max_issues]
+    ]
+    if len(issues) > max_issues:
+        lines.append(f"- ... {len(issues) - max_issues} autres problèmes")
+    return "\n".join(lines)
+
+
+class StaticSiteValidator:
+    """
+    Validateur statique d'un site Next.js généré
+
+    Checks:
+    - files: chaque fichier que les agents et le boilerplate doivent produire existe
+    - imports: imports '@/...' et relatifs résolus, noms importés exportés par la cible,
+      packages déclarés dans package.json
+    - json: tous les fichiers .json se parsent
+    - config: syntaxe des *.config.{js,mjs,cjs} (node --check)
+    - slots: aucun champ ⟨slot⟩ des instructions laissé tel quel, couleurs de
+      l'entreprise présentes dans les fichiers du thème
+    - typescript / build (optionnels): tsc --noEmit et next build
+    """
+
+    def __init__(self, typecheck: bool = False, build: bool = False, command_timeout: int = 300):
+        self.typecheck = typecheck
+        self.build = build
+        self.command_timeout = command_timeout
+
+    @staticmethod
+    def expected_files() -> List[str]:
+        """Fichiers attendus: boilerplate + OUTPUTS déclarés par les 5 agents"""
+        expected = list(BoilerplateRenderer.OUTPUTS)
+        for agent_class in (SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent):
+            expected.extend(path for path in agent_class.OUTPUTS if path not in expected)
+        return expected
+
+    def dependents(self, site_dir: str, files: List[str]) -> List[str]:
+        """
+        Fichiers sources qui importent l'un des fichiers donnés
+
+        Utilisé par la régénération incrémentale: un fichier modifié peut casser
+        les imports de ceux qui en dépendent.
+
+        Args:
+            site_dir: Répertoire du site
+            files: Chemins relatifs modifiés
+
+        Returns:
+            Chemins relatifs des importeurs (hors fichiers donnés)
+        """
+        targets = {os.path.normpath(os.path.join(site_dir, path)) for path in files}
+        found = []
+        for relative in self._list_files(site_dir):
+            if not relative.endswith(SOURCE_EXTENSIONS) or relative in files:
+                continue
+            path = os.path.join(site_dir, relative)
+            source = _strip_comments(self._read(path))
+            specifiers = [m.group(3) for m in IMPORT_RE.finditer(source)]
+            specifiers += [m.group(1) for m in DYNAMIC_IMPORT_RE.finditer(source)]
+            for specifier in specifiers:
+                if not specifier.startswith((".", "@/")):
+                    continue
+                target = self._resolve(site_dir, os.path.dirname(path), specifier)
+                if target is not None and os.path.normpath(target) in targets:
+                    found.append(relative)
+                    break
+        return found
+
+    async def validate(self, site_dir: str, files: Optional[List[str]] = None,
+                       expected: Optional[Dict[str, Any]] = None) -> ValidationReport:
+        """
+        Valide un site
+
+        Args:
+            site_dir: Répertoire du site
+            files: Limiter les checks d'imports/JSON/config/slots à ces fichiers (relatifs);
+                   None = tout le site
+            expected: Valeurs des slots du job (get_slots des agents): citées dans les
+                      diagnostics, couleurs du thème vérifiées
+
+        Returns:
+            Rapport structuré (issues, durée par check)
+        """
+        started = time.perf_counter()
+        report = ValidationReport()
+
+        sources = await asyncio.to_thread(self._list_files, site_dir)
+        if files is not None:
+            wanted = set(files)
+            sources = [path for path in sources if path in wanted]
+        report.files_checked = len(sources)
+
+        await self._timed(report, "files", asyncio.to_thread(self._check_files, site_dir, report))
+        await self._timed(report, "imports", asyncio.to_thread(self._check_imports, site_dir, sources, report))
+        await self._timed(report, "json", asyncio.to_thread(self._check_json, site_dir, sources, report))
+        await self._timed(report, "config", self._check_config(site_dir, sources, report))
+        await self._timed(report, "slots", asyncio.to_thread(self._check_slots, site_dir, sources, expected or {}, report))
+        if self.typecheck:
+            await self._timed(report, "typescript", self._check_typescript(site_dir, report))
+        if self.build and not report.errors:
+            await self._timed(report, "build", self._check_build(site_dir, report))
+
+        report.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"Validation {site_dir}: {len(report.errors)} erreur(s), {len(report.warnings)} warning(s) "
+            f"en {report.duration_ms} ms"
+        )
+        return report
+
+    @staticmethod
+    async def _timed(report: ValidationReport, check: str, coroutine):
+        started = time.perf_counter()
+        await coroutine
+        report.checks[check] = int((time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    def _list_files(site_dir: str) -> List[str]:
+        files = []
+        for root, dirs, names in os.walk(site_dir):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            for name in names:
+                files.append(os.path.relpath(os.path.join(root, name), site_dir))
+        return sorted(files)
+
+    @staticmethod
+    def _read(path: str) -> str:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def _check_files(self, site_dir: str, report: ValidationReport):
+        for path in self.expected_files():
+            if not os.path.exists(os.path.join(site_dir, path)):
+                report.issues.append(ValidationIssue("files", path, "Fichier attendu manquant", rule="missing-file"))
+
+    def _check_imports(self, site_dir: str, sources: List[str], report: ValidationReport):
+        packages = self._declared_packages(site_dir)
+        exports_cache: Dict[str, Optional[Set[str]]] = {}
+
+        for relative in sources:
+            if not relative.endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(site_dir, relative)
+            source = _strip_comments(self._read(path))
+
+            specifiers = [(m.group(3), m.group(2), m.group(1), m.start(3)) for m in IMPORT_RE.finditer(source)]
+            specifiers += [(m.group(1), None, "import", m.start(1)) for m in DYNAMIC_IMPORT_RE.finditer(source)]
+
+            for specifier, clause, keyword, offset in specifiers:
+                line = source.count("\n", 0, offset) + 1
+
+                if not specifier.startswith((".", "@/")):
+                    package = self._package_name(specifier)
+                    if package not in packages and package not in NODE_BUILTINS and not specifier.startswith("node:"):
+                        report.issues.append(ValidationIssue(
+                            "imports", relative, f"Package '{package}' non déclaré dans package.json", line,
+                            rule="undeclared-package", related="package.json"
+                        ))
+                    continue
+
+                target = self._resolve(site_dir, os.path.dirname(path), specifier)
+                if target is None:
+                    report.issues.append(ValidationIssue(
+                        "imports", relative, f"Import introuvable: '{specifier}'", line,
+                        rule="unresolved-import", related=self._import_path(site_dir, os.path.dirname(path), specifier)
+                    ))
+                    continue
+
+                if clause and target.endswith(SOURCE_EXTENSIONS):
+                    exported = self._exports(site_dir, target, exports_cache)
+                    if exported is None:
+                        continue
+                    for name in self._imported_names(clause, keyword):
+                        if name not in exported:
+                            label = "export par défaut" if name == "default" else f"export '{name}'"
+                            report.issues.append(ValidationIssue(
+                                "imports", relative,
+                                f"{label} absent de '{os.path.relpath(target, site_dir)}'", line,
+                                rule="missing-export", related=os.path.relpath(target, site_dir)
+                            ))
+
+    @staticmethod
+    def _declared_packages(site_dir: str) -> Set[str]:
+        try:
+            with open(os.path.join(site_dir, "package.json"), encoding="utf-8") as f:
+                package = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return set()
+        return set(package.get("dependencies", {})) | set(package.get("devDependencies", {}))
+
+    @staticmethod
+    def _package_name(specifier: str) -> str:
+        parts = specifier.split("/")
+        return "/".join(parts[:2]) if specifier.startswith("@") else parts[0]
+
+    @staticmethod
+    def _import_path(site_dir: str, base_dir: str, specifier: str) -> str:
+        """Chemin (relatif à site_dir, sans extension) visé par un import local"""
+        if specifier.startswith("@/"):
+            return os.path.normpath(specifier[2:])
+        return os.path.relpath(os.path.normpath(os.path.join(base_dir, specifier)), site_dir)
+
+    @staticmethod
+    def _resolve(site_dir: str, base_dir: str, specifier: str) -> Optional[str]:
+        """Résolution façon bundler: fichier exact, extensions, puis index.*"""
+        if specifier.startswith("@/"):
+            candidate = os.path.join(site_dir, specifier[2:])
+        else:
+            candidate = os.path.normpath(os.path.join(base_dir, specifier))
+
+        if os.path.isfile(candidate):
+            return candidate
+        for extension in RESOLVE_EXTENSIONS:
+            if os.path.isfile(candidate + extension):
+                return candidate + extension
+        if os.path.isdir(candidate):
+            for extension in SOURCE_EXTENSIONS:
+                index = os.path.join(candidate, f"index{extension}")
+                if os.path.isfile(index):
+                    return index
+        return None
+
+    @staticmethod
+    def _imported_names(clause: str, keyword: str) -> List[str]:
+        """Noms importés par une clause (default, nommés); vide pour import * as X"""
+        clause = " ".join(clause.split())
+        names = []
+        named = ""
+        if "{" in clause:
+            before, _, rest = clause.partition("{")
+            named = rest.partition("}")[0]
+        else:
+            before = clause
+        default = before.strip().rstrip(",").strip()
+        if default and not default.startswith("*") and keyword == "import":
+            names.append("default")
+
+        for item in named.split(","):
+            item = item.strip()
+            if item.startswith("type "):
+                item = item[5:].strip()
+            name = item.split(" as ")[0].strip()
+            if name:
+                names.append(name)
+        return names
+
+    def _exports(self, site_dir: str, path: str, cache: Dict[str, Optional[Set[str]]]) -> Optional[Set[str]]:
+        """Noms exportés par un module (None si non analysable)"""
+        if path in cache:
+            return cache[path]
+        cache[path] = None  # protège des cycles d'export *
+
+        source = _strip_comments(self._read(path))
+        if "module.exports" in source:
+            return None
+
+        names: Set[str] = set()
+        for match in EXPORT_DECL_RE.finditer(source):
+            names.add("default" if match.group(1) else match.group(2))
+            if match.group(1):
+                names.add(match.group(2))
+        if EXPORT_DEFAULT_RE.search(source):
+            names.add("default")
+        for match in EXPORT_LIST_RE.finditer(source):
+            for item in match.group(1).split(","):
+                item = item.strip()
+                if item.startswith("type "):
+                    item = item[5:].strip()
+                if item:
+                    names.add(item.split(" as ")[-1].strip())
+        for match in EXPORT_STAR_RE.finditer(source):
+            if match.group(1):
+                names.add(match.group(1))
+                continue
+            target = self._resolve(site_dir, os.path.dirname(path), match.group(2))
+            nested = self._exports(site_dir, target, cache) if target else None
+            if nested is None:
+                return None
+            names |= nested - {"default"}
+
+        cache[path] = names
+        return names
+
+    def _check_json(self, site_dir: str, sources: List[str], report: ValidationReport):
+        for relative in sources:
+            if not relative.endswith(".json"):
+                continue
+            source = self._read(os.path.join(site_dir, relative))
+            try:
+                json.loads(source)
+            except json.JSONDecodeError as e:
+                # tsconfig et .eslintrc acceptent commentaires et virgules finales (JSONC)
+                if os.path.basename(relative).startswith(("tsconfig", ".eslintrc")) and _parses_as_jsonc(source):
+                    continue
+                report.issues.append(ValidationIssue("json", relative, f"JSON invalide: {e.msg}", e.lineno, rule="invalid-json"))
+
+    def _check_slots(self, site_dir: str, sources: List[str], expected: Dict[str, Any], report: ValidationReport):
+        for relative in sources:
+            if not relative.endswith(SLOT_EXTENSIONS):
+                continue
+            source = self._read(os.path.join(site_dir, relative))
+            for match in SLOT_RE.finditer(source):
+                name = match.group(1)
+                message = f"Champ ⟨{name}⟩ non remplacé"
+                if name in expected:
+                    message += f" (valeur: {truncate(str(expected[name]), 200)})"
+                report.issues.append(ValidationIssue(
+                    "slots", relative, message, source.count("\n", 0, match.start()) + 1, rule="unresolved-slot"
+                ))
+
+        for relative in THEME_FILES:
+            if relative not in sources:
+                continue
+            source = self._read(os.path.join(site_dir, relative)).lower()
+            missing = [f"{name} {expected[name]}" for name in THEME_COLORS
+                       if expected.get(name) and str(expected[name]).lower() not in source]
+            if missing:
+                report.issues.append(ValidationIssue(
+                    "slots", relative, f"Couleur(s) de l'entreprise absente(s): {', '.join(missing)}", rule="wrong-color"
+                ))
+
+    async def _check_config(self, site_dir: str, sources: List[str], report: ValidationReport):
+        configs = [
+            path for path in sources
+            if "/" not in path and re.search(r"\.config\.(js|mjs|cjs)$", path)
+        ]
+        if not configs:
+            return
+        if shutil.which("node") is None:
+            logger.debug("node absent: vérification syntaxique des configs ignorée")
+            return
+        await asyncio.gather(*(self._node_check(site_dir, path, report) for path in configs))
+
+    async def _node_check(self, site_dir: str, relative: str, report: ValidationReport):
+        source = self._read(os.path.join(site_dir, relative))
+        is_module = relative.endswith(".mjs") or (
+            not relative.endswith(".cjs") and re.search(r"^\s*(import|export)\b", source, re.M)
+        )
+        process = await asyncio.create_subprocess_exec(
+            "node", f"--input-type={'module' if is_module else 'commonjs'}", "--check",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate(source.encode())
+        if process.returncode != 0:
+            message = next((line for line in stderr.decode().splitlines() if "Error" in line), "Erreur de syntaxe")
+            match = re.search(r"\[stdin\]:(\d+)", stderr.decode())
+            report.issues.append(ValidationIssue(
+                "config", relative, message.strip(), int(match.group(1)) if match else None,
+                rule="config-syntax"
+            ))
+
+    async def _run(self, site_dir: str, *command: str) -> tuple:
+        process = await asyncio.create_subprocess_exec(
+            *command, cwd=site_dir, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), timeout=self.command_timeout)
+        except asyncio.TimeoutError:
+            kill_process_tree(process.pid)
+            await process.wait()
+            return None, f"{' '.join(command)} a dépassé {self.command_timeout}s"
+        return process.returncode, output.decode(errors="replace")
+
+    async def _check_typescript(self, site_dir: str, report: ValidationReport):
+        returncode, output = await self._run(site_dir, "npx", "--no-install", "tsc", "--noEmit", "-p", ".")
+        if returncode == 0:
+            return
+        matches = list(TSC_ERROR_RE.finditer(output or ""))
+        for match in matches:
+            report.issues.append(ValidationIssue(
+                "typescript", match.group(1), match.group(4), int(match.group(2)), rule=match.group(3)
+            ))
+        if not matches:
+            report.issues.append(ValidationIssue(
+                "typescript", "tsconfig.json", (output or "").strip()[-2000:], rule="tsc"
+            ))
+
+    async def _check_build(self, site_dir: str, report: ValidationReport):
+        returncode, output = await self._run(site_dir, "npx", "--no-install", "next", "build")
+        if returncode != 0:
+            report.issues.append(ValidationIssue(
+                "build", "package.json", (output or "").strip()[-3000:], rule="next-build"
+            ))
+
+
+def _strip_comments(source: str) -> str:
+    """Retire les commentaires JS/TS (les chaînes sont préservées, les numéros de ligne aussi)"""
+    return COMMENT_RE.sub(lambda m: m.group(1) or "\n" * m.group(0).count("\n"), source)
+
+
+def _parses_as_jsonc(source: str) -> bool:
+    """Parse après retrait des commentaires et virgules finales"""
+    stripped = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or "", source, flags=re.S)
+    stripped = re.sub(r",(\s*[}\]])", r"\1", stripped)
+    try:
+        json.loads(stripped)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+# Singleton instance
+site_validator = StaticSiteValidator(
+    typecheck=settings.validation_typecheck,
+    build=settings.validation_build,
+    command_timeout=settings.validation_command_timeout
+)
@@ -0,0 +1,251 @@
+"""
+Template Renderer - Génération déterministe des fichiers boilerplate
+Écrit directement depuis business_data les fichiers entièrement spécifiés
+(package.json, tsconfig.json, robots.txt, sitemap.xml, ...) au lieu de les
+faire taper par un agent Claude
+"""
+import json
+import os
+import logging
+from datetime import date
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Dépendances identiques pour tous les sites générés
+DEPENDENCIES = {
+    "next": "^14.2.18",
+    "react": "^18.3.1",
+    "react-dom": "^18.3.1",
+    "framer-motion": "^12.0.0",
+    "lucide-react": "^0.468.0",
+    "react-hook-form": "^7.54.2",
+    "zod": "^3.24.1",
+    "@hookform/resolvers": "^3.9.1",
+    "clsx": "^2.1.1",
+    "tailwind-merge": "^2.6.0"
+}
+
+DEV_DEPENDENCIES = {
+    "@types/node": "^20",
+    "@types/react": "^18",
+    "@types/react-dom": "^18",
+    "typescript": "^5",
+    "tailwindcss": "^3.4.17",
+    "postcss": "^8",
+    "autoprefixer": "^10.4.20",
+    "eslint": "^8",
+    "eslint-config-next": "14.2.18"
+}
+
+TSCONFIG = {
+    "compilerOptions": {
+        "target": "ES2022",
+        "lib": ["dom", "dom.iterable", "esnext"],
+        "allowJs": True,
+        "skipLibCheck": True,
+        "strict": True,
+        "noEmit": True,
+        "esModuleInterop": True,
+        "module": "esnext",
+        "moduleResolution": "bundler",
+        "resolveJsonModule": True,
+        "isolatedModules": True,
+        "jsx": "preserve",
+        "incremental": True,
+        "plugins": [{"name": "next"}],
+        "paths": {"@/*": ["./*"]}
+    },
+    "include": ["next-env.d.ts", "**/*.ts", "**/*.tsx", ".next/types/**/*.ts"],
+    "exclude": ["node_modules"]
+}
+
+ESLINTRC = {"extends": ["next/core-web-vitals", "next/typescript"]}
+
+POSTCSS_CONFIG = """/** @type {import('postcss-load-config').Config} */
+const config = {
+  plugins: {
+    tailwindcss: {},
+    autoprefixer: {},
+  },
+};
+
+export default config;
+"""
+
+GITIGNORE = """# dependencies
+/node_modules
+/.pnp
+.pnp.js
+
+# testing
+/coverage
+
+# next.js
+/.next/
+/out/
+
+# production
+/build
+
+# misc
+.DS_Store
+*.pem
+.generation-manifest.json
+
+# debug
+npm-debug.log*
+yarn-debug.log*
+yarn-error.log*
+
+# local env files
+.env*.local
+.env
+
+# vercel
+.vercel
+
+# typescript
+*.tsbuildinfo
+next-env.d.ts
+
+# temp
+/tmp
+/.temp
+"""
+
+
+def _json(data: Any) -> str:
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+class BoilerplateRenderer:
+    """Rendu natif des fichiers de configuration et SEO statiques d'un site"""
+
+    # Fichiers produits (relatifs à site_dir) - utilisés par l'orchestrateur DAG
+    OUTPUTS: List[str] = [
+        "package.json",
+        "tsconfig.json",
+        "postcss.config.mjs",
+        ".eslintrc.json",
+        ".gitignore",
+        "public/robots.txt",
+        "public/sitemap.xml",
+        "public/manifest.json",
+    ]
+
+    @staticmethod
+    def site_url(business: Dict[str, Any], site_slug: str) -> str:
+        """URL publique du site (domaine client ou fallback sur le slug)"""
+        return (business.get("domain_url") or f"https://{site_slug}.com").rstrip("/")
+
+    @staticmethod
+    def render(business: Dict[str, Any], site_slug: str) -> Dict[str, str]:
+        """
+        Rend tous les fichiers boilerplate en mémoire
+
+        Args:
+            business: Données de l'entreprise
+            site_slug: Slug du site
+
+        Returns:
+            Contenu de chaque fichier, par chemin relatif à site_dir
+        """
+        site_url = BoilerplateRenderer.site_url(business, site_slug)
+        name = business.get("name", "")
+        today = date.today().isoformat()
+
+        package_json = {
+            "name": site_slug,
+            "version": "1.0.0",
+            "private": True,
+            "scripts": {
+                "dev": "next dev",
+                "build": "next build",
+                "start": "next start",
+                "lint": "next lint"
+            },
+            "dependencies": DEPENDENCIES,
+            "devDependencies": DEV_DEPENDENCIES
+        }
+
+        manifest = {
+            "name": name,
+            "short_name": name.split()[0] if name.split() else name,
+            "description": f"{business.get('positioning', '')} à {business.get('city', '')}",
+            "start_url": "/",
+            "display": "standalone",
+            "background_color": "#ffffff",
+            "theme_color": business.get("primary_color") or "#1a5490",
+            "orientation": "portrait-primary",
+            "icons": [
+                {"src": "/icon-192.png", "sizes": "192x192", "type": "image/png", "purpose": "any maskable"},
+                {"src": "/icon-512.png", "sizes": "512x512", "type": "image/png", "purpose": "any maskable"}
+            ]
+        }
+
+        sitemap_entries = [
+            (site_url, "weekly", "1.0"),
+            (f"{site_url}/mentions-legales", "monthly", "0.3"),
+            (f"{site_url}/politique-confidentialite", "monthly", "0.3"),
+        ]
+        sitemap = ['<?xml version="1.0" encoding="UTF-8"?>',
+                   '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for loc, changefreq, priority in sitemap_entries:
+            sitemap.extend([
+                "  <url>",
+                f"    <loc>{loc}</loc>",
+                f"    <lastmod>{today}</lastmod>",
+                f"    <changefreq>{changefreq}</changefreq>",
+                f"    <priority>{priority}</priority>",
+                "  </url>",
+            ])
+        sitemap.append("</urlset>")
+
+        robots = (
+            f"# {name} - Robots.txt\n"
+            "\n"
+            "User-agent: *\n"
+            "Allow: /\n"
+            "\n"
+            "# Sitemap\n"
+            f"Sitemap: {site_url}/sitemap.xml\n"
+            "\n"
+            "# Block admin paths (if any in future)\n"
+            "Disallow: /api/\n"
+            "Disallow: /_next/\n"
+        )
+
+        return {
+            "package.json": _json(package_json),
+            "tsconfig.json": _json(TSCONFIG),
+            "postcss.config.mjs": POSTCSS_CONFIG,
+            ".eslintrc.json": _json(ESLINTRC),
+            ".gitignore": GITIGNORE,
+            "public/robots.txt": robots,
+            "public/sitemap.xml": "\n".join(sitemap) + "\n",
+            "public/manifest.json": _json(manifest),
+        }
+
+    @staticmethod
+    def write(business: Dict[str, Any], site_slug: str, site_dir: str) -> List[str]:
+        """
+        Écrit les fichiers boilerplate dans site_dir
+
+        Args:
+            business: Données de l'entreprise
+            site_slug: Slug du site
+            site_dir: Répertoire du site
+
+        Returns:
+            Liste des chemins relatifs écrits
+        """
+        files = BoilerplateRenderer.render(business, site_slug)
+        for relative_path, content in files.items():
+            path = os.path.join(site_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+        logger.info(f"Boilerplate: {len(files)} fichiers écrits dans {site_dir}")
+        return list(files)
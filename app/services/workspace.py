@@ -0,0 +1,220 @@
+"""
+Workspace - Clonage copy-on-write des espaces de travail des sites
+Un site est assemblé à partir d'espaces de base partagés (node_modules du cache
+de dépendances, composants du squelette) au lieu d'en recevoir une copie
+complète: reflink quand le système de fichiers le permet (btrfs, XFS, APFS...),
+hardlink pour les fichiers immuables, copie en dernier recours. Des milliers de
+sites tiennent ainsi sur un même volume
+"""
+import os
+import shutil
+import threading
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.prometheus import WORKSPACE_BYTES, WORKSPACE_TIME_SAVED
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# ioctl Linux de clonage d'un fichier (extents partagés, copy-on-write)
+FICLONE = 0x40049409
+
+CLONE_MODES = ("auto", "reflink", "hardlink", "copy")
+
+
+@dataclass
+class CloneResult:
+    """Bilan d'un clonage (octets = taille logique des fichiers clonés)"""
+
+    files: int = 0
+    bytes: int = 0
+    reflinked: int = 0
+    hardlinked: int = 0
+    copied: int = 0
+    symlinks: int = 0
+    bytes_shared: int = 0  # octets reflinkés ou hardlinkés: espace disque économisé
+    duration_ms: int = 0
+    saved_ms: int = 0  # durée de l'opération remplacée (installation, phase d'agent) moins le clonage
+
+    @property
+    def mode(self) -> str:
+        """Mode dominant: reflink, hardlink, copy ou mixed"""
+        used = [name for name, count in (("reflink", self.reflinked), ("hardlink", self.hardlinked),
+                                         ("copy", self.copied)) if count]
+        return used[0] if len(used) == 1 else ("mixed" if used else "empty")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "mode": self.mode}
+
+
+class WorkspaceManager:
+    """
+    Clonage de fichiers et d'arborescences entre espaces de travail
+
+    Modes:
+    - auto: reflink si supporté (sondé une fois par couple de volumes), sinon
+      hardlink pour les fichiers immuables et copie pour les autres
+    - reflink / hardlink / copy: forcer un mode (reflink et hardlink retombent
+      sur la copie quand ils sont impossibles ou non sûrs)
+
+    Un hardlink partage l'inode: il n'est utilisé que pour des fichiers qu'aucune
+    phase ne modifie (node_modules). Les fichiers que les agents ou l'auto-fix
+    peuvent éditer sont reflinkés ou copiés.
+    """
+
+    def __init__(self, mode: str = "auto"):
+        if mode not in CLONE_MODES:
+            raise ValueError(f"Mode de clonage inconnu: {mode}")
+        self.mode = mode
+        # (st_dev source, st_dev destination) -> reflink supporté
+        self._reflink_support: Dict[Tuple[int, int], bool] = {}
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def clone_tree(self, source: str, target: str, immutable: bool = False,
+                   kind: str = "workspace", replaces_ms: Optional[int] = None) -> CloneResult:
+        """
+        Réplique une arborescence (symlinks recréés tels quels, fichiers clonés)
+
+        Args:
+            source: Dossier de base
+            target: Dossier à créer (doit ne pas exister ou être vide)
+            immutable: Les fichiers ne seront jamais modifiés en place (hardlink autorisé)
+            kind: Catégorie des statistiques (dependencies, skeleton, ...)
+            replaces_ms: Durée de l'opération que le clonage remplace (gain de temps rapporté)
+        """
+        started = time.perf_counter()
+        result = CloneResult()
+        for root, dirs, files in os.walk(source):
+            relative = os.path.relpath(root, source)
+            destination = os.path.join(target, relative) if relative != "." else target
+            os.makedirs(destination, exist_ok=True)
+
+            for name in list(dirs):
+                if os.path.islink(os.path.join(root, name)):
+                    os.symlink(os.readlink(os.path.join(root, name)), os.path.join(destination, name))
+                    result.symlinks += 1
+                    dirs.remove(name)
+            for name in files:
+                self._clone_entry(os.path.join(root, name), os.path.join(destination, name), immutable, result)
+
+        return self._finish(result, started, kind, replaces_ms, target)
+
+    def clone_files(self, source: str, target: str, paths: Iterable[str], immutable: bool = False,
+                    kind: str = "workspace", replaces_ms: Optional[int] = None) -> CloneResult:
+        """
+        Clone une liste de fichiers d'un espace de base vers un site (fichiers existants remplacés)
+
+        Args:
+            source: Dossier de base
+            target: Répertoire du site
+            paths: Chemins relatifs à cloner
+            immutable, kind, replaces_ms: Voir clone_tree
+        """
+        started = time.perf_counter()
+        result = CloneResult()
+        for relative_path in paths:
+            destination = os.path.join(target, relative_path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if os.path.lexists(destination):
+                os.unlink(destination)
+            self._clone_entry(os.path.join(source, relative_path), destination, immutable, result)
+
+        return self._finish(result, started, kind, replaces_ms, target)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Totaux par catégorie depuis le démarrage: clonages, fichiers, octets, économies"""
+        with self._lock:
+            return {kind: dict(totals) for kind, totals in self._totals.items()}
+
+    def _clone_entry(self, source: str, target: str, immutable: bool, result: CloneResult):
+        if os.path.islink(source):
+            os.symlink(os.readlink(source), target)
+            result.symlinks += 1
+            return
+
+        size = os.path.getsize(source)
+        method = self._clone_file(source, target, immutable)
+        result.files += 1
+        result.bytes += size
+        if method == "reflink":
+            result.reflinked += 1
+        elif method == "hardlink":
+            result.hardlinked += 1
+        else:
+            result.copied += 1
+        if method != "copy":
+            result.bytes_shared += size
+
+    def _clone_file(self, source: str, target: str, immutable: bool) -> str:
+        """Clone un fichier; retourne la méthode utilisée (reflink, hardlink ou copy)"""
+        if self.mode in ("auto", "reflink") and self._try_reflink(source, target):
+            return "reflink"
+        if immutable and self.mode in ("auto", "hardlink"):
+            try:
+                os.link(source, target)
+                return "hardlink"
+            except OSError:
+                pass
+        shutil.copy2(source, target)
+        return "copy"
+
+    def _try_reflink(self, source: str, target: str) -> bool:
+        """Reflink si le couple de volumes le supporte (un échec désactive le couple)"""
+        try:
+            import fcntl
+        except ImportError:
+            return False
+
+        devices = (os.stat(source).st_dev, os.stat(os.path.dirname(target)).st_dev)
+        if self._reflink_support.get(devices) is False:
+            return False
+
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                self._reflink_support[devices] = True
+                return True
+            except OSError:
+                pass
+        os.unlink(target)
+        if devices not in self._reflink_support:
+            logger.info(f"Reflink non supporté entre volumes {devices}: hardlink/copie")
+        self._reflink_support[devices] = False
+        return False
+
+    def _finish(self, result: CloneResult, started: float, kind: str,
+                replaces_ms: Optional[int], target: str) -> CloneResult:
+        result.duration_ms = int((time.perf_counter() - started) * 1000)
+        if replaces_ms is not None:
+            result.saved_ms = max(0, replaces_ms - result.duration_ms)
+
+        with self._lock:
+            totals = self._totals.setdefault(kind, {
+                "clones": 0, "files": 0, "bytes": 0, "bytes_shared": 0, "duration_ms": 0, "saved_ms": 0
+            })
+            totals["clones"] += 1
+            totals["files"] += result.files
+            totals["bytes"] += result.bytes
+            totals["bytes_shared"] += result.bytes_shared
+            totals["duration_ms"] += result.duration_ms
+            totals["saved_ms"] += result.saved_ms
+
+        WORKSPACE_BYTES.inc(kind, "shared", amount=result.bytes_shared)
+        WORKSPACE_BYTES.inc(kind, "copied", amount=result.bytes - result.bytes_shared)
+        WORKSPACE_TIME_SAVED.inc(kind, amount=result.saved_ms / 1000)
+
+        logger.info(
+            f"Workspace {kind} → {target}: {result.files} fichiers ({result.mode}), "
+            f"{result.bytes_shared / 1e6:.1f}/{result.bytes / 1e6:.1f} Mo partagés, "
+            f"{result.duration_ms} ms" + (f", {result.saved_ms} ms économisées" if replaces_ms is not None else "")
+        )
+        return result
+
+
+# Singleton instance
+workspace_manager = WorkspaceManager(settings.workspace_clone_mode)
@@ -0,0 +1,3 @@
+"""
+Tools - Outils en ligne de commande (analyses hors-ligne, CI)
+"""
@@ -0,0 +1,262 @@
+"""
+Prompt Budget - Taille en tokens des prompts des agents modulaires
+Rend le prompt de chaque agent pour un corpus d'entreprises et rapporte les
+tokens statiques (instructions du system prompt, communes à tous les jobs) et
+dynamiques (DONNÉES DU PROJET), la part statique et les plus grandes sections.
+Code de sortie 1 si un budget est dépassé (garde-fou CI contre l'inflation
+des prompts, qui ralentit chaque génération)
+
+Usage:
+    python -m app.tools.prompt_budget
+    python -m app.tools.prompt_budget --corpus businesses.json --budget PageAgent=9000 --budget total=40000
+    python -m app.tools.prompt_budget --exact --json
+
+Budgets (tokens par job, max sur le corpus): settings.prompt_token_budgets,
+complétés ou remplacés par --budget AGENT=TOKENS ("total" = les 5 agents)
+"""
+import argparse
+import json
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.agents.modular import SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent
+from app.core.config import get_settings
+
+settings = get_settings()
+
+AGENTS = (SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent)
+
+# Corpus par défaut: cas nominal, données longues (noms, services), champs minimaux
+DEFAULT_CORPUS: List[Dict[str, Any]] = [
+    {
+        "name": "Test Plomberie", "location": "Luxembourg", "phone": "661234567", "email": "test@plomberie.lu",
+        "year": 2020, "services": "Depannage urgence, Installation sanitaire, Reparation fuites",
+        "positioning": "Expert plomberie 24h/7j a Luxembourg", "street": "1 rue Test", "postal_code": "L-1234",
+        "city": "Luxembourg", "country": "Luxembourg", "hours": "Lundi-Vendredi 8h-18h",
+        "primary_color": "#1a5490", "secondary_color": "#ff8c42", "domain_url": None,
+    },
+    {
+        "name": "Entreprise Générale de Rénovation et d'Isolation Thermique Dupont & Fils", "location": "Esch",
+        "phone": "+352 26 12 34 56", "email": "contact@renovation-dupont-et-fils.lu", "year": 1987,
+        "services": "Rénovation complète, Isolation thermique par l'extérieur, Toiture et zinguerie, "
+                    "Menuiserie sur mesure, Plâtrerie, Peinture intérieure et extérieure, Carrelage",
+        "positioning": "Trois générations d'artisans au service de votre confort, devis gratuit sous 48h "
+                       "et chantiers livrés dans les délais",
+        "street": "127 boulevard Charles de Gaulle", "postal_code": "L-4011", "city": "Esch-sur-Alzette",
+        "country": "Luxembourg", "hours": "Lundi-Vendredi 7h30-18h30, Samedi 8h-12h",
+        "primary_color": "#2d4a22", "secondary_color": "#d97706", "domain_url": "https://www.renovation-dupont.lu",
+    },
+    {
+        "name": "AB", "phone": "1", "email": "a@b.lu", "year": 2024, "services": "Conseil",
+        "positioning": "", "street": "", "postal_code": "", "city": "Metz",
+    },
+]
+
+# Bandeau de section des prompts: titre encadré de deux lignes ═══
+_SECTION_RE = re.compile(r"^═{10,}\n(?P<title>[^\n]+)\n═{10,}$", re.MULTILINE)
+
+# Approximation d'un tokenizer BPE: mots, nombres, espaces, symboles et répétitions de symbole
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[ \t]+|\n+|([^\w\s])\1*")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimation hors-ligne du nombre de tokens (±15% sur ces prompts)
+
+    - mot ASCII: 1 token par tranche de 6 caractères, mot accentué: par tranche de 3
+    - nombre: 1 token par tranche de 3 chiffres
+    - espace simple: fusionné avec le mot suivant, indentation: 1 token par 4 espaces
+    - saut(s) de ligne: 1 token
+    - symbole répété (═══, ---): 1 token par tranche de 4, emoji: 2 tokens
+    """
+    tokens = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group()
+        if piece[0] in " \t":
+            tokens += len(piece) // 4
+        elif piece[0] == "\n":
+            tokens += 1
+        elif piece[0].isdigit():
+            tokens += 1 + (len(piece) - 1) // 3
+        elif piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // (6 if piece.isascii() else 3)
+        elif ord(piece[0]) > 0xFFFF:
+            tokens += 2 * len(piece)
+        else:
+            tokens += 1 + (len(piece) - 1) // 4
+    return tokens
+
+
+def exact_counter(model: str) -> Callable[[str], int]:
+    """
+    Compteur exact via l'API Anthropic (messages.count_tokens, nécessite ANTHROPIC_API_KEY)
+
+    Le texte est compté comme unique message utilisateur, déduction faite du
+    coût fixe d'un message minimal. Résultats mis en cache par texte.
+    """
+    from anthropic import Anthropic
+
+    client = Anthropic(api_key=settings.anthropic_api_key or None, max_retries=settings.anthropic_max_retries)
+
+    def count_message(text: str) -> int:
+        return client.messages.count_tokens(model=model, messages=[{"role": "user", "content": text}]).input_tokens
+
+    # Coût fixe d'un message ("." compte pour un token)
+    overhead = count_message(".") - 1
+    cache: Dict[str, int] = {}
+
+    def count(text: str) -> int:
+        if not text.strip():
+            return 0
+        if text not in cache:
+            cache[text] = count_message(text) - overhead
+        return cache[text]
+
+    return count
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Découpe des instructions par bandeau ═══ (le texte avant le premier bandeau: "Introduction")"""
+    sections: List[Tuple[str, str]] = []
+    title, start = "Introduction", 0
+    for match in _SECTION_RE.finditer(text):
+        sections.append((title, text[start:match.start()]))
+        title, start = match.group("title").strip(), match.start()
+    sections.append((title, text[start:]))
+    return [(title, body) for title, body in sections if body.strip()]
+
+
+def analyze(corpus: List[Dict[str, Any]], count: Callable[[str], int], top: int = 10) -> Dict[str, Any]:
+    """
+    Tokens de chaque agent pour chaque entreprise du corpus
+
+    Returns:
+        {"agents": {agent: {static, dynamic_min, dynamic_max, total_max, static_share}},
+         "total_max", "sections": plus grandes sections, "corpus": taille}
+    """
+    agents: Dict[str, Dict[str, Any]] = {}
+    sections: List[Dict[str, Any]] = []
+    per_business = [0] * len(corpus)
+
+    for agent in AGENTS:
+        instructions = agent.PROMPT.instructions
+        static = count(instructions)
+
+        dynamic = []
+        for index, business in enumerate(corpus):
+            site_slug = f"{business.get('name', '').lower().replace(' ', '-')}-{business.get('city', '').lower()}"
+            slots = agent.get_slots(business, site_slug, f"{settings.output_dir}/{site_slug}")
+            tokens = count(agent.PROMPT.data_block(**slots))
+            dynamic.append(tokens)
+            per_business[index] += static + tokens
+
+        agents[agent.__name__] = {
+            "static": static,
+            "dynamic_min": min(dynamic),
+            "dynamic_max": max(dynamic),
+            "total_max": static + max(dynamic),
+            "static_share": round(static / (static + max(dynamic)), 3),
+        }
+        for title, body in split_sections(instructions):
+            tokens = count(body)
+            sections.append({
+                "agent": agent.__name__,
+                "section": title,
+                "tokens": tokens,
+                "share": round(tokens / static, 3) if static else 0.0,
+            })
+
+    sections.sort(key=lambda section: section["tokens"], reverse=True)
+    return {
+        "corpus": len(corpus),
+        "agents": agents,
+        "total_max": max(per_business),
+        "sections": sections[:top],
+    }
+
+
+def check_budgets(report: Dict[str, Any], budgets: Dict[str, int]) -> List[str]:
+    """Dépassements de budget ("total" = somme des agents pour une même entreprise)"""
+    violations = []
+    for name, budget in budgets.items():
+        if name == "total":
+            used = report["total_max"]
+        elif name in report["agents"]:
+            used = report["agents"][name]["total_max"]
+        else:
+            violations.append(f"{name}: agent inconnu (budget {budget})")
+            continue
+        if used > budget:
+            violations.append(f"{name}: {used} tokens > budget {budget} (+{used - budget})")
+    return violations
+
+
+def parse_budget(value: str) -> Tuple[str, int]:
+    """AGENT=TOKENS"""
+    name, _, tokens = value.partition("=")
+    try:
+        return name.strip(), int(tokens)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Budget invalide: {value!r} (attendu AGENT=TOKENS)")
+
+
+def print_report(report: Dict[str, Any], budgets: Dict[str, int], violations: List[str], method: str):
+    print(f"Prompts des agents - {report['corpus']} entreprise(s), tokens {method}")
+    print()
+    print(f"{'agent':<16}{'statique':>10}{'dynamique':>16}{'total max':>11}{'% statique':>12}{'budget':>9}")
+    for name, row in report["agents"].items():
+        dynamic = f"{row['dynamic_min']}-{row['dynamic_max']}"
+        budget = budgets.get(name, "-")
+        print(f"{name:<16}{row['static']:>10}{dynamic:>16}{row['total_max']:>11}"
+              f"{row['static_share'] * 100:>11.1f}%{budget:>9}")
+    print(f"{'total / job':<16}{'':>10}{'':>16}{report['total_max']:>11}{'':>12}{budgets.get('total', '-'):>9}")
+
+    print()
+    print("Plus grandes sections:")
+    for section in report["sections"]:
+        print(f"  {section['tokens']:>6}  {section['share'] * 100:>5.1f}%  {section['agent']:<16}{section['section']}")
+
+    print()
+    if violations:
+        print("BUDGET DÉPASSÉ:")
+        for violation in violations:
+            print(f"  - {violation}")
+    else:
+        print("Budgets respectés" if budgets else "Aucun budget configuré")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Taille en tokens des prompts des agents modulaires")
+    parser.add_argument("--corpus", help="Fichier JSON d'entreprises (objet ou liste; défaut: corpus intégré)")
+    parser.add_argument("--budget", action="append", type=parse_budget, default=[], metavar="AGENT=TOKENS",
+                        help="Budget max par job (répétable; remplace settings.prompt_token_budgets)")
+    parser.add_argument("--exact", action="store_true", help="Comptage exact via l'API (messages.count_tokens)")
+    parser.add_argument("--model", default=settings.agent_model, help="Modèle du comptage exact")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de sections listées")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    corpus = DEFAULT_CORPUS
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            data = json.load(f)
+        corpus = data if isinstance(data, list) else [data]
+
+    budgets = {**settings.prompt_token_budgets, **dict(args.budget)}
+    count = exact_counter(args.model) if args.exact else estimate_tokens
+    method = "exacts" if args.exact else "estimés"
+
+    report = analyze(corpus, count, top=args.top)
+    violations = check_budgets(report, budgets)
+
+    if args.json:
+        print(json.dumps({**report, "method": method, "budgets": budgets, "violations": violations},
+                         indent=2, ensure_ascii=False))
+    else:
+        print_report(report, budgets, violations, method)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
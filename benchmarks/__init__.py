@@ -0,0 +1,4 @@
+"""
+Benchmarks - Mesures hors-ligne du pipeline de génération
+Rejoue des transcripts Claude enregistrés (ou synthétiques) à la place du CLI
+"""
@@ -0,0 +1,156 @@
+"""
+Microbenchmark de construction des prompts des 5 agents modulaires
+
+Mesure, pour N jobs aux données business toutes différentes: temps de
+get_prompt (prompt complet) et du message envoyé par job dans la disposition
+cache de prompt (DONNÉES DU PROJET seules, les instructions étant dans le system
+prompt), avec la mémoire allouée (tracemalloc), comparés à une f-string
+substituant les valeurs dans tout le corps à chaque appel (construction avant
+les templates précompilés).
+
+Usage:
+    python -m benchmarks.prompts --jobs 500
+    python -m benchmarks.prompts --jobs 2000 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+
+def make_businesses(base: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+    """Variantes de base (nom, ville, services) pour éviter tout effet de cache"""
+    return [
+        {
+            **base,
+            "name": f"{base['name']} {index}",
+            "city": f"{base['city']}-{index % 37}",
+            "services": ", ".join(f"{service.strip()} {index}" for service in base["services"].split(",")),
+        }
+        for index in range(count)
+    ]
+
+
+def fstring_builder(template) -> Callable[..., str]:
+    """f-string équivalente au template (construction de tout le corps à chaque appel)"""
+    source = template.source.replace("\\", "\\\\")
+    names = sorted(template.slots)
+    return eval(f'lambda {", ".join(names)}: f"""{source}"""')
+
+
+def summarize_us(values: List[float]) -> Dict[str, float]:
+    from app.services.phase_metrics import percentile
+
+    return {
+        "mean_us": round(statistics.fmean(values), 1),
+        "p50_us": round(percentile(values, 50), 1),
+        "p95_us": round(percentile(values, 95), 1),
+    }
+
+
+def measure(build: Callable[[], str]) -> Dict[str, float]:
+    """Durée (µs, hors tracemalloc) et pic de mémoire allouée (octets) d'une construction"""
+    start = time.perf_counter()
+    build()
+    elapsed = (time.perf_counter() - start) * 1e6
+
+    tracemalloc.start()
+    try:
+        build()
+        allocated = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"us": elapsed, "bytes": allocated}
+
+
+def bench_agent(agent, businesses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    legacy = fstring_builder(agent.PROMPT)
+    template = agent.PROMPT
+
+    prompt_us, data_us, data_bytes, fstring_us, fstring_bytes = [], [], [], [], []
+    sizes = []
+    for index, business in enumerate(businesses):
+        site_slug = f"bench-{index}"
+        site_dir = f"/tmp/sites/{site_slug}"
+
+        prompt_us.append(measure(lambda: agent.get_prompt(business, site_slug, site_dir))["us"])
+
+        values = agent.get_slots(business, site_slug, site_dir)
+
+        # Mêmes valeurs de slots: message par job vs corps entier substitué
+        result = measure(lambda: template.data_block(**values))
+        data_us.append(result["us"])
+        data_bytes.append(result["bytes"])
+        result = measure(lambda: legacy(**values))
+        fstring_us.append(result["us"])
+        fstring_bytes.append(result["bytes"])
+
+        sizes.append(len(template.data_block(**values)))
+
+    return {
+        "static_chars": template.static_size,
+        "data_chars": round(statistics.fmean(sizes)),
+        "slots": len(template.slots),
+        "get_prompt": summarize_us(prompt_us),
+        "data_block": {**summarize_us(data_us), "alloc_kb": round(statistics.fmean(data_bytes) / 1024, 1)},
+        "fstring": {**summarize_us(fstring_us), "alloc_kb": round(statistics.fmean(fstring_bytes) / 1024, 1)},
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"Construction des prompts - {report['jobs']} jobs")
+    print()
+    print(f"{'agent':<16}{'statique':>9}{'données':>9}{'slots':>7}{'get_prompt p50':>16}"
+          f"{'données p50':>13}{'p95':>9}{'alloc':>10}{'f-string p50':>14}{'p95':>9}{'alloc':>10}")
+    for name, row in report["agents"].items():
+        data, fstring = row["data_block"], row["fstring"]
+        print(f"{name:<16}{row['static_chars']:>9}{row['data_chars']:>9}{row['slots']:>7}"
+              f"{row['get_prompt']['p50_us']:>13.1f} µs"
+              f"{data['p50_us']:>10.1f} µs{data['p95_us']:>6.1f} µs{data['alloc_kb']:>7.1f} KB"
+              f"{fstring['p50_us']:>11.1f} µs{fstring['p95_us']:>6.1f} µs{fstring['alloc_kb']:>7.1f} KB")
+    print()
+    per_job = report["per_job_us"]
+    print(f"Total par job (5 prompts): get_prompt {per_job['get_prompt']} µs, "
+          f"DONNÉES DU PROJET {per_job['data_block']} µs, f-string {per_job['fstring']} µs")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmark de construction des prompts")
+    parser.add_argument("--jobs", type=int, default=500, help="Nombre de jobs simulés")
+    parser.add_argument("--payload", default=os.path.join(os.path.dirname(__file__), "..", "test_payload.json"),
+                        help="Fichier JSON des données business")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    from app.agents.modular import SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent
+
+    with open(args.payload, encoding="utf-8") as f:
+        businesses = make_businesses(json.load(f), args.jobs)
+
+    agents = {
+        agent.__name__: bench_agent(agent, businesses)
+        for agent in (SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent)
+    }
+
+    report = {
+        "jobs": args.jobs,
+        "agents": agents,
+        "per_job_us": {
+            variant: round(sum(row[variant]["mean_us"] for row in agents.values()), 1)
+            for variant in ("get_prompt", "data_block", "fstring")
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
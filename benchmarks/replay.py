@@ -0,0 +1,410 @@
+"""
+Replay - Faux ClaudeSDKClient rejouant des transcripts enregistrés
+Un transcript contient les messages d'une session et les fichiers écrits, avec
+leurs instants relatifs: le rejeu reproduit le timing réel sans appel réseau.
+
+Format d'un transcript (JSON):
+    {
+        "phase": "setup",
+        "match": "Tu es l'agent Setup",      # sous-chaîne identifiant les instructions de l'agent
+        "startup_ms": 1500,                   # démarrage du process CLI
+        "events": [
+            {"t": 0.8, "kind": "message", "message": {"type": "AssistantMessage", ...}},
+            {"t": 0.9, "kind": "write", "path": "tailwind.config.js", "content": "..."}
+        ]
+    }
+
+Enregistrement d'une vraie génération:
+    session_pool.client_factory = lambda options: RecordingClaudeClient(options, "transcripts/")
+"""
+import asyncio
+import dataclasses
+import json
+import os
+import time
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from claude_agent_sdk import (
+    ClaudeSDKClient, ClaudeAgentOptions,
+    AssistantMessage, UserMessage, SystemMessage, ResultMessage,
+    TextBlock, ThinkingBlock, ToolUseBlock, ToolResultBlock
+)
+
+from app.agents.modular import SetupAgent, ComponentAgent, SectionAgent, PageAgent, ContentAgent
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_TYPES = {
+    cls.__name__: cls
+    for cls in (AssistantMessage, UserMessage, SystemMessage, ResultMessage,
+                TextBlock, ThinkingBlock, ToolUseBlock, ToolResultBlock)
+}
+
+# Début des instructions propres à chaque agent (system prompt, options.system_prompt["append"]) -> phase
+PHASE_MARKERS = {
+    "setup": "Tu es l'agent Setup",
+    "components": "Tu es l'agent Component",
+    "sections": "Tu es l'agent Section",
+    "pages": "Tu es l'agent Page",
+    "content": "Tu es l'agent Content",
+}
+
+PHASE_AGENTS = {
+    "setup": SetupAgent,
+    "components": ComponentAgent,
+    "sections": SectionAgent,
+    "pages": PageAgent,
+    "content": ContentAgent,
+}
+
+# Durées typiques observées d'une session par phase (secondes) pour les transcripts synthétiques
+SYNTHETIC_DURATIONS = {
+    "setup": 40.0,
+    "components": 80.0,
+    "sections": 110.0,
+    "pages": 140.0,
+    "content": 70.0,
+}
+SYNTHETIC_STARTUP_MS = 1500
+
+# Dossiers ignorés lors de la détection des fichiers modifiés par une session
+_IGNORED_DIRS = {"node_modules", ".next", ".git"}
+
+
+def encode_message(obj: Any) -> Any:
+    """Sérialise un message SDK (dataclasses imbriquées) en JSON typé"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        encoded = {"type": type(obj).__name__}
+        for field in dataclasses.fields(obj):
+            encoded[field.name] = encode_message(getattr(obj, field.name))
+        return encoded
+    if isinstance(obj, list):
+        return [encode_message(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: encode_message(value) for key, value in obj.items()}
+    return obj
+
+
+def decode_message(data: Any) -> Any:
+    """Reconstruit un message SDK depuis sa forme JSON typée"""
+    if isinstance(data, list):
+        return [decode_message(item) for item in data]
+    if isinstance(data, dict):
+        cls = MESSAGE_TYPES.get(data.get("type"))
+        if cls is not None:
+            return cls(**{key: decode_message(value) for key, value in data.items() if key != "type"})
+        return {key: decode_message(value) for key, value in data.items()}
+    return data
+
+
+def session_instructions(options: ClaudeAgentOptions, prompt: str = "") -> str:
+    """
+    Texte identifiant une session: instructions de l'agent (ajoutées au system
+    prompt) suivies du prompt, qui ne contient plus que les DONNÉES DU PROJET
+    """
+    system_prompt = options.system_prompt
+    if isinstance(system_prompt, dict):
+        system_prompt = system_prompt.get("append", "")
+    return f"{system_prompt or ''}\n{prompt}"
+
+
+def phase_for_prompt(text: str, transcripts: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Phase correspondant au texte d'une session ("unknown" si aucun marqueur ne correspond)"""
+    candidates = [(t["phase"], t["match"]) for t in transcripts.values()] if transcripts else PHASE_MARKERS.items()
+    for phase, marker in candidates:
+        if marker and marker in text:
+            return phase
+    return "unknown"
+
+
+def load_transcripts(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Charge les transcripts d'un dossier (le plus récent l'emporte pour une même phase)"""
+    transcripts = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                transcript = json.load(f)
+            transcripts[transcript["phase"]] = transcript
+    return transcripts
+
+
+def _synthetic_content(path: str, siblings: List[str]) -> str:
+    """Contenu minimal mais valide pour un fichier produit par une phase"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith("index.ts"):
+        directory = os.path.dirname(path)
+        exports = [
+            os.path.splitext(os.path.basename(sibling))[0]
+            for sibling in siblings
+            if os.path.dirname(sibling) == directory and sibling.endswith(".tsx")
+        ]
+        return "".join(f"export * from './{export}'\n" for export in exports)
+    if path.endswith("route.ts"):
+        return "export async function POST() {\n  return Response.json({ ok: true })\n}\n"
+    if path.endswith("utils.ts"):
+        return "export function cn(...classes: string[]) {\n  return classes.filter(Boolean).join(' ')\n}\n"
+    if path.endswith(".tsx"):
+        component = name if name[:1].isupper() else "Page"
+        return f"export function {component}() {{\n  return null\n}}\n\nexport default {component}\n"
+    if path.endswith(".css"):
+        return "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+    if path.endswith(".js"):
+        return "module.exports = {}\n"
+    if path.endswith(".mjs"):
+        return "export default {}\n"
+    if path.endswith(".md"):
+        return "# Site\n"
+    return ""
+
+
+def synthetic_transcripts(durations: Optional[Dict[str, float]] = None,
+                          startup_ms: int = SYNTHETIC_STARTUP_MS) -> Dict[str, Dict[str, Any]]:
+    """
+    Transcripts générés depuis les OUTPUTS des agents, sans enregistrement préalable
+
+    Chaque fichier est écrit via un tool_use Write réparti uniformément sur la
+    durée de la phase, puis la session se termine par un ResultMessage.
+    """
+    durations = {**SYNTHETIC_DURATIONS, **(durations or {})}
+    transcripts = {}
+
+    for phase, agent_class in PHASE_AGENTS.items():
+        duration = durations[phase]
+        outputs = agent_class.OUTPUTS
+        step = duration / (len(outputs) + 1)
+        events = []
+
+        for index, path in enumerate(outputs):
+            t = round(step * (index + 1), 3)
+            content = _synthetic_content(path, outputs)
+            tool_id = f"toolu_{phase}_{index}"
+            events.append({"t": t, "kind": "message", "message": encode_message(AssistantMessage(
+                content=[ToolUseBlock(id=tool_id, name="Write", input={"file_path": path, "content": content})],
+                model="replay"
+            ))})
+            events.append({"t": t, "kind": "write", "path": path, "content": content})
+            events.append({"t": t, "kind": "message", "message": encode_message(UserMessage(
+                content=[ToolResultBlock(tool_use_id=tool_id, content="File created successfully")]
+            ))})
+
+        events.append({"t": duration, "kind": "message", "message": encode_message(ResultMessage(
+            subtype="success",
+            duration_ms=int(duration * 1000),
+            duration_api_ms=int(duration * 900),
+            is_error=False,
+            num_turns=len(outputs) + 1,
+            session_id=f"replay-{phase}",
+            total_cost_usd=round(0.02 * len(outputs), 4),
+            usage={"input_tokens": 4000 * len(outputs), "output_tokens": 900 * len(outputs),
+                   "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0},
+            result=f"Phase {phase} terminée"
+        ))})
+
+        transcripts[phase] = {
+            "phase": phase,
+            "match": PHASE_MARKERS[phase],
+            "startup_ms": startup_ms,
+            "events": events,
+        }
+
+    return transcripts
+
+
+class ReplayStats:
+    """Durées de session relevées pendant le rejeu, par phase"""
+
+    def __init__(self):
+        self.sessions: Dict[str, List[float]] = defaultdict(list)
+        self.startups: List[float] = []
+
+    def record_session(self, phase: str, duration_ms: float):
+        self.sessions[phase].append(duration_ms)
+
+    def record_startup(self, duration_ms: float):
+        self.startups.append(duration_ms)
+
+
+class ReplayClaudeClient:
+    """
+    Remplaçant de ClaudeSDKClient qui rejoue un transcript
+
+    Les délais du transcript sont multipliés par time_scale (0.01 = 100x plus
+    rapide); les écritures de fichiers sont faites pour de vrai dans options.cwd.
+    """
+
+    def __init__(self, options: ClaudeAgentOptions, transcripts: Dict[str, Dict[str, Any]],
+                 time_scale: float = 1.0, stats: Optional[ReplayStats] = None):
+        self.options = options
+        self.transcripts = transcripts
+        self.time_scale = time_scale
+        self.stats = stats or ReplayStats()
+        self._pending: List[Tuple[str, Dict[str, Any], float]] = []
+
+    async def connect(self, prompt: Optional[str] = None):
+        startup_ms = max((t.get("startup_ms", 0) for t in self.transcripts.values()), default=0)
+        started = time.perf_counter()
+        await asyncio.sleep(startup_ms / 1000 * self.time_scale)
+        self.stats.record_startup((time.perf_counter() - started) * 1000)
+
+    async def disconnect(self):
+        self._pending.clear()
+
+    async def interrupt(self):
+        self._pending.clear()
+
+    async def query(self, prompt: str, session_id: str = "default"):
+        """
+        Raises:
+            Exception: Aucun transcript ne correspond à la session (un rejeu vide
+                       fausserait les mesures sans faire échouer le benchmark)
+        """
+        text = session_instructions(self.options, prompt)
+        phase = phase_for_prompt(text, self.transcripts)
+        if phase not in self.transcripts:
+            first_line = text.strip().splitlines()[0] if text.strip() else ""
+            raise Exception(f"Rejeu: aucun transcript pour la session ({first_line[:80]!r})")
+        self._pending.append((phase, self.transcripts[phase], time.perf_counter()))
+
+    async def receive_response(self):
+        """Rejoue le transcript de la dernière requête jusqu'au ResultMessage"""
+        phase, transcript, started = self._pending.pop(0)
+        cwd = str(self.options.cwd or ".")
+
+        for event in transcript["events"]:
+            delay = started + event["t"] * self.time_scale - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if event["kind"] == "write":
+                path = os.path.join(cwd, event["path"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(event["content"])
+                continue
+
+            message = decode_message(event["message"])
+            yield message
+            if isinstance(message, ResultMessage):
+                break
+
+        self.stats.record_session(phase, (time.perf_counter() - started) * 1000)
+
+    receive_messages = receive_response
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+        return False
+
+
+class ReplayClientFactory:
+    """Fabrique à brancher sur session_pool.client_factory"""
+
+    def __init__(self, transcripts: Dict[str, Dict[str, Any]], time_scale: float = 1.0):
+        self.transcripts = transcripts
+        self.time_scale = time_scale
+        self.stats = ReplayStats()
+
+    def __call__(self, options: ClaudeAgentOptions) -> ReplayClaudeClient:
+        return ReplayClaudeClient(options, self.transcripts, self.time_scale, self.stats)
+
+
+class RecordingClaudeClient:
+    """
+    ClaudeSDKClient qui enregistre chaque session sous forme de transcript
+
+    Les écritures via l'outil Write sont capturées à leur instant; les autres
+    modifications (Edit, Bash) sont relevées par comparaison du dossier en fin de session.
+    """
+
+    def __init__(self, options: ClaudeAgentOptions, output_dir: str):
+        self.options = options
+        self.output_dir = output_dir
+        self._client = ClaudeSDKClient(options=options)
+        self._startup_ms = 0
+        self._prompt = ""
+        self._started = 0.0
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+
+    async def connect(self, prompt: Optional[str] = None):
+        started = time.perf_counter()
+        await self._client.connect(prompt)
+        self._startup_ms = int((time.perf_counter() - started) * 1000)
+
+    async def disconnect(self):
+        await self._client.disconnect()
+
+    async def interrupt(self):
+        await self._client.interrupt()
+
+    async def query(self, prompt: str, session_id: str = "default"):
+        self._prompt = prompt
+        self._snapshot = self._scan()
+        self._started = time.perf_counter()
+        await self._client.query(prompt, session_id)
+
+    async def receive_response(self):
+        events = []
+        written = set()
+
+        async for message in self._client.receive_response():
+            t = round(time.perf_counter() - self._started, 3)
+            events.append({"t": t, "kind": "message", "message": encode_message(message)})
+            for block in getattr(message, "content", None) or []:
+                if isinstance(block, ToolUseBlock) and block.name == "Write" and "file_path" in block.input:
+                    path = os.path.relpath(os.path.join(str(self.options.cwd or "."), block.input["file_path"]),
+                                           str(self.options.cwd or "."))
+                    events.append({"t": t, "kind": "write", "path": path, "content": block.input.get("content", "")})
+                    written.add(path)
+            yield message
+
+        end = round(time.perf_counter() - self._started, 3)
+        cwd = str(self.options.cwd or ".")
+        for path, signature in self._scan().items():
+            if path not in written and self._snapshot.get(path) != signature:
+                with open(os.path.join(cwd, path), encoding="utf-8", errors="replace") as f:
+                    events.insert(-1, {"t": end, "kind": "write", "path": path, "content": f.read()})
+
+        self._save(events)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+        return False
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        cwd = str(self.options.cwd or ".")
+        files = {}
+        for root, dirs, names in os.walk(cwd):
+            dirs[:] = [d for d in dirs if d not in _IGNORED_DIRS]
+            for name in names:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                files[os.path.relpath(path, cwd)] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _save(self, events: List[Dict[str, Any]]):
+        phase = phase_for_prompt(session_instructions(self.options, self._prompt))
+        if phase == "unknown":
+            # Un transcript sans phase ne serait jamais rejoué
+            logger.error("Transcript non enregistré: aucune phase ne correspond aux instructions de la session")
+            return
+        transcript = {
+            "phase": phase,
+            "match": PHASE_MARKERS[phase],
+            "startup_ms": self._startup_ms,
+            "events": events,
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{int(time.time() * 1000)}-{phase}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(transcript, f, ensure_ascii=False, indent=1)
+        logger.info(f"Transcript {phase} enregistré: {path}")
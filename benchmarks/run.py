@@ -0,0 +1,215 @@
+"""
+Benchmark end-to-end du pipeline de génération (hors-ligne)
+
+Rejoue des transcripts Claude à la place du CLI et mesure, pour N jobs à une
+concurrence donnée: latence par phase, temps total, RSS max et jobs/heure.
+
+Usage:
+    python -m benchmarks.run --jobs 8 --concurrency 4 --time-scale 0.01
+    python -m benchmarks.run --transcripts transcripts/ --time-scale 1 --json
+
+Portées:
+    generation  Phases 1-5 en DAG (boilerplate, dépendances, agents) - défaut
+    full        run_generation_workflow complet (validation, GitHub, Vercel)
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    from app.services.phase_metrics import percentile
+
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values), 1),
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+def configure_environment(workdir: str, args: argparse.Namespace):
+    """Paramètres de l'app isolés dans workdir (à faire avant tout import de app.*)"""
+    os.environ.update({
+        "OUTPUT_DIR": os.path.join(workdir, "sites"),
+        "JOB_STORE_BACKEND": "memory",
+        "DEPENDENCY_CACHE_DIR": os.path.join(workdir, "deps"),
+        "GOLDEN_SKELETON_DIR": os.path.join(workdir, "skeletons"),
+        "MAX_CONCURRENT_JOBS": str(args.concurrency),
+        "MAX_QUEUED_JOBS": str(max(args.jobs, 1)),
+    })
+
+
+async def seed_dependency_cache(workdir: str):
+    """Pré-remplit le cache node_modules pour éviter npm install (pas de réseau en CI)"""
+    from app.services.dependency_cache import dependency_cache, COMPLETE_MARKER
+    from app.services.template_renderer import BoilerplateRenderer
+
+    probe = os.path.join(workdir, "probe")
+    os.makedirs(probe)
+    with open(os.path.join(probe, "package.json"), "w", encoding="utf-8") as f:
+        f.write(BoilerplateRenderer.render({}, "probe")["package.json"])
+
+    entry = os.path.join(dependency_cache.cache_dir, await dependency_cache.cache_key(probe))
+    os.makedirs(os.path.join(entry, "node_modules"), exist_ok=True)
+    open(os.path.join(entry, COMPLETE_MARKER), "w").close()
+    shutil.rmtree(probe)
+
+
+async def run_benchmark(args: argparse.Namespace, business_data: Dict[str, Any]) -> Dict[str, Any]:
+    from app.core.config import get_settings
+    from app.services.job_manager import job_manager, TERMINAL_STATUSES
+    from app.services.scheduler import job_scheduler
+    from app.services.session_pool import session_pool
+    from app.services.workspace import workspace_manager
+    from app.services.generator_modular import GeneratorServiceModular
+    from benchmarks.replay import ReplayClientFactory, load_transcripts, synthetic_transcripts
+
+    settings = get_settings()
+    transcripts = load_transcripts(args.transcripts) if args.transcripts else synthetic_transcripts()
+    factory = ReplayClientFactory(transcripts, time_scale=args.time_scale)
+    session_pool.client_factory = factory
+
+    async def run_generation(job_id: str, data: Dict[str, Any], site_slug: str):
+        site_dir = f"{settings.output_dir}/{site_slug}"
+        try:
+            os.makedirs(site_dir, exist_ok=True)
+            graph = GeneratorServiceModular._build_generation_graph(job_id, data, site_slug, site_dir)
+            GeneratorServiceModular._prewarm_agents(graph, site_dir, data)
+            await graph.run()
+            job_manager.update_job(job_id, "completed", 100, "Génération terminée")
+        except Exception as e:
+            job_manager.update_job(job_id, "failed", 0, f"Échec: {str(e)}", error=str(e))
+
+    run = GeneratorServiceModular.run_generation_workflow if args.scope == "full" else run_generation
+
+    await job_scheduler.start()
+    await session_pool.start()
+    started = time.perf_counter()
+
+    job_ids = []
+    for index in range(args.jobs):
+        site_slug = f"bench-{index}"
+        job_id = job_manager.create_job(site_slug)
+        job_scheduler.submit(job_id, run, job_id, dict(business_data), site_slug)
+        job_ids.append(job_id)
+
+    while any(job_manager.get_job(job_id)["status"] not in TERMINAL_STATUSES for job_id in job_ids):
+        await asyncio.sleep(0.01)
+
+    wall_time = time.perf_counter() - started
+    await job_scheduler.stop()
+    await session_pool.close()
+
+    jobs = [job_manager.get_job(job_id) for job_id in job_ids]
+    completed = sum(1 for job in jobs if job["status"] == "completed")
+    errors = sorted({job.get("error") for job in jobs if job["status"] == "failed"})
+    jobs_per_hour = completed / wall_time * 3600 if wall_time else 0.0
+
+    # Mesures par phase enregistrées sur chaque job (PhaseRun)
+    phase_durations = defaultdict(list)
+    for job in jobs:
+        for phase, metrics in (job.get("phases") or {}).items():
+            phase_durations[phase].append(metrics["duration_ms"])
+    cost_per_job = [sum(m["cost_usd"] for m in (job.get("phases") or {}).values()) for job in jobs]
+
+    return {
+        "scope": args.scope,
+        "jobs": args.jobs,
+        "concurrency": args.concurrency,
+        "time_scale": args.time_scale,
+        "transcripts": args.transcripts or "synthetic",
+        "completed": completed,
+        "failed": len(jobs) - completed,
+        "errors": errors,
+        "wall_time_s": round(wall_time, 3),
+        "jobs_per_hour": round(jobs_per_hour, 1),
+        # Estimation aux timings réels (le rejeu est accéléré de 1/time_scale)
+        "jobs_per_hour_real_timings": round(jobs_per_hour * args.time_scale, 1),
+        # ru_maxrss est en Ko sous Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cost_usd_per_job": round(statistics.fmean(cost_per_job), 4) if cost_per_job else 0.0,
+        "phases": {phase: summarize(values) for phase, values in phase_durations.items()},
+        "cli_startup": summarize(factory.stats.startups) if factory.stats.startups else None,
+        "session_pool": session_pool.stats(),
+        "workspace": workspace_manager.stats(),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"Portée: {report['scope']} | jobs: {report['jobs']} | concurrence: {report['concurrency']} "
+          f"| time-scale: {report['time_scale']} | transcripts: {report['transcripts']}")
+    print(f"Terminés: {report['completed']} | échoués: {report['failed']}")
+    for error in report["errors"]:
+        print(f"  erreur: {error}")
+    print(f"Temps total: {report['wall_time_s']} s | jobs/heure: {report['jobs_per_hour']} "
+          f"(≈ {report['jobs_per_hour_real_timings']} aux timings réels) | RSS max: {report['peak_rss_mb']} Mo")
+    print(f"Coût moyen par job: {report['cost_usd_per_job']} $")
+    print()
+    print(f"{'phase':<12}{'n':>5}{'moy ms':>12}{'p50 ms':>12}{'p95 ms':>12}{'max ms':>12}")
+    for phase, summary in report["phases"].items():
+        print(f"{phase:<12}{summary['count']:>5}{summary['mean_ms']:>12}{summary['p50_ms']:>12}"
+              f"{summary['p95_ms']:>12}{summary['max_ms']:>12}")
+    pool = report["session_pool"]
+    print()
+    print(f"Sessions CLI: {pool['cold_starts']} démarrages à froid, {pool['warm_hits']} réutilisées "
+          f"({pool['startup_ms_saved']} ms évitées)")
+    for kind, totals in report["workspace"].items():
+        print(f"Workspace {kind}: {totals['clones']} clonages, {totals['files']} fichiers, "
+              f"{totals['bytes_shared'] / 1e6:.1f}/{totals['bytes'] / 1e6:.1f} Mo partagés, "
+              f"{totals['duration_ms']} ms, {totals['saved_ms']} ms économisées")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne du pipeline de génération")
+    parser.add_argument("--jobs", type=int, default=4, help="Nombre de jobs à générer")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs exécutés simultanément")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Facteur appliqué aux délais des transcripts (1 = temps réel)")
+    parser.add_argument("--scope", choices=("generation", "full"), default="generation")
+    parser.add_argument("--transcripts", help="Dossier de transcripts enregistrés (défaut: synthétiques)")
+    parser.add_argument("--payload", default=os.path.join(os.path.dirname(__file__), "..", "test_payload.json"),
+                        help="Fichier JSON des données business")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    parser.add_argument("--keep", action="store_true", help="Conserver le dossier de travail")
+    args = parser.parse_args(argv)
+
+    with open(args.payload, encoding="utf-8") as f:
+        business_data = json.load(f)
+
+    workdir = tempfile.mkdtemp(prefix="saas-bench-")
+    configure_environment(workdir, args)
+    logging.basicConfig(level=logging.WARNING)
+
+    async def bench():
+        await seed_dependency_cache(workdir)
+        return await run_benchmark(args, business_data)
+
+    try:
+        report = asyncio.run(bench())
+    finally:
+        if args.keep:
+            print(f"Dossier de travail conservé: {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,29 +8,38 @@ import sys
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import get_settings
+from app.core.log_config import setup_logging
 from app.api.routers import router
+from app.services.job_manager import job_manager
+from app.services.scheduler import job_scheduler
+from app.services.anthropic_client import anthropic_client
+from app.services.prefill_cache import prefill_cache
+from app.services.session_pool import session_pool
+from app.services.prometheus import metrics_registry, CONTENT_TYPE
 
 # Fix asyncio event loop pour Windows (support subprocess)
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('saas_generator.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configuration du logging (asynchrone, JSON, rotation)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Jauges Prometheus lues au moment du scrape
+metrics_registry.gauge("saas_jobs_active", "Jobs en cours d'exécution",
+                       lambda: job_scheduler.stats()["running_jobs"])
+metrics_registry.gauge("saas_jobs_queued", "Jobs en file d'attente",
+                       lambda: job_scheduler.stats()["queued_jobs"])
+metrics_registry.gauge("saas_claude_cli_processes", "Process Claude Code CLI vivants (sessions du pool)",
+                       lambda: session_pool.live_sessions)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,9 +55,22 @@ async def lifespan(app: FastAPI):
     logger.info(f"GitHub Token: {'OK Configure' if settings.github_token else 'KO Manquant'}")
     logger.info(f"Vercel Token: {'OK Configure' if settings.vercel_token else 'KO Manquant'}")
 
+    await anthropic_client.start()
+    prefill_cache.load()
+    job_manager.mark_interrupted_jobs()
+    flush_task = asyncio.create_task(job_manager.flush_periodically(settings.job_store_flush_interval))
+    await session_pool.start()
+    await job_scheduler.start()
+
     yield
 
     # Shutdown
+    await job_scheduler.stop()
+    await session_pool.close()
+    flush_task.cancel()
+    job_manager.close()
+    await anthropic_client.close()
+    prefill_cache.save()
     logger.info(f"Arret de {settings.app_title}")
 
 
@@ -75,6 +97,12 @@ app.include_router(router, prefix="/api")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métriques au format d'exposition Prometheus"""
+    return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     """Endpoint racine avec informations sur l'API"""
@@ -85,9 +113,17 @@ async def root():
         "endpoints": {
             "health": "/api/health",
             "prefill": "/api/prefill",
+            "prefill_cache": "/api/prefill/cache",
             "generate": "/api/generate",
+            "generate_batch": "/api/generate/batch",
+            "batch_status": "/api/batches/{batch_id}",
+            "regenerate": "/api/regenerate/{site_slug}",
             "job_status": "/api/status/{job_id}",
-            "list_jobs": "/api/jobs"
+            "job_status_stream": "/api/status/{job_id}/stream",
+            "list_jobs": "/api/jobs",
+            "resume_job": "/api/jobs/{job_id}/resume",
+            "phase_metrics": "/api/metrics",
+            "prometheus": "/metrics"
         }
     }
 
@@ -0,0 +1,37 @@
+"""
+Tests des identifiants triables (app.core.ids)
+"""
+from app.core import ids
+
+
+def test_ids_are_monotonic_within_the_same_millisecond(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000 * 1_000_000)
+    generated = [ids.new_ulid() for _ in range(1000)]
+
+    assert generated == sorted(generated)
+    assert len(set(generated)) == len(generated)
+
+
+def test_ids_stay_ordered_when_the_clock_goes_back(monkeypatch):
+    clock = iter([2_000, 1_000, 1_500])
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: next(clock) * 1_000_000)
+    generated = [ids.new_ulid() for _ in range(3)]
+
+    assert generated == sorted(generated)
+
+
+def test_ids_are_sorted_by_timestamp(monkeypatch):
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_000 * 1_000_000)
+    first = ids.new_ulid()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_001 * 1_000_000)
+    second = ids.new_ulid()
+
+    assert len(first) == 26
+    assert first < second
+
+
+def test_job_and_batch_prefixes():
+    assert ids.new_job_id().startswith("job_")
+    assert ids.new_batch_id().startswith("batch_")
@@ -0,0 +1,81 @@
+"""
+Tests de l'inférence de dépendances et de l'exécution du PhaseGraph
+"""
+import asyncio
+
+import pytest
+
+from app.services.phase_graph import PhaseGraph
+
+
+async def _noop():
+    return None
+
+
+def test_read_after_write_dependency():
+    graph = PhaseGraph()
+    graph.add("setup", _noop, outputs=["package.json", "app/globals.css"])
+    node = graph.add("pages", _noop, inputs=["app/globals.css"], outputs=["app/page.tsx"])
+
+    assert node.depends_on == {"setup"}
+
+
+def test_directory_input_depends_on_files_inside_it():
+    graph = PhaseGraph()
+    graph.add("components", _noop, outputs=["components/ui/Button.tsx"])
+    node = graph.add("sections", _noop, inputs=["components/ui/"], outputs=["components/sections/Hero.tsx"])
+
+    assert node.depends_on == {"components"}
+
+
+def test_write_after_write_and_write_after_read():
+    graph = PhaseGraph()
+    graph.add("pages", _noop, inputs=["components/"], outputs=["app/layout.tsx"])
+    content = graph.add("content", _noop, outputs=["app/layout.tsx"])
+    fix = graph.add("fix", _noop, outputs=["components/ui/Button.tsx"])
+
+    assert content.depends_on == {"pages"}
+    assert fix.depends_on == {"pages"}
+
+
+def test_independent_phases_share_a_level():
+    graph = PhaseGraph()
+    graph.add("setup", _noop, outputs=["app/globals.css"])
+    graph.add("components", _noop, inputs=["app/globals.css"], outputs=["components/ui/"])
+    graph.add("sections", _noop, inputs=["app/globals.css"], outputs=["components/sections/"])
+    graph.add("pages", _noop, inputs=["components/ui/", "components/sections/"], outputs=["app/page.tsx"])
+
+    assert graph.levels() == [["setup"], ["components", "sections"], ["pages"]]
+
+
+def test_explicit_dependencies_and_errors():
+    graph = PhaseGraph()
+    graph.add("boilerplate", _noop, outputs=["package.json"])
+    node = graph.add("setup", _noop, after=["boilerplate"])
+
+    assert node.depends_on == {"boilerplate"}
+    with pytest.raises(ValueError):
+        graph.add("setup", _noop)
+    with pytest.raises(ValueError):
+        graph.add("deploy", _noop, after=["github"])
+
+
+def test_run_respects_dependencies():
+    order = []
+
+    def phase(key):
+        async def run():
+            await asyncio.sleep(0)
+            order.append(key)
+            return key
+        return run
+
+    graph = PhaseGraph()
+    graph.add("setup", phase("setup"), outputs=["a"])
+    graph.add("components", phase("components"), inputs=["a"], outputs=["b"])
+    graph.add("pages", phase("pages"), inputs=["b"])
+
+    results = asyncio.run(graph.run())
+
+    assert order == ["setup", "components", "pages"]
+    assert results == {"setup": "setup", "components": "components", "pages": "pages"}
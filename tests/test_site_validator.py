@@ -0,0 +1,75 @@
+"""
+Tests du regroupement des erreurs de validation et de leur formatage
+"""
+from app.services.site_validator import ValidationIssue, ValidationReport, format_issues
+
+
+def _error(file, related=None, rule="unresolved-import"):
+    return ValidationIssue("imports", file, "Import introuvable", line=3, rule=rule, related=related)
+
+
+def test_fix_groups_keeps_related_files_together():
+    report = ValidationReport(issues=[
+        _error("app/page.tsx", related="components/sections/Hero.tsx"),
+        _error("components/sections/Hero.tsx"),
+        _error("components/ui/Button.tsx"),
+    ])
+
+    groups = report.fix_groups(max_groups=4)
+
+    assert sorted(len(group) for group in groups) == [1, 2]
+    together = next(group for group in groups if len(group) == 2)
+    assert {issue.file for issue in together} == {"app/page.tsx", "components/sections/Hero.tsx"}
+
+
+def test_fix_groups_matches_files_without_extension():
+    # Un import cible le module sans extension: même fichier que Hero.tsx
+    report = ValidationReport(issues=[
+        _error("app/page.tsx", related="components/sections/Hero"),
+        _error("components/sections/Hero.tsx"),
+    ])
+
+    assert len(report.fix_groups(max_groups=4)) == 1
+
+
+def test_fix_groups_merges_smallest_groups_beyond_the_limit():
+    report = ValidationReport(issues=[_error(f"components/ui/C{index}.tsx") for index in range(5)])
+
+    groups = report.fix_groups(max_groups=2)
+
+    assert len(groups) == 2
+    assert sorted(len(group) for group in groups) == [2, 3]
+    files = [issue.file for group in groups for issue in group]
+    assert len(files) == len(set(files)) == 5
+
+
+def test_fix_groups_ignores_warnings():
+    warning = ValidationIssue("typescript", "app/page.tsx", "Type implicite", severity="warning")
+    report = ValidationReport(issues=[warning, _error("app/layout.tsx")])
+
+    groups = report.fix_groups(max_groups=4)
+
+    assert [[issue.file for issue in group] for group in groups] == [["app/layout.tsx"]]
+
+
+def test_format_issues_one_line_per_issue():
+    issues = [
+        _error("app/page.tsx"),
+        ValidationIssue("files", "app/layout.tsx", "Fichier manquant", rule="missing-file"),
+        ValidationIssue("json", "package.json", "JSON invalide", line=1),
+    ]
+
+    assert format_issues(issues).splitlines() == [
+        "- ERROR app/page.tsx:3 [unresolved-import] Import introuvable",
+        "- ERROR app/layout.tsx [missing-file] Fichier manquant",
+        "- ERROR package.json:1 [json] JSON invalide",
+    ]
+
+
+def test_format_issues_truncates():
+    issues = [_error(f"components/ui/C{index}.tsx") for index in range(5)]
+
+    lines = format_issues(issues, max_issues=2).splitlines()
+
+    assert len(lines) == 3
+    assert lines[-1] == "- ... 3 autres problèmes"